@@ -1,25 +1,42 @@
-from puzzle_game import Board
 from typing import List, Optional
+from packed_state import MOVE_TARGETS, BLANK_SHIFT, move_blank, to_string, Layout
 class Node:
     """
     Representa um nó na árvore de busca para o 8-puzzle.
     
     Atributos:
-        state: Board atual
+        state: Estado empacotado (int, ver packed_state)
         action: Movimento que levou a este estado ('UP', 'DOWN', etc.)
         parent: Nó pai
         cost: Custo acumulado (profundidade)
+        rank: Chave do estado no conjunto fechado, quando conhecida: rank denso
+              no 3x3 e o próprio estado nos demais tamanhos (ver state_rank.state_key)
     """
+    __slots__ = ('state', 'action', 'parent', 'cost', 'rank')
     
-    def __init__(self, state: Board, action: Optional[str] = None, parent: Optional['Node'] = None):
-        self.state = state.copy()  # copia para evitar mutações
+    def __init__(self, state: int, action: Optional[str] = None, parent: Optional['Node'] = None,
+                 rank: Optional[int] = None):
+        self.state = state  # inteiro imutável, dispensa cópia
         self.action = action
         self.parent = parent
+        self.rank = rank
         if parent is not None:
             self.cost = parent.cost + 1
         else:
             self.cost = 0
 
+    @classmethod
+    def from_moves(cls, state: int, moves: List[str], layout: Optional[Layout] = None) -> 'Node':
+        """Monta a cadeia de nós aplicando `moves` a partir de `state` (3x3 se layout for None)"""
+        node = cls(state, "", None)
+        for move in moves:
+            if layout is None:
+                state = move_blank(state, MOVE_TARGETS[state >> BLANK_SHIFT][move])
+            else:
+                state = layout.move_blank(state, layout.move_targets[state >> layout.blank_shift][move])
+            node = cls(state, move, node)
+        return node
+
     def path(self) -> list:
         """Retorna a sequência de nós desde a raiz até este nó"""
         node, p = self, []
@@ -37,5 +54,5 @@ class Node:
         return hash(self.state)
   
     def __str__(self):
-        return f"Node(cost={self.cost}, action={self.action})\n{self.state}"
+        return f"Node(cost={self.cost}, action={self.action})\n{to_string(self.state)}"
     
@@ -9,10 +9,18 @@ O algoritmo A* é uma busca informada que combina:
 A heurística utilizada é a Distância de Manhattan, que é admissível e consistente.
 """
 
-import heapq
-from typing import Optional, Tuple, Dict, Any, List
+from typing import Optional, Tuple, Dict, Any, List, Union
 from Node import Node
 from puzzle_game import Board
+from bucket_queue import BucketQueue
+from generate_succeessors import expand_state, expand_state_with_h
+from node_arena import NodeArena
+from packed_state import to_matrix
+from heuristics import Heuristic, get_heuristic, manhattan
+from state_rank import closed_set, state_key
+from move_table import table_for
+from search_progress import SearchProgress
+from search_stats import SearchStats
 
 
 def manhattan_distance(board: Board) -> int:
@@ -34,82 +42,17 @@ def manhattan_distance(board: Board) -> int:
     Returns:
         int: Distância de Manhattan total (valor da heurística)
     """
-    distance = 0
-    
-    # Mapeamento das posições objetivo para cada número
-    goal_positions = {
-        1: (0, 0), 2: (0, 1), 3: (0, 2),  # Linha 1: [1, 2, 3]
-        4: (1, 0), 5: (1, 1), 6: (1, 2),  # Linha 2: [4, 5, 6]
-        7: (2, 0), 8: (2, 1), 0: (2, 2)   # Linha 3: [7, 8, _]
-    }
-    
-    # Percorre todo o tabuleiro 3x3
-    for i in range(3):
-        for j in range(3):
-            value = board.state[i][j]
-            
-            # Ignora o espaço vazio (0) no cálculo da heurística
-            if value != 0:
-                # Posição objetivo da peça atual
-                goal_i, goal_j = goal_positions[value]
-                
-                # Calcula distância Manhattan: |x1-x2| + |y1-y2|
-                distance += abs(i - goal_i) + abs(j - goal_j)
-    
-    return distance
-
-
-def board_to_list(board: Board) -> List[int]:
-    """Converte Board (3x3) para lista 1D"""
-    result = []
-    for i in range(3):
-        for j in range(3):
-            result.append(board.state[i][j])
-    return result
-
-
-def list_to_board(state_list: List[int]) -> Board:
-    """Converte lista 1D para Board (3x3)"""
-    state_2d = []
-    for i in range(3):
-        row = []
-        for j in range(3):
-            row.append(state_list[i * 3 + j])
-        state_2d.append(row)
-    return Board(state_2d)
-
-
-def create_board_successors(board_node) -> List:
-    """
-    Cria sucessores para nós que contêm objetos Board.
-    Adapta entre Board e lista 1D para usar o generate_successors existente.
-    """
-    from generate_succeessors import create_successors
-    
-    # Converte Board para lista 1D
-    state_list = board_to_list(board_node.state)
-    
-    # Cria nó temporário com lista 1D
-    temp_node = Node(state_list, board_node.action, board_node.parent)
-    
-    # Gera sucessores usando a função existente
-    list_successors = create_successors(temp_node)
-    
-    # Converte sucessores de volta para Board
-    board_successors = []
-    for successor in list_successors:
-        board_state = list_to_board(successor.state)
-        board_successor = Node(board_state, successor.action, board_node)
-        board_successors.append(board_successor)
-    
-    return board_successors
+    return manhattan(board.packed)
 
 
-def a_star_search(initial_board: Board) -> Optional[Tuple[Node, Dict[str, Any]]]:
+def a_star_search(initial_board: Board, heuristic: Union[str, Heuristic] = 'manhattan',
+                  progress: Optional[SearchProgress] = None,
+                  stats: Optional[SearchStats] = None) -> Optional[Tuple[Node, Dict[str, Any]]]:
     """
     Implementa o algoritmo A* para encontrar a solução ótima.
     
-    O algoritmo mantém uma fronteira (heap) ordenada por f(n) = g(n) + h(n):
+    O algoritmo mantém uma fronteira (BucketQueue) ordenada por f(n) = g(n) + h(n),
+    com desempate pelo menor g:
     - g(n): profundidade do nó (custo real do caminho)
     - h(n): distância de Manhattan (estimativa heurística)
     - f(n): custo total estimado
@@ -119,39 +62,90 @@ def a_star_search(initial_board: Board) -> Optional[Tuple[Node, Dict[str, Any]]]
     2. Remove o nó com menor f(n) da fronteira
     3. Se é o objetivo, retorna a solução
     4. Senão, expande o nó gerando sucessores
-    5. Para cada sucessor, calcula f(n) e adiciona à fronteira
+    5. Para cada sucessor, calcula f(n) e adiciona à fronteira apenas se o
+       seu g melhora o melhor g já inserido para o estado (conjunto aberto)
     6. Repete até encontrar solução ou esgotar fronteira
     
     Args:
         initial_board (Board): Estado inicial do tabuleiro
+        heuristic: Nome no registro de heuristics ('manhattan', 'misplaced',
+                   'linear_conflict') ou uma Heuristic; em tabuleiros N×N é
+                   usada a versão do tamanho (Heuristic.for_size)
+        progress (SearchProgress): andamento e cancelamento cooperativo (opcional)
+        stats (SearchStats): métricas comuns e ganchos de instrumentação (opcional)
         
     Returns:
-        Tuple[Node, dict] ou None: (nó solução, métricas) ou None se não encontrar
+        Tuple[Node, dict] ou None: (nó solução, métricas) ou None se não encontrar.
+        Além das métricas de busca, duplicates_suppressed, stale_pops e
+        reopenings mostram o crescimento evitado na fronteira.
+    
+    Raises:
+        SearchCancelled: se `progress` foi cancelado
     """
+    size = initial_board.size
+    layout = initial_board.layout
+    heuristic = get_heuristic(heuristic).for_size(size)
+    if stats is not None:
+        stats.start()
+    
     # Cria o nó inicial
-    initial_node = Node(initial_board, "", None)
+    initial_node = Node(initial_board.packed, "", None, state_key(initial_board.packed, size))
     
     # Verifica se já é o estado objetivo
     if initial_board.is_goal_state():
+        if stats is not None:
+            stats.finish(0, 0, 0, 0, 0, 0)
+            if stats.on_goal is not None:
+                stats.on_goal(initial_board.packed, 0)
         return initial_node, {
             "visited_nodes": 0,
             "explored_states": 0,
             "max_frontier": 0,
-            "solution_depth": 0
+            "solution_depth": 0,
+            "duplicates_suppressed": 0,
+            "stale_pops": 0,
+            "reopenings": 0
+        }
+    
+    # Estado sem solução: nos tabuleiros maiores a busca nunca terminaria
+    if not initial_board.is_solvable():
+        if stats is not None:
+            stats.finish(0, 0, 0, 0, 0, -1)
+        return None, {
+            "visited_nodes": 0,
+            "explored_states": 0,
+            "max_frontier": 0,
+            "solution_depth": -1,
+            "duplicates_suppressed": 0,
+            "stale_pops": 0,
+            "reopenings": 0
         }
     
-    # Inicializa estruturas de dados
-    frontier = []  # Min-heap: (f_cost, g_cost, counter, node)
-    explored = set()  # Estados já explorados
-    counter = 1  # Para desempate no heap (ordem FIFO)
+    # Inicializa estruturas de dados. Os nós vivem na arena (colunas
+    # array.array); fronteira e laço lidam só com handles inteiros.
+    arena = NodeArena(layout)
+    states, keys = arena.states, arena.keys
+    frontier = BucketQueue()  # Baldes por f e, dentro de cada f, por g (FIFO nos empates)
+    explored = closed_set(size)  # Estados já explorados (bitmap por rank no 3x3)
+    best_g = {initial_node.rank: 0}  # Conjunto aberto: chave do estado -> melhor g inserido
+    table = table_for(initial_board.packed) if size == 3 else None  # Tabela de transições (rank -> ranks)
+    goal_state = layout.goal_state
     
     # Adiciona nó inicial à fronteira
-    h_initial = manhattan_distance(initial_board)
-    heapq.heappush(frontier, (h_initial, 0, 0, initial_node))
+    h_initial = heuristic(initial_board.packed)
+    frontier.push(arena.add(initial_board.packed, rank=initial_node.rank), h_initial, 0)
     
     # Métricas para análise
     visited_nodes = 0
     max_frontier = 1
+    duplicates_suppressed = 0  # filhos descartados por não melhorarem o g conhecido
+    stale_pops = 0  # entradas removidas depois que o estado foi inserido com g menor
+    reopenings = 0  # estados já explorados alcançados com g menor (heurística inconsistente)
+    expansions = 0
+    generations = 0
+    peak_closed = 0  # só é maior que o fechado final se houve reaberturas
+    on_expand = stats.on_expand if stats is not None else None
+    on_generate = stats.on_generate if stats is not None else None
     
     # Loop principal do A*
     while frontier:
@@ -159,50 +153,86 @@ def a_star_search(initial_board: Board) -> Optional[Tuple[Node, Dict[str, Any]]]
         max_frontier = max(max_frontier, len(frontier))
         
         # Remove nó com menor f(n) da fronteira
-        f_cost, g_cost, _, current_node = heapq.heappop(frontier)
+        f_cost, g_cost, current = frontier.pop()
         visited_nodes += 1
+        if progress is not None and visited_nodes % progress.interval == 0:
+            progress.report(visited_nodes, len(frontier))
         
-        # Verifica se já foi explorado (evita ciclos)
-        current_state_hash = hash(str(current_node.state.state))
-        if current_state_hash in explored:
+        # Entrada obsoleta: o estado voltou à fronteira com g menor depois dela
+        current_state = states[current]
+        current_key = keys[current]
+        if g_cost > best_g[current_key]:
+            stale_pops += 1
             continue
         
-        # Marca como explorado
-        explored.add(current_state_hash)
+        # Marca como explorado; se já estava, descarta (evita ciclos)
+        if not explored.add_rank(current_key):
+            continue
         
         # Verifica se chegou ao objetivo
-        if current_node.state.is_goal_state():
-            return current_node, {
+        if current_state == goal_state:
+            if stats is not None:
+                stats.finish(expansions, generations, duplicates_suppressed, max_frontier,
+                             max(peak_closed, len(explored)), g_cost)
+                if stats.on_goal is not None:
+                    stats.on_goal(current_state, g_cost)
+            return arena.to_node(current), {
                 "visited_nodes": visited_nodes,
                 "explored_states": len(explored),
                 "max_frontier": max_frontier,
-                "solution_depth": g_cost
+                "solution_depth": g_cost,
+                "duplicates_suppressed": duplicates_suppressed,
+                "stale_pops": stale_pops,
+                "reopenings": reopenings
             }
         
-        # Gera sucessores do nó atual
-        successors = create_board_successors(current_node)
+        if on_expand is not None:
+            on_expand(current_state, g_cost)
+        expansions += 1
+        
+        # Gera sucessores do nó atual. Heurísticas aditivas por peça calculam
+        # h por delta a partir do h do pai (h = f - g); as demais, por completo.
+        if heuristic.costs is not None:
+            successors = expand_state_with_h(current_state, current_key, f_cost - g_cost,
+                                             table, heuristic.costs, layout)
+        else:
+            successors = [(child, code, key, heuristic.evaluate(child))
+                          for child, code, key in expand_state(current_state, current_key, table, layout)]
         
         # Processa cada sucessor
-        for successor in successors:
-            successor_hash = hash(str(successor.state.state))
+        g = g_cost + 1  # Custo do caminho (profundidade)
+        generations += len(successors)
+        if on_generate is not None:
+            for child, _, _, _ in successors:
+                on_generate(child, current_state)
+        for child, code, key, h in successors:
+            previous_g = best_g.get(key)
+            if previous_g is not None:
+                # Só insere se melhora o g já conhecido (aberto ou explorado)
+                if previous_g <= g:
+                    duplicates_suppressed += 1
+                    continue
+                if explored.has_rank(key):
+                    peak_closed = max(peak_closed, len(explored))
+                    explored.discard_rank(key)
+                    reopenings += 1
+            best_g[key] = g
             
-            # Apenas adiciona se não foi explorado
-            if successor_hash not in explored:
-                # Calcula custos
-                g = g_cost + 1  # Custo do caminho (profundidade)
-                h = manhattan_distance(successor.state)  # Heurística
-                f = g + h  # Custo total f(n) = g(n) + h(n)
-                
-                # Adiciona à fronteira
-                heapq.heappush(frontier, (f, g, counter, successor))
-                counter += 1
+            # Adiciona à fronteira com f(n) = g(n) + h(n)
+            frontier.push(arena.add(child, current, code, key), g + h, g)
     
     # Não encontrou solução
+    if stats is not None:
+        stats.finish(expansions, generations, duplicates_suppressed, max_frontier,
+                     max(peak_closed, len(explored)), -1)
     return None, {
         "visited_nodes": visited_nodes,
         "explored_states": len(explored),
         "max_frontier": max_frontier,
-        "solution_depth": -1
+        "solution_depth": -1,
+        "duplicates_suppressed": duplicates_suppressed,
+        "stale_pops": stale_pops,
+        "reopenings": reopenings
     }
 
 
@@ -222,7 +252,7 @@ def print_a_star_step(node: Node, g_cost: int, h_cost: int, f_cost: int):
     print(f"h(n) = {h_cost} (Manhattan)")
     print(f"f(n) = {f_cost} (g+h)")
     print("Estado:")
-    for row in node.state.state:
+    for row in to_matrix(node.state):
         print(f"  {row}")
 
 
@@ -0,0 +1,137 @@
+"""
+Avaliação vetorizada (NumPy) de muitos tabuleiros de uma vez.
+
+Cada função recebe um array (M, N²) de uint8 — uma linha por tabuleiro, na
+ordem de Board.state achatada — e devolve um vetor de M posições calculado
+em passadas vetorizadas, sem laço Python por tabuleiro:
+
+- valid_boards: a linha é uma permutação de 0..N²-1
+- inversion_parity / solvable_boards: paridade das inversões e solvibilidade
+  (com a regra da linha do vazio em larguras pares)
+- manhattan_batch / misplaced_batch: as heurísticas do registro heuristics
+
+Serve para triar e pontuar lotes grandes antes de enviá-los aos solvers
+(ver batch_solver). NumPy é opcional no projeto: só este módulo o exige.
+"""
+
+import math
+from functools import lru_cache
+from typing import Dict
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; as funções avisam ao serem chamadas
+    np = None
+
+from heuristics import manhattan_table, misplaced_table
+from packed_state import get_layout
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("batch_eval requer NumPy (pip install numpy)")
+
+
+def as_boards(boards) -> 'np.ndarray':
+    """
+    Normaliza a entrada para um array (M, N²) de uint8.
+    Aceita (M, N²), (M, N, N) ou um único tabuleiro.
+
+    Raises:
+        ValueError: se o número de células não é um quadrado perfeito, se as
+            peças não são inteiras ou se alguma está fora de 0..N²-1
+    """
+    _require_numpy()
+    # Sem dtype forçado: a conversão direta para uint8 faria 256 virar 0
+    array = np.asarray(boards)
+    if array.ndim == 3:
+        array = array.reshape(array.shape[0], -1)
+    elif array.ndim == 1:
+        array = array.reshape(1, -1)
+    if array.ndim != 2 or math.isqrt(array.shape[1]) ** 2 != array.shape[1] or array.shape[1] < 4:
+        raise ValueError(f"Formato de lote inválido: {np.shape(boards)}")
+    if not np.issubdtype(array.dtype, np.integer):
+        raise ValueError(f"Peças devem ser inteiras (dtype {array.dtype})")
+    cells = array.shape[1]
+    if cells > 256 or (array.size and (array.min() < 0 or array.max() >= cells)):
+        raise ValueError(f"Peças fora do intervalo 0..{cells - 1}")
+    return array.astype(np.uint8, copy=False)
+
+
+def board_size(boards: 'np.ndarray') -> int:
+    return math.isqrt(boards.shape[1])
+
+
+@lru_cache(maxsize=None)
+def _pairs(cells: int):
+    """Índices (i, j) com i < j, para comparar todas as células de uma vez"""
+    return np.triu_indices(cells, 1)
+
+
+@lru_cache(maxsize=None)
+def _cost_table(name: str, size: int) -> 'np.ndarray':
+    table = manhattan_table(size) if name == 'manhattan' else misplaced_table(size)
+    return np.array(table, dtype=np.uint8)
+
+
+def valid_boards(boards) -> 'np.ndarray':
+    """bool (M,): cada linha contém 0..N²-1 exatamente uma vez"""
+    boards = as_boards(boards)
+    expected = np.arange(boards.shape[1], dtype=np.uint8)
+    return (np.sort(boards, axis=1) == expected).all(axis=1)
+
+
+def inversion_parity(boards) -> 'np.ndarray':
+    """uint8 (M,): paridade do número de inversões entre as peças (sem o vazio)"""
+    boards = as_boards(boards)
+    first, second = _pairs(boards.shape[1])
+    later = boards[:, second]
+    inversions = (boards[:, first] > later) & (later != 0)
+    return (inversions.sum(axis=1) & 1).astype(np.uint8)
+
+
+def solvable_boards(boards) -> 'np.ndarray':
+    """
+    bool (M,): mesma regra de Layout.is_solvable. Largura ímpar: inversões
+    pares; largura par: inversões + linha do vazio contada de baixo, par.
+    """
+    boards = as_boards(boards)
+    size = board_size(boards)
+    parity = inversion_parity(boards)
+    if size % 2 == 1:
+        return parity == 0
+    blank_row_from_bottom = size - 1 - np.argmin(boards, axis=1) // size
+    return ((parity + blank_row_from_bottom) & 1) == 0
+
+
+def manhattan_batch(boards) -> 'np.ndarray':
+    """uint16 (M,): distância de Manhattan de cada tabuleiro (linhas válidas)"""
+    boards = as_boards(boards)
+    table = _cost_table('manhattan', board_size(boards))
+    cells = np.arange(boards.shape[1])
+    return table[boards, cells].sum(axis=1, dtype=np.uint16)
+
+
+def misplaced_batch(boards) -> 'np.ndarray':
+    """uint8 (M,): peças fora do lugar de cada tabuleiro"""
+    boards = as_boards(boards)
+    goal = np.array(get_layout(board_size(boards)).goal_tiles, dtype=np.uint8)
+    return ((boards != goal) & (boards != 0)).sum(axis=1, dtype=np.uint8)
+
+
+def screen(boards) -> Dict[str, 'np.ndarray']:
+    """
+    Triagem completa de um lote: valid, solvable, manhattan e misplaced.
+    Linhas inválidas ficam com solvable False e heurísticas 0.
+    """
+    boards = as_boards(boards)
+    valid = valid_boards(boards)
+    # Linhas inválidas viram o objetivo, para as tabelas só verem peças válidas
+    goal = np.array(get_layout(board_size(boards)).goal_tiles, dtype=np.uint8)
+    boards = np.where(valid[:, None], boards, goal)
+    return {
+        "valid": valid,
+        "solvable": solvable_boards(boards) & valid,
+        "manhattan": manhattan_batch(boards),
+        "misplaced": misplaced_batch(boards),
+    }
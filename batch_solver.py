@@ -0,0 +1,411 @@
+"""
+Resolução em lote de tabuleiros em vários processos.
+
+solve_many(boards, algorithm, workers=N) distribui os tabuleiros em blocos
+(chunks) por um ProcessPoolExecutor. Cada processo aquece uma única vez no
+inicializador (imports, tabela de movimentos, oráculo ou banco de padrões,
+conforme o algoritmo) e depois só resolve blocos. A entrada é consumida de
+forma preguiçosa e no máximo `max_pending` blocos ficam em andamento, então a
+memória é limitada mesmo para entradas arbitrariamente longas. Os resultados
+saem na ordem da entrada (padrão) ou na ordem de conclusão.
+
+Dentro de um bloco, tabuleiros repetidos e gêmeos simétricos (ver
+Layout.canonical) são resolvidos uma única vez: as repetições recebem o
+mesmo registro, com as ações espelhadas no caso do gêmeo, e "coalesced": true.
+
+Uso (uma entrada JSON por linha: matriz, lista 1D ou {"id": ..., "board": ...}):
+    python batch_solver.py --algorithm astar --workers 8 tabuleiros.jsonl > resultados.jsonl
+    cat tabuleiros.jsonl | python batch_solver.py --unordered
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from Node import Node
+from packed_state import get_layout, reflect_moves
+from puzzle_game import Board
+from search_progress import SearchCancelled, SearchProgress
+
+
+def _node_moves(node: Optional[Node]) -> Optional[List[str]]:
+    if node is None:
+        return None
+    return [n.action for n in node.path()[1:]]
+
+
+def _solve_informed(search, accepts_heuristic: bool = False, accepts_progress: bool = False):
+    """Adaptador para o contrato (nó, métricas) de A*, IDA*, oráculo e banco"""
+    def solve(board: Board, heuristic: Optional[str],
+              progress: Optional[SearchProgress] = None) -> Tuple[Optional[List[str]], Dict[str, Any]]:
+        kwargs = {"progress": progress} if accepts_progress and progress is not None else {}
+        if accepts_heuristic and heuristic is not None:
+            node, metrics = search(board, heuristic, **kwargs)
+        else:
+            node, metrics = search(board, **kwargs)
+        return _node_moves(node), metrics
+    return solve
+
+
+def _solve_uninformed(search):
+    """Adaptador para o contrato (nó, visitados, armazenados) de BFS e DFS"""
+    def solve(board: Board, heuristic: Optional[str],
+              progress: Optional[SearchProgress] = None) -> Tuple[Optional[List[str]], Dict[str, Any]]:
+        result = search(Node(board.packed), board.size, progress=progress)
+        if result is None or result[0] is None:
+            return None, {}
+        node, visited, stored = result
+        return _node_moves(node), {"visited_nodes": visited, "explored_states": stored}
+    return solve
+
+
+def _solve_greedy(board: Board, heuristic: Optional[str],
+                  progress: Optional[SearchProgress] = None) -> Tuple[Optional[List[str]], Dict[str, Any]]:
+    from heuristic_search import greedy_best_first_search_with_loop
+    result = greedy_best_first_search_with_loop(board, heuristic or 'manhattan', progress=progress)
+    if result is None:
+        return None, {}
+    moves, cost, visited, _ = result
+    metrics = {"visited_nodes": visited}
+    if moves is None:
+        metrics["loop_after"] = cost
+    return moves, metrics
+
+
+def _load_algorithm(name: str):
+    """Importa o algoritmo no processo que vai executá-lo"""
+    if name == "astar":
+        from a_star_search import a_star_search
+        return _solve_informed(a_star_search, accepts_heuristic=True, accepts_progress=True)
+    if name == "ida":
+        from ida_star import ida_star_search
+        return _solve_informed(ida_star_search, accepts_progress=True)
+    if name == "oracle":
+        from distance_oracle import oracle_search
+        return _solve_informed(oracle_search)
+    if name == "database":
+        from puzzle_db import database_search
+        return _solve_informed(database_search)
+    if name == "bfs":
+        from breath_first_search import bfs
+        return _solve_uninformed(bfs)
+    if name == "bidirectional":
+        from breath_first_search import bidirectional_bfs
+        return _solve_uninformed(bidirectional_bfs)
+    if name == "vector_bfs":
+        from vector_bfs import vector_bfs_search
+        return _solve_informed(vector_bfs_search)
+    if name == "dfs":
+        from deep_first_search import dfs
+        return _solve_uninformed(dfs)
+    if name == "dls":
+        from deep_first_search import depth_limited_dfs
+        return _solve_uninformed(depth_limited_dfs)
+    if name == "iddfs":
+        from deep_first_search import iterative_deepening_dfs
+        return _solve_uninformed(iterative_deepening_dfs)
+    if name == "greedy":
+        return _solve_greedy
+    raise ValueError(f"Algoritmo desconhecido: {name!r} (disponíveis: {', '.join(ALGORITHMS)})")
+
+
+ALGORITHMS = ("astar", "ida", "oracle", "database", "bfs", "bidirectional", "vector_bfs", "dfs", "dls", "iddfs", "greedy")
+
+
+def warm_up(algorithm: str, heuristic: Optional[str] = None) -> None:
+    """Carrega as tabelas que o algoritmo usa, uma vez por processo"""
+    from move_table import loaded_move_table
+    loaded_move_table()  # só lê o arquivo, se existir; calcular custaria segundos por processo
+    if algorithm == "oracle":
+        from distance_oracle import get_distance_oracle
+        from puzzle_db import get_database
+        if get_database() is None:
+            get_distance_oracle()
+    elif heuristic == "pdb":
+        from pattern_database import get_default_pdb
+        get_default_pdb()
+
+
+# Estado de cada processo do pool (definido por _init_worker)
+_worker_solver = None
+_worker_heuristic: Optional[str] = None
+
+
+def _init_worker(algorithm: str, heuristic: Optional[str]) -> None:
+    global _worker_solver, _worker_heuristic
+    _worker_solver = _load_algorithm(algorithm)
+    _worker_heuristic = heuristic
+    warm_up(algorithm, heuristic)
+
+
+class InvalidLine:
+    """Linha da entrada que não é JSON válido; solve_one a transforma em registro de erro"""
+
+    __slots__ = ('line_number', 'message')
+
+    def __init__(self, line_number: int, message: str):
+        self.line_number = line_number
+        self.message = message
+
+
+def parse_board(payload: Any) -> Tuple[Board, Any]:
+    """
+    Converte uma entrada em (Board, id). Aceita matriz N×N, lista 1D de N²
+    peças, estado empacotado (3x3) ou {"board": ..., "id": ...}.
+
+    Raises:
+        ValueError: se o tabuleiro é inválido (inclusive estado empacotado
+            que não é uma permutação de 0..8, lista 1D cujo tamanho não é um
+            quadrado e peças que não são inteiros)
+    """
+    board_id = None
+    if isinstance(payload, dict):
+        board_id = payload.get("id")
+        payload = payload.get("board")
+    if isinstance(payload, bool):
+        raise ValueError(f"Tabuleiro inválido: {payload!r}")
+    if isinstance(payload, int):
+        layout = get_layout(3)
+        tiles = layout.unpack(payload)
+        if sorted(tiles) != list(range(layout.cells)) or layout.pack(tiles) != payload:
+            raise ValueError(f"Estado empacotado inválido: {payload!r}")
+        return Board(payload), board_id
+    if not isinstance(payload, (list, tuple)) or not payload:
+        raise ValueError(f"Tabuleiro inválido: {payload!r}")
+    if not any(isinstance(row, (list, tuple)) for row in payload):
+        size = math.isqrt(len(payload))
+        if size * size != len(payload):
+            raise ValueError(f"Lista com {len(payload)} peças não forma um tabuleiro N×N: {payload!r}")
+        rows = [list(payload[row * size:(row + 1) * size]) for row in range(size)]
+    elif all(isinstance(row, (list, tuple)) for row in payload):
+        rows = [list(row) for row in payload]
+    else:
+        raise ValueError(f"Tabuleiro inválido: {payload!r}")
+    if len(rows) < 2 or any(not isinstance(tile, int) or isinstance(tile, bool) for row in rows for tile in row):
+        raise ValueError(f"Tabuleiro inválido: {payload!r}")
+    board = Board(size=len(rows))
+    if not board.set_state(rows):
+        raise ValueError(f"Tabuleiro inválido: {payload!r}")
+    return board, board_id
+
+
+def _reuse(result: Dict[str, Any], board: Board, solved_state: int, solved: Dict[str, Any]) -> Dict[str, Any]:
+    """Registro de um tabuleiro igual ou gêmeo de outro já resolvido no bloco"""
+    if "error" in solved:
+        result["error"] = solved["error"]
+        return result
+    moves = solved["moves"]
+    if moves is not None and solved_state != board.packed:
+        moves = reflect_moves(moves)
+    result.update(solved=solved["solved"], moves=moves, depth=solved["depth"],
+                  metrics=solved["metrics"], time=0.0, coalesced=True)
+    return result
+
+
+def solve_one(index: int, payload: Any, solver, heuristic: Optional[str] = None,
+              solved: Optional[Dict[Tuple[int, int], Tuple[int, Dict[str, Any]]]] = None,
+              progress: Optional[SearchProgress] = None) -> Dict[str, Any]:
+    """
+    Resolve uma entrada e monta o registro de resultado (serializável em JSON).
+
+    `solved` (opcional) guarda os tabuleiros já resolvidos, por (tamanho,
+    estado canônico); um tabuleiro igual ou gêmeo de um deles não é resolvido
+    de novo. `progress` (opcional) é repassado às buscas que o aceitam; se a
+    busca for cancelada (ou o prazo passar) o registro sai com "error" e
+    "cancelled": true.
+    """
+    result: Dict[str, Any] = {"index": index}
+    if isinstance(payload, InvalidLine):
+        result.update(id=None, line=payload.line_number,
+                      error=f"Linha {payload.line_number}: JSON inválido ({payload.message})")
+        return result
+    try:
+        board, board_id = parse_board(payload)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+    if board_id is not None:
+        result["id"] = board_id
+    result["board"] = board.state
+
+    if not board.is_solvable():
+        result.update(solved=False, moves=None, depth=-1, metrics={}, time=0.0)
+        return result
+
+    if solved is not None:
+        key = (board.size, board.layout.canonical(board.packed)[0])
+        if key in solved:
+            return _reuse(result, board, *solved[key])
+        solved[key] = (board.packed, result)
+
+    start_time = time.perf_counter()
+    try:
+        moves, metrics = solver(board, heuristic, progress)
+    except ValueError as e:
+        # Ex.: oráculo com tabuleiro 4x4, heurística desconhecida
+        result["error"] = str(e)
+        return result
+    except SearchCancelled:
+        result["error"] = f"Busca interrompida após {time.perf_counter() - start_time:.2f}s (prazo excedido)"
+        result["cancelled"] = True
+        return result
+    result.update(
+        solved=moves is not None,
+        moves=moves,
+        depth=len(moves) if moves is not None else -1,
+        metrics=metrics,
+        time=time.perf_counter() - start_time,
+    )
+    return result
+
+
+_solvers: Dict[str, Any] = {}
+
+
+def get_solver(algorithm: str):
+    """Adaptador do algoritmo, importado uma única vez por processo"""
+    solver = _solvers.get(algorithm)
+    if solver is None:
+        solver = _solvers[algorithm] = _load_algorithm(algorithm)
+    return solver
+
+
+def solve_request(payload: Any, algorithm: str = "astar", heuristic: Optional[str] = None,
+                  deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Resolve uma entrada isolada (usado pelos processos do solver_service).
+
+    Com `deadline` (instante de time.time()) a busca para sozinha no prazo e
+    libera o processo: as buscas com progresso (A*, IDA*, BFS, DFS, gulosa)
+    checam o prazo a cada SearchProgress.interval expansões; as consultas por
+    tabela (oráculo, banco, BFS vetorizada) não são interrompidas.
+    """
+    if deadline is not None and time.time() >= deadline:
+        return {"error": "Prazo excedido antes do início da busca", "cancelled": True}
+    progress = SearchProgress(deadline=deadline) if deadline is not None else None
+    result = solve_one(0, payload, get_solver(algorithm), heuristic, progress=progress)
+    del result["index"]
+    return result
+
+
+def _solve_chunk(chunk: List[Tuple[int, Any]]) -> List[Dict[str, Any]]:
+    solved = {}
+    return [solve_one(index, payload, _worker_solver, _worker_heuristic, solved) for index, payload in chunk]
+
+
+def _chunks(boards: Iterable[Any], chunksize: int) -> Iterator[List[Tuple[int, Any]]]:
+    entries = enumerate(boards)
+    while True:
+        chunk = list(islice(entries, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_many(boards: Iterable[Any], algorithm: str = "astar", workers: Optional[int] = None,
+               heuristic: Optional[str] = None, ordered: bool = True, chunksize: int = 32,
+               max_pending: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Resolve os tabuleiros em paralelo, devolvendo os resultados conforme ficam prontos.
+
+    Args:
+        boards: iterável (consumido de forma preguiçosa) de entradas aceitas por parse_board
+        algorithm: um dos nomes em ALGORITHMS
+        workers: número de processos (None = os.cpu_count(); 0 ou 1 = no próprio processo)
+        heuristic: heurística do A* e da busca gulosa (nome do registro)
+        ordered: True = ordem da entrada, False = ordem de conclusão
+        chunksize: tabuleiros por tarefa enviada ao pool
+        max_pending: blocos em andamento ao mesmo tempo (padrão: 2 por processo)
+
+    Yields:
+        dict por tabuleiro: index, id (se informado), board, solved, moves,
+        depth, metrics, time (e coalesced, se reaproveitado de um igual ou
+        gêmeo do mesmo bloco); ou index e error para entradas inválidas
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritmo desconhecido: {algorithm!r} (disponíveis: {', '.join(ALGORITHMS)})")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        solver = _load_algorithm(algorithm)
+        warm_up(algorithm, heuristic)
+        solved = {}
+        for index, payload in enumerate(boards):
+            if index % chunksize == 0:
+                solved = {}  # mesmos blocos da execução em processos
+            yield solve_one(index, payload, solver, heuristic, solved)
+        return
+
+    if max_pending is None:
+        max_pending = 2 * workers
+    chunks = _chunks(boards, chunksize)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(algorithm, heuristic)) as executor:
+        pending = deque()
+        for chunk in islice(chunks, max_pending):
+            pending.append(executor.submit(_solve_chunk, chunk))
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+                results = done[0].result()
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+                results = [record for future in done for record in future.result()]
+
+            # Repõe um bloco para cada bloco concluído
+            for chunk in islice(chunks, len(done)):
+                pending.append(executor.submit(_solve_chunk, chunk))
+            yield from results
+
+
+def read_jsonl(stream) -> Iterator[Any]:
+    """
+    Entradas de um arquivo JSON lines (ignora linhas vazias). Uma linha que
+    não é JSON válido vira InvalidLine, e não interrompe o lote.
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield InvalidLine(line_number, str(e))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resolve tabuleiros em lote (JSON lines)")
+    parser.add_argument("input", nargs="?", default="-", help="arquivo JSONL de entrada ('-' = stdin)")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="astar")
+    parser.add_argument("--heuristic", default=None, help="heurística do A*/busca gulosa (ex.: linear_conflict)")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos da máquina)")
+    parser.add_argument("--chunksize", type=int, default=32, help="tabuleiros por tarefa")
+    parser.add_argument("--unordered", action="store_true", help="escreve na ordem de conclusão")
+    args = parser.parse_args(argv)
+
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        for record in solve_many(read_jsonl(stream), args.algorithm, args.workers, args.heuristic,
+                                 ordered=not args.unordered, chunksize=args.chunksize):
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
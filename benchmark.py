@@ -0,0 +1,434 @@
+"""
+Benchmark dos algoritmos sobre um corpus estratificado por profundidade ótima.
+
+O corpus é gerado a partir do oráculo de distâncias: para cada profundidade
+pedida (0 a 31) são sorteados `per_depth` estados com exatamente essa
+distância ótima, com semente fixa, então o mesmo comando gera sempre o mesmo
+corpus. Cada algoritmo resolve cada tabuleiro `warmup` vezes sem medir e
+`repeats` vezes medindo; as amostras viram mediana, p95 e p99 do tempo por
+resolução e nós expandidos por segundo (SearchStats), no total e por
+profundidade.
+
+As buscas cegas cujo custo explode com a profundidade têm um teto
+(DEPTH_CAPS: bfs até 24, dls e iddfs até 20); tabuleiros mais fundos que o
+teto do algoritmo são pulados. --cap nome=profundidade muda o teto (ex.:
+--cap iddfs=31 mede tudo, mas o IDDFS leva perto de 1 min por tabuleiro a
+partir da profundidade 28).
+
+Tempo esperado: o `run` padrão (5 algoritmos, profundidades 0-31, 5
+tabuleiros por profundidade, 1 aquecimento + 5 medições) leva cerca de 1 min;
+o custo cresce linearmente com --per-depth e com --repeats + --warmup. Para
+uma checagem rápida use --per-depth 2 --repeats 1 (poucos segundos).
+
+Uso:
+    python benchmark.py run --algorithms astar,ida --per-depth 5 --out base.json
+    python benchmark.py run --depths 0-20 --out resultados.csv
+    python benchmark.py run --algorithms bfs,iddfs --cap bfs=31 --out cegas.json
+    python benchmark.py compare base.json novo.json --threshold 0.10
+
+O compare confronta as medianas de dois arquivos JSON (total e por
+profundidade) e sai com código 1 se algum algoritmo ficou mais lento que o
+limite, para uso em scripts e CI. Relatórios medidos sobre corpus
+diferentes (semente, tabuleiros por profundidade, profundidades ou tetos)
+não são comparados: o compare sai com código 2.
+"""
+
+import argparse
+import csv
+import gc
+import json
+import platform
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from Node import Node
+from puzzle_game import Board
+from search_stats import SearchStats
+
+# Estado do pior caso tem distância 31; o corpus cobre 0..31
+MAX_DEPTH = 31
+
+
+def _load_solver(name: str) -> Callable[[Board, SearchStats], None]:
+    """Importa o algoritmo e devolve solve(board, stats)"""
+    if name == "astar":
+        from a_star_search import a_star_search
+        return lambda board, stats: a_star_search(board, stats=stats)
+    if name == "astar_lc":
+        from a_star_search import a_star_search
+        return lambda board, stats: a_star_search(board, 'linear_conflict', stats=stats)
+    if name == "ida":
+        from ida_star import ida_star_search
+        return lambda board, stats: ida_star_search(board, stats=stats)
+    if name == "oracle":
+        from distance_oracle import oracle_search
+        return lambda board, stats: oracle_search(board, stats=stats)
+    if name == "bfs":
+        from breath_first_search import bfs
+        return lambda board, stats: bfs(Node(board.packed), stats=stats)
+    if name == "bidirectional":
+        from breath_first_search import bidirectional_bfs
+        return lambda board, stats: bidirectional_bfs(Node(board.packed), stats=stats)
+    if name == "dfs":
+        from deep_first_search import dfs
+        return lambda board, stats: dfs(Node(board.packed), stats=stats)
+    if name == "dls":
+        from deep_first_search import depth_limited_dfs
+        return lambda board, stats: depth_limited_dfs(Node(board.packed), limit=MAX_DEPTH, stats=stats)
+    if name == "iddfs":
+        from deep_first_search import iterative_deepening_dfs
+        return lambda board, stats: iterative_deepening_dfs(Node(board.packed), max_depth=MAX_DEPTH, stats=stats)
+    if name == "greedy":
+        from heuristic_search import greedy_best_first_search_with_loop
+        return lambda board, stats: greedy_best_first_search_with_loop(board, stats=stats)
+    if name == "vector_bfs":
+        from vector_bfs import vector_bfs_search
+        return lambda board, stats: vector_bfs_search(board, stats=stats)
+    raise ValueError(f"Algoritmo desconhecido: {name!r} (disponíveis: {', '.join(ALGORITHMS)})")
+
+
+ALGORITHMS = ("astar", "astar_lc", "ida", "oracle", "bfs", "bidirectional", "dfs", "dls", "iddfs", "greedy", "vector_bfs")
+DEFAULT_ALGORITHMS = ("astar", "astar_lc", "ida", "bidirectional", "oracle")
+
+# Profundidade máxima medida por algoritmo (os demais vão até MAX_DEPTH):
+# por tabuleiro, o BFS passa de 1 s perto de 24 e o DLS/IDDFS, cego e só com
+# checagem de ciclo no caminho, passa de 1 s a partir de 20
+DEPTH_CAPS = {"bfs": 24, "dls": 20, "iddfs": 20}
+
+
+def build_corpus(depths: Iterable[int] = range(MAX_DEPTH + 1), per_depth: int = 5,
+                 seed: int = 0) -> List[Tuple[int, int]]:
+    """
+    Sorteia até `per_depth` estados 3x3 de cada profundidade ótima.
+    Profundidades raras (0 e 31) entram com os estados que existirem.
+
+    Returns:
+        [(profundidade, estado empacotado)], em ordem de profundidade
+    """
+    from distance_oracle import get_distance_oracle
+    from state_rank import unrank_state
+
+    wanted = set(depths)
+    if not wanted <= set(range(MAX_DEPTH + 1)):
+        raise ValueError(f"Profundidades devem estar entre 0 e {MAX_DEPTH}")
+    by_depth: Dict[int, List[int]] = {depth: [] for depth in wanted}
+    for rank, distance in enumerate(get_distance_oracle().distances):
+        if distance in by_depth:
+            by_depth[distance].append(rank)
+
+    rng = random.Random(seed)
+    corpus = []
+    for depth in sorted(wanted):
+        ranks = by_depth[depth]
+        chosen = rng.sample(ranks, min(per_depth, len(ranks)))
+        corpus.extend((depth, unrank_state(rank)) for rank in sorted(chosen))
+    return corpus
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Percentil q (0-100) por interpolação linear entre as amostras ordenadas"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(times: Sequence[float], expansions: int, cases: int, optimal: int) -> Dict[str, Any]:
+    """Estatísticas de um conjunto de amostras (tempos em segundos)"""
+    total_time = sum(times)
+    return {
+        "cases": cases,
+        "samples": len(times),
+        "median": percentile(times, 50),
+        "p95": percentile(times, 95),
+        "p99": percentile(times, 99),
+        "min": min(times) if times else 0.0,
+        "max": max(times) if times else 0.0,
+        "nodes_per_s": expansions / total_time if total_time > 0 else 0.0,
+        "optimal": optimal,
+    }
+
+
+def benchmark_algorithm(name: str, corpus: Sequence[Tuple[int, int]], repeats: int = 5,
+                        warmup: int = 1, max_depth: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Mede um algoritmo no corpus. Cada tabuleiro é resolvido `warmup` vezes
+    sem medir (imports, tabelas, caches de CPU) e `repeats` vezes medindo,
+    com o coletor de lixo desligado durante as medições. Tabuleiros mais
+    fundos que `max_depth` são pulados.
+
+    Returns:
+        {"summary": {...}, "by_depth": {profundidade: {...}}}; "optimal" conta
+        os tabuleiros resolvidos com a profundidade ótima do corpus
+    """
+    solve = _load_solver(name)
+    stats = SearchStats()
+    samples: Dict[int, List[float]] = {}
+    expansions: Dict[int, int] = {}
+    cases: Dict[int, int] = {}
+    optimal: Dict[int, int] = {}
+
+    gc_enabled = gc.isenabled()
+    try:
+        for depth, state in corpus:
+            if max_depth is not None and depth > max_depth:
+                continue
+            board = Board(state)
+            for _ in range(warmup):
+                solve(board, stats)
+            # Coleta antes e nenhuma coleta durante as medições do tabuleiro
+            gc.collect()
+            gc.disable()
+            case_optimal = True
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                solve(board, stats)
+                elapsed = time.perf_counter() - start_time
+                samples.setdefault(depth, []).append(elapsed)
+                expansions[depth] = expansions.get(depth, 0) + stats.expansions
+                case_optimal = case_optimal and stats.solution_depth == depth
+            if gc_enabled:
+                gc.enable()
+            cases[depth] = cases.get(depth, 0) + 1
+            optimal[depth] = optimal.get(depth, 0) + case_optimal
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    by_depth = {
+        str(depth): summarize(samples[depth], expansions[depth], cases[depth], optimal[depth])
+        for depth in sorted(samples)
+    }
+    all_times = [t for depth in sorted(samples) for t in samples[depth]]
+    return {
+        "summary": summarize(all_times, sum(expansions.values()), sum(cases.values()), sum(optimal.values())),
+        "by_depth": by_depth,
+    }
+
+
+def run_benchmark(algorithms: Sequence[str] = DEFAULT_ALGORITHMS, depths: Iterable[int] = range(MAX_DEPTH + 1),
+                  per_depth: int = 5, seed: int = 0, repeats: int = 5, warmup: int = 1,
+                  progress: Optional[Callable[[str], None]] = None,
+                  caps: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """
+    Gera o corpus e mede cada algoritmo; o resultado é serializável em JSON.
+    `caps` sobrepõe DEPTH_CAPS (profundidade máxima medida por algoritmo).
+    """
+    for name in algorithms:
+        if name not in ALGORITHMS:
+            raise ValueError(f"Algoritmo desconhecido: {name!r} (disponíveis: {', '.join(ALGORITHMS)})")
+    caps = dict(DEPTH_CAPS, **(caps or {}))
+    for name in caps:
+        if name not in ALGORITHMS:
+            raise ValueError(f"Algoritmo desconhecido: {name!r} (disponíveis: {', '.join(ALGORITHMS)})")
+    depths = sorted(set(depths))
+    corpus = build_corpus(depths, per_depth, seed)
+
+    results = {}
+    for name in algorithms:
+        if progress is not None:
+            progress(name)
+        results[name] = benchmark_algorithm(name, corpus, repeats, warmup, caps.get(name))
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "per_depth": per_depth,
+            "depths": depths,
+            "repeats": repeats,
+            "warmup": warmup,
+            "caps": {name: caps[name] for name in algorithms if name in caps},
+        },
+        "corpus": [[depth, state] for depth, state in corpus],
+        "results": results,
+    }
+
+
+CSV_FIELDS = ("algorithm", "depth", "cases", "samples", "median", "p95", "p99", "min", "max", "nodes_per_s", "optimal")
+
+
+def csv_rows(report: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Uma linha por algoritmo e profundidade, mais a linha "all" do total"""
+    rows = []
+    for name, result in report["results"].items():
+        rows.append(dict(result["summary"], algorithm=name, depth="all"))
+        for depth, summary in result["by_depth"].items():
+            rows.append(dict(summary, algorithm=name, depth=depth))
+    return rows
+
+
+def write_report(report: Dict[str, Any], path: str) -> None:
+    """Grava em JSON ou, se o arquivo termina em .csv, em CSV ('-' = stdout em JSON)"""
+    if path.endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(csv_rows(report))
+        return
+    text = json.dumps(report, indent=2)
+    if path == "-":
+        sys.stdout.write(text + "\n")
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+# Campos do meta que definem o que foi medido; se diferem, as medianas não são comparáveis
+CORPUS_FIELDS = ("seed", "per_depth", "depths", "caps")
+
+
+def corpus_mismatches(base: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Campos de CORPUS_FIELDS e tabuleiros que diferem entre os dois relatórios"""
+    mismatches = [f"{field}: {base['meta'].get(field)!r} != {new['meta'].get(field)!r}"
+                  for field in CORPUS_FIELDS if base["meta"].get(field) != new["meta"].get(field)]
+    if not mismatches and base.get("corpus") != new.get("corpus"):
+        mismatches.append("corpus: tabuleiros diferentes")
+    return mismatches
+
+
+def compare_reports(base: Dict[str, Any], new: Dict[str, Any], threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compara as medianas de dois relatórios, por algoritmo (total e por
+    profundidade). ratio = nova / base; regression quando ratio > 1 + threshold.
+    Algoritmos ou profundidades ausentes em um dos lados são ignorados.
+
+    Raises:
+        ValueError: se os relatórios não usaram o mesmo corpus (ver corpus_mismatches)
+    """
+    mismatches = corpus_mismatches(base, new)
+    if mismatches:
+        raise ValueError("Relatórios com corpus diferentes: " + "; ".join(mismatches))
+    rows = []
+    for name, base_result in base["results"].items():
+        new_result = new["results"].get(name)
+        if new_result is None:
+            continue
+        pairs = [("all", base_result["summary"], new_result["summary"])]
+        pairs += [(depth, summary, new_result["by_depth"][depth])
+                  for depth, summary in base_result["by_depth"].items() if depth in new_result["by_depth"]]
+        for depth, before, after in pairs:
+            ratio = after["median"] / before["median"] if before["median"] > 0 else 1.0
+            rows.append({
+                "algorithm": name,
+                "depth": depth,
+                "base_median": before["median"],
+                "new_median": after["median"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+                "improvement": ratio < 1 - threshold,
+            })
+    return rows
+
+
+def print_summary(report: Dict[str, Any]) -> None:
+    print(f"{'Algoritmo':<14} {'Casos':>6} {'Mediana (ms)':>13} {'p95 (ms)':>10} {'p99 (ms)':>10} "
+          f"{'Nós/s':>12} {'Ótimos':>7}", file=sys.stderr)
+    for name, result in report["results"].items():
+        summary = result["summary"]
+        print(f"{name:<14} {summary['cases']:>6} {summary['median'] * 1000:>13.3f} {summary['p95'] * 1000:>10.3f} "
+              f"{summary['p99'] * 1000:>10.3f} {summary['nodes_per_s']:>12.0f} {summary['optimal']:>7}",
+              file=sys.stderr)
+
+
+def print_comparison(rows: List[Dict[str, Any]], show_all: bool = False) -> None:
+    print(f"{'Algoritmo':<14} {'Prof.':>5} {'Base (ms)':>10} {'Novo (ms)':>10} {'Razão':>7}")
+    for row in rows:
+        if not (show_all or row["depth"] == "all" or row["regression"]):
+            continue
+        flag = " REGRESSÃO" if row["regression"] else (" melhora" if row["improvement"] else "")
+        print(f"{row['algorithm']:<14} {row['depth']:>5} {row['base_median'] * 1000:>10.3f} "
+              f"{row['new_median'] * 1000:>10.3f} {row['ratio']:>7.2f}{flag}")
+
+
+def parse_depths(text: str) -> List[int]:
+    """'0-31', '10,20,31' ou combinações ('0-5,31')"""
+    depths = []
+    for part in text.split(","):
+        if "-" in part:
+            first, last = part.split("-", 1)
+            depths.extend(range(int(first), int(last) + 1))
+        elif part:
+            depths.append(int(part))
+    return depths
+
+
+def parse_caps(items: Iterable[str]) -> Dict[str, int]:
+    """['iddfs=25', 'bfs=31'] -> {'iddfs': 25, 'bfs': 31}"""
+    caps = {}
+    for item in items:
+        name, sep, depth = item.partition("=")
+        if not sep:
+            raise ValueError(f"Teto inválido: {item!r} (use nome=profundidade)")
+        caps[name] = int(depth)
+    return caps
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark estratificado por profundidade ótima")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="mede os algoritmos e grava o relatório")
+    run.add_argument("--algorithms", default=",".join(DEFAULT_ALGORITHMS),
+                     help=f"lista separada por vírgulas ({', '.join(ALGORITHMS)})")
+    run.add_argument("--depths", default=f"0-{MAX_DEPTH}", help="profundidades ótimas (ex.: 0-31, 0-20,31)")
+    run.add_argument("--per-depth", type=int, default=5, help="tabuleiros por profundidade")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--repeats", type=int, default=5, help="execuções medidas por tabuleiro")
+    run.add_argument("--warmup", type=int, default=1, help="execuções de aquecimento por tabuleiro")
+    run.add_argument("--cap", action="append", default=[], metavar="NOME=PROF",
+                     help=f"profundidade máxima de um algoritmo (padrão: "
+                          f"{', '.join(f'{name}={depth}' for name, depth in DEPTH_CAPS.items())})")
+    run.add_argument("--out", default="-", help="arquivo .json ou .csv ('-' = JSON no stdout)")
+
+    compare = commands.add_parser("compare", help="compara dois relatórios JSON")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=0.10, help="piora relativa tolerada (0.10 = 10%%)")
+    compare.add_argument("--all", action="store_true", help="mostra todas as profundidades, não só as regressões")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        try:
+            report = run_benchmark(
+                [name for name in args.algorithms.split(",") if name], parse_depths(args.depths),
+                args.per_depth, args.seed, args.repeats, args.warmup,
+                progress=lambda name: print(f"Medindo {name}...", file=sys.stderr),
+                caps=parse_caps(args.cap),
+            )
+        except ValueError as e:
+            print(f"ERRO: {e}", file=sys.stderr)
+            return 2
+        write_report(report, args.out)
+        print_summary(report)
+        return 0
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    try:
+        rows = compare_reports(base, new, args.threshold)
+    except ValueError as e:
+        print(f"ERRO: {e}", file=sys.stderr)
+        return 2
+    print_comparison(rows, args.all)
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold:.0%}")
+        return 1
+    print(f"\nSem regressões acima de {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,45 +1,177 @@
 from typing import List, Dict, Tuple, Set
 from collections import deque
-from generate_succeessors import create_successors
+from generate_succeessors import create_successors, expand_state
+from node_arena import NodeArena
 from Node import Node
+from packed_state import GOAL_STATE, INVERSE_ACTIONS, pack, get_layout
+from state_rank import closed_set, state_key
+from move_table import table_for
 
-init_board = [4,5,7,
+init_board = pack([4,5,7,
               8,0,1,
-              3,6,2]
-final_state =  [
-              1,2,3,
-              4,5,6,
-              7,8,0
-                    ]
+              3,6,2])
+final_state = GOAL_STATE
 
 root = Node(init_board, None, None)
 
-def bfs(node: Node):
+def bfs(node: Node, size: int = 3, progress=None, stats=None):
+  """
+  BFS nível a nível. `progress` (SearchProgress, opcional) recebe o andamento
+  e pode cancelar a busca (SearchCancelled); `stats` (SearchStats, opcional)
+  recebe as métricas comuns e os ganchos.
+  """
+  layout = get_layout(size)
+  final_state = layout.goal_state
   visit_nodes = 0
+  if stats is not None:
+    stats.start()
   if node.state == final_state:
-    return (node, visit_nodes)
+    if stats is not None:
+      stats.finish(0, 0, 0, 0, 1, 0)
+      if stats.on_goal is not None:
+        stats.on_goal(node.state, 0)
+    return (node, visit_nodes, 1)
+  # Nós como handles da arena (colunas array.array); só a solução vira Node
+  arena = NodeArena(layout)
+  states, keys = arena.states, arena.keys
   fronteira = deque()
-  fronteira.append(node)
-  explorados = set(node.state)
+  fronteira.append(arena.add(node.state, rank=state_key(node.state, size)))
+  table = table_for(node.state) if size == 3 else None
+  explorados = closed_set(size)
+  explorados.add_rank(keys[0])
+  expansions = 0
+  generations = 0
+  peak_frontier = 1
+  on_expand = stats.on_expand if stats is not None else None
+  on_generate = stats.on_generate if stats is not None else None
   while True:
     actual_level_nodes = list()
     if not fronteira:
+      if stats is not None:
+        # Cada filho novo virou um nó da arena; os demais eram repetidos
+        stats.finish(expansions, generations, generations - (len(arena) - 1), peak_frontier, len(explorados), -1)
       return None
     while fronteira:
       actual_node = fronteira.popleft()
-      if actual_node.state == final_state:
+      if states[actual_node] == final_state:
         visit_nodes += 1
-        return (actual_node, visit_nodes, len(explorados))
+        if stats is not None:
+          stats.finish(expansions, generations, generations - (len(arena) - 1), peak_frontier,
+                       len(explorados), arena.costs[actual_node])
+          if stats.on_goal is not None:
+            stats.on_goal(states[actual_node], arena.costs[actual_node])
+        return (arena.to_node(actual_node), visit_nodes, len(explorados))
       visit_nodes += 1
+      if progress is not None and visit_nodes % progress.interval == 0:
+        progress.report(visit_nodes, len(fronteira) + len(actual_level_nodes))
       actual_level_nodes.append(actual_node)
       #expand nodes
     for explo_node in actual_level_nodes:
-       expand_nodes = create_successors(explo_node)
-       for nodes in expand_nodes:
-         node_state_tuple = tuple(nodes.state)
-         if node_state_tuple not in explorados:
-           fronteira.append(nodes)
-           explorados.add(tuple(nodes.state))
+       if on_expand is not None:
+         on_expand(states[explo_node], arena.costs[explo_node])
+       expand_nodes = expand_state(states[explo_node], keys[explo_node], table, layout)
+       expansions += 1
+       generations += len(expand_nodes)
+       if on_generate is not None:
+         for child, _, _ in expand_nodes:
+           on_generate(child, states[explo_node])
+       for child, code, key in expand_nodes:
+         if explorados.add_rank(key):
+           fronteira.append(arena.add(child, explo_node, code, key))
+    peak_frontier = max(peak_frontier, len(fronteira))
+
+
+def bidirectional_bfs(node: Node, size: int = 3, progress=None, stats=None):
+  """
+  BFS bidirecional: cresce uma fronteira a partir do início e outra a partir
+  do objetivo, expandindo sempre o nível do lado menor. Quando um filho já foi
+  alcançado pelo outro lado, os dois caminhos são unidos nesse estado.
+  Retorna o mesmo contrato de bfs: (nó solução, nós visitados, estados armazenados).
+  `progress` e `stats` como em bfs; os ganchos veem os dois lados (no lado
+  do objetivo, on_generate recebe o filho e o pai na direção da busca de trás).
+  """
+  layout = get_layout(size)
+  final_state = layout.goal_state
+  visit_nodes = 0
+  if stats is not None:
+    stats.start()
+  if node.state == final_state:
+    if stats is not None:
+      stats.finish(0, 0, 0, 0, 1, 0)
+      if stats.on_goal is not None:
+        stats.on_goal(node.state, 0)
+    return (node, visit_nodes, 1)
+  if not layout.is_solvable(node.state):
+    if stats is not None:
+      stats.finish(0, 0, 0, 0, 0, -1)
+    return None
+  goal_node = Node(final_state)
+  forward = {node.state: node}
+  backward = {final_state: goal_node}
+  forward_level = [node]
+  backward_level = [goal_node]
+  generations = 0
+  duplicates = 0
+  peak_frontier = 2
+  on_expand = stats.on_expand if stats is not None else None
+  on_generate = stats.on_generate if stats is not None else None
+  while forward_level and backward_level:
+    expand_forward = len(forward_level) <= len(backward_level)
+    if expand_forward:
+      level, explorados, other_side = forward_level, forward, backward
+    else:
+      level, explorados, other_side = backward_level, backward, forward
+    next_level = list()
+    meeting = None
+    for actual_node in level:
+      visit_nodes += 1
+      if progress is not None and visit_nodes % progress.interval == 0:
+        progress.report(visit_nodes, len(level) + len(next_level))
+      if on_expand is not None:
+        on_expand(actual_node.state, actual_node.cost)
+      children = create_successors(actual_node, layout=layout)
+      generations += len(children)
+      if on_generate is not None:
+        for child in children:
+          on_generate(child.state, actual_node.state)
+      for child in children:
+        if child.state in explorados:
+          duplicates += 1
+          continue
+        explorados[child.state] = child
+        next_level.append(child)
+        # Encontro: guarda o de menor custo do outro lado neste nível
+        other_node = other_side.get(child.state)
+        if other_node is not None and (meeting is None or other_node.cost < meeting[1].cost):
+          meeting = (child, other_node)
+    if meeting:
+      forward_node, backward_node = meeting if expand_forward else (meeting[1], meeting[0])
+      solution = join_paths(forward_node, backward_node)
+      if stats is not None:
+        stats.finish(visit_nodes, generations, duplicates, peak_frontier, len(forward) + len(backward), solution.cost)
+        if stats.on_goal is not None:
+          stats.on_goal(final_state, solution.cost)
+      return (solution, visit_nodes, len(forward) + len(backward))
+    if expand_forward:
+      forward_level = next_level
+    else:
+      backward_level = next_level
+    peak_frontier = max(peak_frontier, len(forward_level) + len(backward_level))
+  if stats is not None:
+    stats.finish(visit_nodes, generations, duplicates, peak_frontier, len(forward) + len(backward), -1)
+  return None
+
+
+def join_paths(forward_node: Node, backward_node: Node) -> Node:
+  """
+  Continua o caminho de `forward_node` seguindo a metade do objetivo.
+  Na metade de trás cada ação leva do pai ao filho, então é invertida.
+  """
+  node = forward_node
+  while backward_node.parent:
+    node = Node(backward_node.parent.state, INVERSE_ACTIONS[backward_node.action], node)
+    backward_node = backward_node.parent
+  return node
 
 
 def backtracking(node: Node):
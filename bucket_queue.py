@@ -0,0 +1,80 @@
+"""
+Fila de prioridade por baldes (bucket queue) para a fronteira das buscas.
+
+As prioridades do A* (f, com desempate por g) e da busca gulosa (h) são
+inteiros pequenos e limitados, então em vez de um heap de tuplas a fila
+guarda um balde por f e, dentro dele, um balde por g. Cada balde é uma
+deque, o que mantém a ordem FIFO entre empates (a mesma do contador usado
+antes no heap). push e pop custam O(1) amortizado: os cursores do menor f e
+do menor g de cada f só recuam quando um item menor é inserido. Cada entrada
+ocupa apenas uma referência na deque, sem tupla (f, g, contador, nó).
+"""
+
+from collections import deque
+from typing import Any, List, Tuple
+
+
+class BucketQueue:
+    """Fila mínima por (prioridade, desempate), ambos inteiros >= 0"""
+
+    __slots__ = ('buckets', 'counts', 'ties', 'minimum', 'size')
+
+    def __init__(self):
+        self.buckets: List[List[deque]] = []  # buckets[prioridade][desempate]
+        self.counts: List[int] = []           # itens por prioridade
+        self.ties: List[int] = []             # menor desempate possivelmente ocupado
+        self.minimum = 0                      # menor prioridade possivelmente ocupada
+        self.size = 0
+
+    def push(self, item: Any, priority: int, tie: int = 0) -> None:
+        """Insere `item`; menores (priority, tie) saem primeiro, FIFO nos empates"""
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+            self.counts.append(0)
+            self.ties.append(0)
+        row = buckets[priority]
+        while len(row) <= tie:
+            row.append(deque())
+        row[tie].append(item)
+
+        if self.counts[priority] == 0 or tie < self.ties[priority]:
+            self.ties[priority] = tie
+        self.counts[priority] += 1
+        if self.size == 0 or priority < self.minimum:
+            self.minimum = priority
+        self.size += 1
+
+    def pop(self) -> Tuple[int, int, Any]:
+        """
+        Remove o menor item.
+
+        Returns:
+            (prioridade, desempate, item)
+
+        Raises:
+            IndexError: se a fila está vazia
+        """
+        if self.size == 0:
+            raise IndexError("pop de uma fila vazia")
+        counts = self.counts
+        priority = self.minimum
+        while counts[priority] == 0:
+            priority += 1
+        self.minimum = priority
+
+        row = self.buckets[priority]
+        tie = self.ties[priority]
+        while not row[tie]:
+            tie += 1
+        self.ties[priority] = tie
+
+        counts[priority] -= 1
+        self.size -= 1
+        return priority, tie, row[tie].popleft()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
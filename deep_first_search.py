@@ -1,34 +1,237 @@
 from Node import Node
-from generate_succeessors import create_successors
-final_state = [1,2,3,
-               4,5,6,
-               7,8,0]
+from generate_succeessors import expand_state
+from node_arena import NodeArena
+from packed_state import ACTIONS, GOAL_STATE, pack, unpack, get_layout
+from state_rank import closed_set, state_key
+from move_table import table_for
+final_state = GOAL_STATE
 
-def dfs(node: Node):
+# Diâmetro do 8-puzzle: toda solução ótima 3x3 cabe em 31 movimentos
+PUZZLE_DIAMETER = 31
+
+# Limite padrão da DFS limitada e do IDDFS. A busca é cega e só evita ciclos
+# no caminho: no pior caso são ~3^limite nós, então o padrão fica em 20
+# (abaixo de 1 s por tabuleiro); quem quer cobrir todo o 3x3 passa
+# PUZZLE_DIAMETER explicitamente
+DEFAULT_DEPTH_LIMIT = 20
+
+def dfs(node: Node, size: int = 3, progress=None, stats=None):
+  """
+  DFS com pilha explícita. `progress` (SearchProgress, opcional) recebe o
+  andamento e pode cancelar a busca (SearchCancelled); `stats` (SearchStats,
+  opcional) recebe as métricas comuns e os ganchos.
+  """
+  layout = get_layout(size)
+  final_state = layout.goal_state
   visited_nodes = 0
-  explored_states = set()
+  table = table_for(node.state) if size == 3 else None
+  # Nós como handles da arena (colunas array.array); só a solução vira Node
+  arena = NodeArena(layout)
+  states, keys = arena.states, arena.keys
+  explored_states = closed_set(size)
   frontier = list()
-  frontier.append(node)
-  explored_states.add(tuple(node.state))
+  frontier.append(arena.add(node.state, rank=state_key(node.state, size)))
+  explored_states.add_rank(keys[0])
+  generations = 0
+  peak_frontier = 1
+  if stats is not None:
+    stats.start()
+  on_expand = stats.on_expand if stats is not None else None
+  on_generate = stats.on_generate if stats is not None else None
   while frontier:
+    if len(frontier) > peak_frontier:
+      peak_frontier = len(frontier)
     actual_node = frontier.pop()
     visited_nodes += 1
-    if actual_node.state == final_state:
-      return (actual_node, visited_nodes, len(explored_states))
-    for child in create_successors(actual_node):
-      if tuple(child.state) not in explored_states:
-        frontier.append(child)  
-        explored_states.add(tuple(child.state))
+    if progress is not None and visited_nodes % progress.interval == 0:
+      progress.report(visited_nodes, len(frontier))
+    if states[actual_node] == final_state:
+      if stats is not None:
+        # Cada filho novo virou um nó da arena; os demais eram repetidos
+        stats.finish(visited_nodes - 1, generations, generations - (len(arena) - 1), peak_frontier,
+                     len(explored_states), arena.costs[actual_node])
+        if stats.on_goal is not None:
+          stats.on_goal(states[actual_node], arena.costs[actual_node])
+      return (arena.to_node(actual_node), visited_nodes, len(explored_states))
+    if on_expand is not None:
+      on_expand(states[actual_node], arena.costs[actual_node])
+    children = expand_state(states[actual_node], keys[actual_node], table, layout)
+    generations += len(children)
+    if on_generate is not None:
+      for child, _, _ in children:
+        on_generate(child, states[actual_node])
+    for child, code, key in children:
+      if explored_states.add_rank(key):
+        frontier.append(arena.add(child, actual_node, code, key))
+  if stats is not None:
+    stats.finish(visited_nodes, generations, generations - (len(arena) - 1), peak_frontier, len(explored_states), -1)
   return (None, visited_nodes, len(explored_states))
-        
+
+def _move_tables(layout):
+  """
+  moves[vazio] = ((alvo, código, deslocamento do alvo, deslocamento do vazio,
+  variação do campo do vazio), ...): com eles um movimento é só aritmética
+  sobre o estado empacotado. undo[vazio][código] é o movimento que desfaz
+  `código` quando o vazio está em `vazio`.
+  """
+  codes = {action: code for code, action in enumerate(ACTIONS)}
+  bits = layout.cell_bits
+  shift = layout.blank_shift
+  moves = tuple(
+    tuple((target, codes[action], target * bits, blank * bits, (target - blank) << shift)
+          for target, action in layout.neighbors[blank])
+    for blank in range(layout.cells)
+  )
+  undo = [[None] * len(ACTIONS) for _ in range(layout.cells)]
+  for blank in range(layout.cells):
+    for move in moves[blank]:
+      target, code = move[0], move[1]
+      undo[target][code] = next(back for back in moves[target] if back[0] == blank)
+  return moves, undo
+
+def _limited_search(state, limit, layout, tables, visited_nodes, progress, on_expand, on_generate):
+  """
+  DFS até `limit` movimentos sobre um único estado empacotado.
+  A pilha guarda só o código de cada movimento do caminho e o próximo vizinho
+  a tentar em cada nível; voltar é desfazer o movimento no próprio estado. O
+  teste de ciclo olha apenas os estados do caminho atual, então a memória é
+  O(limit) (um estado pode ser revisitado por outro caminho).
+
+  Returns:
+    (códigos da solução ou None, houve corte no limite, visitados,
+     gerados, descartados por ciclo, maior profundidade)
+  """
+  goal = layout.goal_state
+  blank_shift = layout.blank_shift
+  cell_mask = layout.cell_mask
+  moves, undo = tables
+  if state == goal:
+    return [], False, visited_nodes, 0, 0, 0
+  if limit == 0:
+    return None, True, visited_nodes, 0, 0, 0
+  codes = []                                     # movimentos do caminho atual
+  pending = [iter(moves[state >> blank_shift])]  # vizinhos ainda não tentados em cada nível
+  on_path = {state}
+  generated = 0
+  cycles = 0
+  cutoff = False
+  max_depth = 0
+  visited_nodes += 1
+  if progress is not None and visited_nodes % progress.interval == 0:
+    progress.report(visited_nodes, 0)
+  if on_expand is not None:
+    on_expand(state, 0)
+  while pending:
+    move = next(pending[-1], None)
+    if move is None:
+      # Filhos esgotados: sobe um nível desfazendo o movimento
+      pending.pop()
+      if codes:
+        on_path.discard(state)
+        _, _, from_shift, to_shift, blank_delta = undo[state >> blank_shift][codes.pop()]
+        tile = (state >> from_shift) & cell_mask
+        state += (tile << to_shift) - (tile << from_shift) + blank_delta
+      continue
+    target, code, from_shift, to_shift, blank_delta = move
+    tile = (state >> from_shift) & cell_mask
+    child = state + (tile << to_shift) - (tile << from_shift) + blank_delta
+    generated += 1
+    if on_generate is not None:
+      on_generate(child, state)
+    if child in on_path:
+      cycles += 1
+      continue
+    depth = len(codes) + 1
+    if child == goal:
+      codes.append(code)
+      return codes, cutoff, visited_nodes, generated, cycles, max(max_depth, depth)
+    if depth == limit:
+      cutoff = True
+      continue
+    # Desce: o filho passa a ser o estado atual e é expandido
+    codes.append(code)
+    on_path.add(child)
+    pending.append(iter(moves[target]))
+    state = child
+    visited_nodes += 1
+    if progress is not None and visited_nodes % progress.interval == 0:
+      progress.report(visited_nodes, depth)
+    if depth > max_depth:
+      max_depth = depth
+    if on_expand is not None:
+      on_expand(state, depth)
+  return None, cutoff, visited_nodes, generated, cycles, max_depth
+
+def _bounded_dfs(node, size, limits, progress, stats):
+  """Executa _limited_search para cada limite até achar a solução ou esgotar a busca"""
+  layout = get_layout(size)
+  state = node.state
+  if stats is not None:
+    stats.start()
+  on_expand = stats.on_expand if stats is not None else None
+  on_generate = stats.on_generate if stats is not None else None
+  visited_nodes = generations = duplicates = peak_depth = 0
+  codes = None
+  # Tabuleiro insolúvel: nenhum limite resolveria, nem vale buscar
+  if state == layout.goal_state or layout.is_solvable(state):
+    tables = _move_tables(layout)
+    for limit in limits:
+      codes, cutoff, visited_nodes, generated, cycles, depth = _limited_search(
+        state, limit, layout, tables, visited_nodes, progress, on_expand, on_generate)
+      generations += generated
+      duplicates += cycles
+      peak_depth = max(peak_depth, depth)
+      if codes is not None or not cutoff:
+        break
+  if codes is None:
+    if stats is not None:
+      stats.finish(visited_nodes, generations, duplicates, peak_depth, peak_depth + 1 if visited_nodes else 0, -1)
+    return (None, visited_nodes, peak_depth + 1)
+  solution = Node.from_moves(state, [ACTIONS[code] for code in codes], layout)
+  if stats is not None:
+    stats.finish(visited_nodes, generations, duplicates, peak_depth, peak_depth + 1, len(codes))
+    if stats.on_goal is not None:
+      stats.on_goal(solution.state, len(codes))
+  return (solution, visited_nodes, peak_depth + 1)
+
+def depth_limited_dfs(node: Node, size: int = 3, limit: int = DEFAULT_DEPTH_LIMIT, progress=None, stats=None):
+  """
+  DFS com limite de profundidade e memória O(limit): só o caminho atual fica
+  em memória (códigos dos movimentos, um estado empacotado desfeito no lugar
+  e o conjunto de estados do caminho, para não andar em ciclos).
+
+  Devolve a primeira solução com até `limit` movimentos, que não é
+  necessariamente a mais curta, ou None se nenhuma couber no limite (o
+  padrão, DEFAULT_DEPTH_LIMIT, não alcança os tabuleiros mais fundos; use
+  limit=PUZZLE_DIAMETER para cobrir todo o 3x3, ao custo de ~3^31 nós). Mesmo contrato de dfs: (nó solução ou None,
+  visitados, estados armazenados), onde os armazenados são o maior caminho
+  mantido. Em `stats`, peak_frontier é a maior profundidade, peak_closed o
+  maior caminho e duplicates os filhos descartados por ciclo.
+  """
+  if limit < 0:
+    raise ValueError("limit deve ser maior ou igual a zero")
+  return _bounded_dfs(node, size, (limit,), progress, stats)
+
+def iterative_deepening_dfs(node: Node, size: int = 3, max_depth: int = DEFAULT_DEPTH_LIMIT, progress=None, stats=None):
+  """
+  Aprofundamento iterativo: depth_limited_dfs com limites 0, 1, ...,
+  max_depth. A primeira solução encontrada é ótima, com a memória da DFS
+  limitada. Para no primeiro limite em que nenhum ramo foi cortado (não há
+  solução mais funda) e devolve None para tabuleiros insolúveis sem buscar
+  ou com solução ótima maior que `max_depth` (ver DEFAULT_DEPTH_LIMIT).
+  Mesmo contrato e métricas de depth_limited_dfs, somados entre as iterações.
+  """
+  if max_depth < 0:
+    raise ValueError("max_depth deve ser maior ou igual a zero")
+  return _bounded_dfs(node, size, range(max_depth + 1), progress, stats)
+
 if __name__ == "__main__":
-  initial_board =  [1,0,3,
+  initial_board =  pack([1,0,3,
                4,2,6,
-               7,5,8]
+               7,5,8])
 
   root = Node(initial_board, None, None)
   node_solve, visited_nodes, explored_states_len = dfs(root)
   for node in node_solve.path():
-    print(node.state, node.action)
+    print(unpack(node.state), node.action)
   print(f"Nós visitados:{visited_nodes}, \nQuantidade de estados armazenados: {explored_states_len}" )
-  
@@ -0,0 +1,153 @@
+"""
+Oráculo de distâncias exatas para o 8-puzzle.
+
+Uma única BFS retrógrada a partir do objetivo, sobre a tabela de movimentos
+(move_table), grava a distância ótima de cada um dos 181.440 estados
+solvíveis em um bytearray (1 byte por estado). Depois disso, qualquer
+tabuleiro é resolvido de forma ótima descendo a tabela gulosamente: a cada
+passo basta escolher um vizinho com distância uma unidade menor.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from Node import Node
+from puzzle_game import Board
+from move_table import MoveTable, get_move_table
+from packed_state import ACTIONS, GOAL_STATE, is_solvable
+from puzzle_db import DatabaseError, get_database
+from search_stats import SearchStats
+from state_rank import REACHABLE_STATES, rank_state
+
+UNKNOWN = 0xFF
+
+
+class DistanceOracle:
+    """Distância ótima até o objetivo para cada rank solvível"""
+
+    def __init__(self, distances: bytearray, table: MoveTable):
+        self.distances = distances
+        self.table = table
+
+    @classmethod
+    def build(cls, table: Optional[MoveTable] = None) -> 'DistanceOracle':
+        """BFS retrógrada (nível a nível) a partir do objetivo"""
+        if table is None:
+            table = get_move_table()
+        successors = table.successors
+        distances = bytearray([UNKNOWN]) * REACHABLE_STATES
+
+        goal_rank = rank_state(GOAL_STATE)
+        distances[goal_rank] = 0
+        level = [goal_rank]
+        depth = 0
+        while level:
+            depth += 1
+            next_level = []
+            for rank in level:
+                base = rank * 4
+                for child in successors[base:base + 4]:
+                    if child >= 0 and distances[child] == UNKNOWN:
+                        distances[child] = depth
+                        next_level.append(child)
+            level = next_level
+        return cls(distances, table)
+
+    def distance(self, state: int) -> int:
+        """Distância ótima do estado ao objetivo (-1 se não solvível)"""
+        if not is_solvable(state):
+            return -1
+        return self.distances[rank_state(state)]
+
+    def solve(self, state: int) -> Optional[List[str]]:
+        """Sequência ótima de movimentos, ou None se o estado não é solvível"""
+        if not is_solvable(state):
+            return None
+        successors = self.table.successors
+        distances = self.distances
+        rank = rank_state(state)
+        moves = []
+        depth = distances[rank]
+        while depth > 0:
+            base = rank * 4
+            for code in range(4):
+                child = successors[base + code]
+                if child >= 0 and distances[child] == depth - 1:
+                    moves.append(ACTIONS[code])
+                    rank = child
+                    break
+            depth -= 1
+        return moves
+
+    def max_distance(self) -> int:
+        """Maior distância ótima do espaço de estados (31 no 8-puzzle)"""
+        return max(d for d in self.distances if d != UNKNOWN)
+
+
+_oracle: Optional[DistanceOracle] = None
+
+
+def get_distance_oracle() -> DistanceOracle:
+    """Retorna o oráculo compartilhado, construído uma única vez por processo"""
+    global _oracle
+    if _oracle is None:
+        _oracle = DistanceOracle.build()
+    return _oracle
+
+
+def oracle_search(initial_board: Board, stats: Optional[SearchStats] = None) -> Tuple[Optional[Node], Dict[str, Any]]:
+    """
+    Resolve o tabuleiro consultando o oráculo de distâncias.
+
+    Mesmo contrato de a_star_search: (nó solução, métricas), com o caminho
+    disponível via Node.path(). Se o banco em disco (puzzle_db) existir, ele
+    é usado diretamente e a tabela não precisa ser construída. `stats`
+    (opcional) conta cada passo da descida como uma expansão.
+
+    Raises:
+        ValueError: para tabuleiros que não são 3x3 (o oráculo cobre só o 8-puzzle)
+    """
+    if initial_board.size != 3:
+        raise ValueError("O oráculo de distâncias só cobre o tabuleiro 3x3")
+    if stats is not None:
+        stats.start()
+    database = get_database()
+    try:
+        moves = database.solve(initial_board.packed) if database is not None else None
+    except DatabaseError:
+        database = None
+    if database is None:
+        moves = get_distance_oracle().solve(initial_board.packed)
+    if moves is None:
+        if stats is not None:
+            stats.finish(0, 0, 0, 0, 0, -1)
+        return None, {
+            "visited_nodes": 0,
+            "explored_states": 0,
+            "max_frontier": 0,
+            "solution_depth": -1
+        }
+
+    solution = Node.from_moves(initial_board.packed, moves)
+    if stats is not None:
+        stats.finish(len(moves), 0, 0, 0, 0, len(moves))
+        if stats.on_goal is not None:
+            stats.on_goal(solution.state, len(moves))
+    return solution, {
+        "visited_nodes": len(moves),
+        "explored_states": len(moves) + 1,
+        "max_frontier": 0,
+        "solution_depth": len(moves)
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    start_time = time.perf_counter()
+    oracle = get_distance_oracle()
+    print(f"Oráculo construído em {time.perf_counter() - start_time:.2f}s")
+    print(f"Distância máxima: {oracle.max_distance()}")
+
+    board = Board([[8, 6, 7], [2, 5, 4], [3, 0, 1]])
+    moves = oracle.solve(board.packed)
+    print(f"Solução ({len(moves)} movimentos): {' '.join(moves)}")
@@ -1,33 +1,121 @@
 from typing import List, Dict, Tuple, Set
 from Node import Node
-init_board = [
+from packed_state import NEIGHBORS, BLANK_SHIFT, CELL_BITS, CELL_MASK, pack, unpack, successors, move_blank, get_layout
+from move_table import ACTION_CODES
+from state_rank import rank_state
+from heuristics import MANHATTAN
+init_board = pack([
               1,2,3,
               4,5,6,
               7,0,8
-                    ]
+                    ])
 root = Node(init_board, None, None)
 
-def create_successors(node: Node):
-  list_valid_nodes = list()
-  valid_positions = {0:((1,"RIGHT"),(3, "DOWN")), 
-                     1:((0,"LEFT"),(2,"RIGHT"),(4,"DOWN")), 
-                     2:((1,"LEFT"),(5,"DOWN")), 
-                     3:((0,"UP"),(4,"RIGHT"),(6,"DOWN")), 
-                     4:((1,"UP"),(3,"LEFT"),(5,"RIGHT"),(7,"DOWN")), 
-                     5:((2,"UP"),(4,"LEFT"),(8,"DOWN")), 
-                     6:((3,"UP"),(7,"RIGHT")), 
-                     7:((4,"UP"),(6,"LEFT"),(8,"RIGHT")), 
-                     8:((5,"UP"),(7,"LEFT"))
-                     }
-  current_pos = node.state.index(0)
-  for pos, action in valid_positions[current_pos]:
-    new_board = node.state.copy()
-    aux = new_board[pos]
-    new_board[pos] = new_board[current_pos]
-    new_board[current_pos] = aux
-    list_valid_nodes.append(Node(new_board, action, node))
-  return list_valid_nodes
+def create_successors(node: Node, table=None, layout=None):
+  """
+  Gera os filhos de `node`.
+  Se o nó tem rank, os filhos também recebem o seu: lido da tabela de
+  movimentos (MoveTable) quando informada, ou calculado por rank_state.
+  Para tabuleiros N×N (layout de outro tamanho) o rank é o próprio estado.
+  """
+  if layout is not None and layout.size != 3:
+    if node.rank is None:
+      return [Node(child, action, node) for child, action in layout.successors(node.state)]
+    return [Node(child, action, node, child) for child, action in layout.successors(node.state)]
+  if node.rank is None:
+    return [Node(child, action, node) for child, action in successors(node.state)]
+  if table is None:
+    return [Node(child, action, node, rank_state(child)) for child, action in successors(node.state)]
+  state = node.state
+  base = node.rank * 4
+  children = table.successors
+  return [Node(move_blank(state, target), action, node, children[base + ACTION_CODES[action]])
+          for target, action in NEIGHBORS[state >> BLANK_SHIFT]]
+
+def create_successors_with_h(node: Node, h: int, table=None, costs=MANHATTAN, layout=None):
+  """
+  Igual a create_successors, mas devolve [(filho, h_filho)].
+  `costs[peça][célula]` é uma heurística aditiva por peça (Manhattan por
+  padrão): como só a peça deslocada muda de célula, h_filho = h + delta.
+  """
+  if layout is not None and layout.size != 3:
+    return _successors_with_h_nxn(node, h, costs, layout)
+  state = node.state
+  blank = state >> BLANK_SHIFT
+  rank = node.rank
+  base = rank * 4 if rank is not None else 0
+  result = []
+  for target, action in NEIGHBORS[blank]:
+    tile = (state >> (target * CELL_BITS)) & CELL_MASK
+    tile_costs = costs[tile]
+    child = move_blank(state, target)
+    if rank is None:
+      child_rank = None
+    elif table is None:
+      child_rank = rank_state(child)
+    else:
+      child_rank = table.successors[base + ACTION_CODES[action]]
+    result.append((Node(child, action, node, child_rank), h + tile_costs[blank] - tile_costs[target]))
+  return result
+
+def _successors_with_h_nxn(node: Node, h: int, costs, layout):
+  """create_successors_with_h para N×N: chave = estado, deslocamentos do layout"""
+  state = node.state
+  blank = state >> layout.blank_shift
+  bits = layout.cell_bits
+  mask = layout.cell_mask
+  keyed = node.rank is not None
+  result = []
+  for target, action in layout.neighbors[blank]:
+    tile_costs = costs[(state >> (target * bits)) & mask]
+    child = layout.move_blank(state, target)
+    result.append((Node(child, action, node, child if keyed else None), h + tile_costs[blank] - tile_costs[target]))
+  return result
+
+def expand_state(state: int, rank: int, table=None, layout=None):
+  """
+  Filhos de um estado sem criar Node, para as buscas sobre NodeArena:
+  [(estado_filho, código da ação, rank_filho)], na ordem de create_successors.
+  O rank segue state_rank.state_key (o próprio estado fora do 3x3).
+  """
+  if layout is None:
+    layout = get_layout(3)
+  result = []
+  if layout.size != 3:
+    for target, action in layout.neighbors[state >> layout.blank_shift]:
+      child = layout.move_blank(state, target)
+      result.append((child, ACTION_CODES[action], child))
+    return result
+  base = rank * 4
+  for target, action in NEIGHBORS[state >> BLANK_SHIFT]:
+    child = move_blank(state, target)
+    code = ACTION_CODES[action]
+    result.append((child, code, table.successors[base + code] if table is not None else rank_state(child)))
+  return result
+
+def expand_state_with_h(state: int, rank: int, h: int, table=None, costs=MANHATTAN, layout=None):
+  """Igual a expand_state, com h_filho = h + delta da peça deslocada: [(estado, código, rank, h)]"""
+  if layout is None:
+    layout = get_layout(3)
+  blank = state >> layout.blank_shift
+  bits = layout.cell_bits
+  mask = layout.cell_mask
+  nxn = layout.size != 3
+  base = rank * 4
+  result = []
+  for target, action in layout.neighbors[blank]:
+    tile_costs = costs[(state >> (target * bits)) & mask]
+    child = layout.move_blank(state, target)
+    code = ACTION_CODES[action]
+    if nxn:
+      child_rank = child
+    elif table is not None:
+      child_rank = table.successors[base + code]
+    else:
+      child_rank = rank_state(child)
+    result.append((child, code, child_rank, h + tile_costs[blank] - tile_costs[target]))
+  return result
 
 if __name__ == "__main__":
     for node in create_successors(root):
-        print(node.state, node.action, node.cost)
\ No newline at end of file
+        print(unpack(node.state), node.action, node.cost)
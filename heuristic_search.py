@@ -1,119 +1,127 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 from puzzle_game import Board
-import heapq
-import itertools
-counter = itertools.count()  # contador global
-
-
-class Node:
-    """
-    Representa um nó na árvore de busca para o 8-puzzle.
-    
-    Atributos:
-        state: Board atual
-        action: Movimento que levou a este estado ('UP', 'DOWN', etc.)
-        parent: Nó pai
-        cost: Custo acumulado (profundidade)
-    """
-    
-    def __init__(self, state: Board, action: Optional[str] = None, parent: Optional['Node'] = None):
-        self.state = state.copy()  # copia para evitar mutações
-        self.action = action
-        self.parent = parent
-        if parent is not None:
-            self.cost = parent.cost + 1
-        else:
-            self.cost = 0
-
-    def path(self) -> list:
-        """Retorna a sequência de nós desde a raiz até este nó"""
-        node, p = self, []
-        while node:
-            p.append(node)
-            node = node.parent
-        return list(reversed(p))
-    
-    def __eq__(self, other) -> bool:
-        """Verifica igualdade de estados"""
-        return isinstance(other, Node) and self.state == other.state
-    
-    def __hash__(self) -> int:
-        """Permite uso em sets/dicionários"""
-        return hash(self.state)
-  
-    def __str__(self):
-        return f"Node(cost={self.cost}, action={self.action})\n{self.state}"
-    
+from heuristics import Heuristic, get_heuristic, manhattan
+from state_rank import closed_set, state_key
+from move_table import ACTION_CODES, table_for
+from bucket_queue import BucketQueue
+from node_arena import NodeArena
+from search_progress import SearchProgress
+from search_stats import SearchStats
 
 
 def heuristic(board: Board) -> int:
     """Distância de Manhattan — soma das distâncias das peças até suas posições corretas."""
-    goal_positions = {
-        1: (0, 0), 2: (0, 1), 3: (0, 2),
-        4: (1, 0), 5: (1, 1), 6: (1, 2),
-        7: (2, 0), 8: (2, 1)
-    }
-    
-    distance = 0
-    for i in range(3):
-        for j in range(3):
-            value = board.state[i][j]
-            if value != 0:  # ignora o espaço vazio
-                goal_i, goal_j = goal_positions[value]
-                distance += abs(i - goal_i) + abs(j - goal_j)
-    return distance
+    return manhattan(board.packed)
 
 # ==================== Busca Gulosa ====================
 
 # ==================== Busca Gulosa ====================
-def greedy_best_first_search_with_loop(initial_board: Board) -> Optional[tuple]:
+def greedy_best_first_search_with_loop(initial_board: Board, heuristic: Union[str, Heuristic] = 'manhattan',
+                                       progress: Optional[SearchProgress] = None,
+                                       stats: Optional[SearchStats] = None) -> Optional[tuple]:
     """
     Resolve o 8-puzzle usando busca gulosa (Greedy Best-First Search).
 
+    `heuristic` é um nome do registro de heuristics ou uma Heuristic.
+    Aceita tabuleiros N×N (Board.size); estados sem solução retornam None.
+    `progress` (opcional) recebe o andamento e pode cancelar a busca
+    (SearchCancelled); `stats` (opcional) recebe as métricas comuns e os
+    ganchos. Um loop conta como busca sem solução (solution_depth -1).
+
     Retorna:
         - Se encontrar solução: (movimentos, número de movimentos, nós_visitados, nós_finais)
         - Se entrar em loop: (None, custo_ate_loop, nós_visitados, nós_finais)
         - None se não houver solução.
     """
-    root = Node(initial_board)
-    if root.state.is_goal_state():
-        return [], 0, 1, [root.state]  # já resolvido
-
-    frontier = []
-    heapq.heappush(frontier, (heuristic(root.state), next(counter), root))
-    explored = set()
+    size = initial_board.size
+    layout = initial_board.layout
+    heuristic = get_heuristic(heuristic).for_size(size)
+    costs = heuristic.costs
+    goal_state = layout.goal_state
+    root_state = initial_board.packed
+    if stats is not None:
+        stats.start()
+    if root_state == goal_state:
+        if stats is not None:
+            stats.finish(0, 0, 0, 0, 0, 0)
+            if stats.on_goal is not None:
+                stats.on_goal(root_state, 0)
+        return [], 0, 1, [root_state]  # já resolvido
+    if not initial_board.is_solvable():
+        if stats is not None:
+            stats.finish(0, 0, 0, 0, 0, -1)
+        return None
+
+    # Nós como handles da arena (colunas array.array), sem objetos Node
+    arena = NodeArena(layout)
+    states, keys = arena.states, arena.keys
+    frontier = BucketQueue()  # baldes por h, FIFO nos empates
+    frontier.push(arena.add(root_state, rank=state_key(root_state, size)), heuristic(root_state))
+    explored = closed_set(size)
+    table = table_for(root_state) if size == 3 else None
     nodes_visited = 0
     final_nodes = []
+    generations = 0
+    peak_frontier = 1
+    on_expand = stats.on_expand if stats is not None else None
+    on_generate = stats.on_generate if stats is not None else None
 
     while frontier:
-        _, _, current_node = heapq.heappop(frontier)
+        if len(frontier) > peak_frontier:
+            peak_frontier = len(frontier)
+        h, _, current = frontier.pop()
         nodes_visited += 1  # contamos o nó expandido
+        if progress is not None and nodes_visited % progress.interval == 0:
+            progress.report(nodes_visited, len(frontier))
 
-        state_str = str(current_node.state)
-        if state_str in explored:
+        state = states[current]
+        current_key = keys[current]
+        if not explored.add_rank(current_key):
             # Loop detectado
-            return None, current_node.cost, nodes_visited, final_nodes
-
-        explored.add(state_str)
-
-        if current_node.state.is_goal_state():
-            path = current_node.path()
-            moves = [node.action for node in path if node.action is not None]
+            if stats is not None:
+                # Cada filho gerado e não descartado virou um nó da arena
+                stats.finish(nodes_visited - 1, generations, generations - (len(arena) - 1), peak_frontier,
+                             len(explored), -1)
+            return None, arena.costs[current], nodes_visited, final_nodes
+
+        if state == goal_state:
+            moves = arena.actions(current)
+            if stats is not None:
+                stats.finish(nodes_visited - 1, generations, generations - (len(arena) - 1), peak_frontier,
+                             len(explored), len(moves))
+                if stats.on_goal is not None:
+                    stats.on_goal(state, len(moves))
             return moves, len(moves), nodes_visited, final_nodes
 
-        possible_moves = current_node.state.get_possible_moves()
+        if on_expand is not None:
+            on_expand(state, arena.costs[current])
+
+        blank = state >> layout.blank_shift
+        possible_moves = layout.move_targets[blank]
 
         if not possible_moves:
             # Nó sem filhos possíveis (folha)
-            final_nodes.append(current_node.state)
-
-        for move in possible_moves:
-            new_board = current_node.state.copy()
-            new_board.move(move)
-            child = Node(new_board, move, current_node)
-
-            child_state_str = str(child.state)
-            if child_state_str not in explored:
-                heapq.heappush(frontier, (heuristic(child.state), next(counter), child))
-
+            final_nodes.append(state)
+
+        generations += len(possible_moves)
+        for move, target in possible_moves.items():
+            child_state = layout.move_blank(state, target)
+            if on_generate is not None:
+                on_generate(child_state, state)
+            if table is not None:
+                child_rank = table.successors[current_key * 4 + ACTION_CODES[move]]
+            else:
+                child_rank = state_key(child_state, size)
+            if not explored.has_rank(child_rank):
+                child = arena.add(child_state, current, ACTION_CODES[move], child_rank)
+                if costs is not None:
+                    # h do filho = h do pai + delta da única peça deslocada
+                    tile_costs = costs[layout.tile_at(state, target)]
+                    child_h = h + tile_costs[blank] - tile_costs[target]
+                else:
+                    child_h = heuristic.evaluate(child_state)
+                frontier.push(child, child_h)
+
+    if stats is not None:
+        stats.finish(nodes_visited, generations, generations - (len(arena) - 1), peak_frontier, len(explored), -1)
     return None  # sem solução
\ No newline at end of file
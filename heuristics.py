@@ -0,0 +1,257 @@
+"""
+Heurísticas para o 8-puzzle sobre o estado empacotado.
+
+A distância de Manhattan é aditiva por peça: h = soma de MANHATTAN[peça][célula].
+Um movimento desloca exatamente uma peça, então o h do filho é o h do pai
+mais um delta de ±1 lido da tabela (ver manhattan_delta), sem reescanear o
+tabuleiro.
+
+O registro HEURISTICS expõe as heurísticas aceitas pelo A* e pela busca
+gulosa: 'manhattan', 'misplaced' (peças fora do lugar) e 'linear_conflict'
+(Manhattan + conflitos lineares, com os conflitos de cada linha/coluna
+pré-calculados em tabelas) e 'pdb' (bancos de padrões aditivos, ver
+pattern_database).
+
+As tabelas de módulo são do 3x3. Heuristic.for_size(N) devolve a mesma
+heurística para tabuleiros N×N, com tabelas geradas por tamanho e guardadas
+em cache.
+"""
+
+from functools import lru_cache
+
+from packed_state import CELL_BITS, CELL_MASK, GOAL_POSITIONS, Layout, get_layout, unpack
+
+# MANHATTAN[tile][cell]: distância da peça na célula até sua posição objetivo
+# (linha do vazio zerada: ele não entra no cálculo)
+MANHATTAN = tuple(
+    tuple(0 if tile == 0 else
+          abs(cell // 3 - GOAL_POSITIONS[tile][0]) + abs(cell % 3 - GOAL_POSITIONS[tile][1])
+          for cell in range(9))
+    for tile in range(9)
+)
+
+
+def manhattan(state: int) -> int:
+    """Distância de Manhattan do estado empacotado (ignora o vazio)"""
+    distance = 0
+    for cell in range(9):
+        distance += MANHATTAN[(state >> (cell * CELL_BITS)) & CELL_MASK][cell]
+    return distance
+
+
+def manhattan_delta(state: int, blank: int, target: int) -> int:
+    """Variação de h quando o vazio em `blank` vai para `target`"""
+    tile = (state >> (target * CELL_BITS)) & CELL_MASK
+    return MANHATTAN[tile][blank] - MANHATTAN[tile][target]
+
+
+# MISPLACED[tile][cell]: 1 se a peça está fora da sua célula objetivo
+MISPLACED = tuple(
+    tuple(0 if tile == 0 or divmod(cell, 3) == GOAL_POSITIONS[tile] else 1 for cell in range(9))
+    for tile in range(9)
+)
+
+
+def misplaced_tiles(state: int) -> int:
+    """Número de peças fora do lugar (ignora o vazio)"""
+    count = 0
+    for cell in range(9):
+        count += MISPLACED[(state >> (cell * CELL_BITS)) & CELL_MASK][cell]
+    return count
+
+
+def _line_conflicts(goal_offsets) -> int:
+    """
+    Peças que precisam sair da linha para desfazer os conflitos:
+    tamanho da linha menos a maior subsequência crescente das posições objetivo.
+    """
+    longest = [1] * len(goal_offsets)
+    for i in range(len(goal_offsets)):
+        for j in range(i):
+            if goal_offsets[j] < goal_offsets[i]:
+                longest[i] = max(longest[i], longest[j] + 1)
+    return len(goal_offsets) - max(longest, default=0)
+
+
+def _conflict_table(line: int, is_row: bool) -> bytes:
+    """
+    Custo extra (2 por peça removida) para cada conteúdo possível de uma
+    linha/coluna, indexado por t0 * 81 + t1 * 9 + t2.
+    """
+    table = bytearray(9 ** 3)
+    for key in range(9 ** 3):
+        line_tiles = (key // 81, key // 9 % 9, key % 9)
+        goal_offsets = []
+        for tile in line_tiles:
+            if tile == 0:
+                continue
+            goal_row, goal_col = GOAL_POSITIONS[tile]
+            if is_row and goal_row == line:
+                goal_offsets.append(goal_col)
+            elif not is_row and goal_col == line:
+                goal_offsets.append(goal_row)
+        table[key] = 2 * _line_conflicts(goal_offsets)
+    return bytes(table)
+
+
+ROW_CONFLICTS = tuple(_conflict_table(row, True) for row in range(3))
+COL_CONFLICTS = tuple(_conflict_table(col, False) for col in range(3))
+
+
+def linear_conflict(state: int) -> int:
+    """Manhattan + conflitos lineares em linhas e colunas (admissível)"""
+    tiles = [(state >> (cell * CELL_BITS)) & CELL_MASK for cell in range(9)]
+    distance = 0
+    for cell in range(9):
+        distance += MANHATTAN[tiles[cell]][cell]
+    for line in range(3):
+        distance += ROW_CONFLICTS[line][tiles[3 * line] * 81 + tiles[3 * line + 1] * 9 + tiles[3 * line + 2]]
+        distance += COL_CONFLICTS[line][tiles[line] * 81 + tiles[line + 3] * 9 + tiles[line + 6]]
+    return distance
+
+
+def pattern_database(state: int) -> int:
+    """PDB aditivo {1,2,3,4} + {5,6,7,8} com reflexão (construído no primeiro uso)"""
+    from pattern_database import get_default_pdb
+    return get_default_pdb().evaluate(unpack(state))
+
+
+# ==================== Tabuleiros N×N ====================
+
+@lru_cache(maxsize=None)
+def manhattan_table(size: int) -> tuple:
+    """MANHATTAN para o tabuleiro N×N"""
+    goal = get_layout(size).goal_positions
+    return tuple(
+        tuple(0 if tile == 0 else
+              abs(cell // size - goal[tile][0]) + abs(cell % size - goal[tile][1])
+              for cell in range(size * size))
+        for tile in range(size * size)
+    )
+
+
+@lru_cache(maxsize=None)
+def misplaced_table(size: int) -> tuple:
+    """MISPLACED para o tabuleiro N×N"""
+    goal = get_layout(size).goal_positions
+    return tuple(
+        tuple(0 if tile == 0 or divmod(cell, size) == goal[tile] else 1 for cell in range(size * size))
+        for tile in range(size * size)
+    )
+
+
+def table_evaluator(costs, layout: Layout):
+    """h(estado) = soma de costs[peça][célula] no layout informado"""
+    bits = layout.cell_bits
+    mask = layout.cell_mask
+    cells = range(layout.cells)
+
+    def evaluate(state: int) -> int:
+        return sum(costs[(state >> (cell * bits)) & mask][cell] for cell in cells)
+    return evaluate
+
+
+def linear_conflict_evaluator(layout: Layout):
+    """
+    Conflito linear N×N: sem tabelas por linha (16^4 chaves no 4x4), os
+    conflitos de cada linha/coluna são calculados na hora.
+    """
+    size = layout.size
+    goal = layout.goal_positions
+    manhattan_costs = manhattan_table(size)
+
+    def evaluate(state: int) -> int:
+        tiles = layout.unpack(state)
+        distance = 0
+        for cell, tile in enumerate(tiles):
+            distance += manhattan_costs[tile][cell]
+        for line in range(size):
+            row = [goal[tile][1] for tile in tiles[line * size:(line + 1) * size]
+                   if tile != 0 and goal[tile][0] == line]
+            col = [goal[tile][0] for tile in tiles[line::size]
+                   if tile != 0 and goal[tile][1] == line]
+            distance += 2 * (_line_conflicts(row) + _line_conflicts(col))
+        return distance
+    return evaluate
+
+
+def pattern_database_evaluator(layout: Layout):
+    """PDB aditivo do tamanho (pdb_N/ gerado pela CLI de pattern_database)"""
+    from pattern_database import get_default_pdb
+    pdb = get_default_pdb(layout.size)
+    return lambda state: pdb.evaluate(layout.unpack(state))
+
+
+class Heuristic:
+    """
+    Entrada do registro de heurísticas.
+
+    Atributos:
+        name: nome no registro
+        evaluate: função estado empacotado -> h
+        costs: tabela [peça][célula] quando a heurística é aditiva por peça,
+               o que permite atualizar h por delta; None caso contrário
+        specialize: função Layout -> Heuristic para outros tamanhos de
+                    tabuleiro; None se a heurística só existe no 3x3
+    """
+
+    def __init__(self, name: str, evaluate, costs=None, specialize=None):
+        self.name = name
+        self.evaluate = evaluate
+        self.costs = costs
+        self.specialize = specialize
+        self._sizes = {}
+
+    def __call__(self, state: int) -> int:
+        return self.evaluate(state)
+
+    def for_size(self, size: int) -> 'Heuristic':
+        """A mesma heurística para o tabuleiro N×N (criada uma vez por tamanho)"""
+        if size == 3:
+            return self
+        if self.specialize is None:
+            raise ValueError(f"Heurística {self.name!r} só está disponível no 3x3")
+        heuristic = self._sizes.get(size)
+        if heuristic is None:
+            heuristic = self._sizes[size] = self.specialize(get_layout(size))
+        return heuristic
+
+    def __repr__(self) -> str:
+        return f"Heuristic({self.name!r})"
+
+
+HEURISTICS = {}
+
+
+def register_heuristic(heuristic: Heuristic) -> Heuristic:
+    """Adiciona uma heurística ao registro (substitui se o nome já existe)"""
+    HEURISTICS[heuristic.name] = heuristic
+    return heuristic
+
+
+def get_heuristic(heuristic) -> Heuristic:
+    """Aceita o nome registrado ou a própria Heuristic"""
+    if isinstance(heuristic, Heuristic):
+        return heuristic
+    try:
+        return HEURISTICS[heuristic]
+    except KeyError:
+        raise ValueError(f"Heurística desconhecida: {heuristic!r} (disponíveis: {', '.join(HEURISTICS)})")
+
+
+def _table_heuristic(name: str, table):
+    """specialize de uma heurística aditiva por peça"""
+    def specialize(layout: Layout) -> Heuristic:
+        costs = table(layout.size)
+        return Heuristic(name, table_evaluator(costs, layout), costs)
+    return specialize
+
+
+register_heuristic(Heuristic('manhattan', manhattan, MANHATTAN,
+                             _table_heuristic('manhattan', manhattan_table)))
+register_heuristic(Heuristic('misplaced', misplaced_tiles, MISPLACED,
+                             _table_heuristic('misplaced', misplaced_table)))
+register_heuristic(Heuristic('linear_conflict', linear_conflict, None,
+                             lambda layout: Heuristic('linear_conflict', linear_conflict_evaluator(layout))))
+register_heuristic(Heuristic('pdb', pattern_database, None,
+                             lambda layout: Heuristic('pdb', pattern_database_evaluator(layout))))
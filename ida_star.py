@@ -0,0 +1,170 @@
+"""
+Implementação do algoritmo IDA* (Iterative Deepening A*) para o quebra-cabeça 8.
+
+Em vez de manter uma fronteira com todos os nós gerados, o IDA* faz buscas
+em profundidade limitadas por f(n) = g(n) + h(n), aumentando o limite para o
+menor f que o excedeu na iteração anterior. A busca trabalha sobre um único
+tabuleiro mutável: cada movimento é aplicado e desfeito no lugar, o inverso
+do último movimento é podado e apenas o caminho atual fica em memória, o que
+dá soluções ótimas com memória O(profundidade).
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from Node import Node
+from puzzle_game import Board
+from heuristics import get_heuristic
+from search_progress import SearchProgress
+from search_stats import SearchStats
+
+FOUND = -1
+
+
+def ida_star_search(initial_board: Board, progress: Optional[SearchProgress] = None,
+                    stats: Optional[SearchStats] = None) -> Tuple[Optional[Node], Dict[str, Any]]:
+    """
+    Implementa o IDA* com a distância de Manhattan, em tabuleiros N×N
+    (Board.size).
+
+    Mesmo contrato de a_star_search: (nó solução, métricas). O nó solução é
+    montado só no final, a partir da lista de movimentos do caminho atual.
+
+    Args:
+        initial_board (Board): Estado inicial do tabuleiro
+        progress (SearchProgress): andamento e cancelamento cooperativo
+            (opcional); a "fronteira" informada é a profundidade atual
+        stats (SearchStats): métricas comuns e ganchos (opcional). Sem
+            conjunto fechado, duplicates e peak_closed ficam em 0 e
+            peak_frontier é a maior profundidade do caminho. Os ganchos
+            recebem estados empacotados na hora, então só têm custo quando
+            definidos.
+
+    Returns:
+        Tuple[Node, dict]: (nó solução ou None, métricas)
+
+    Raises:
+        SearchCancelled: se `progress` foi cancelado
+    """
+    state = initial_board.packed
+    layout = initial_board.layout
+    if stats is not None:
+        stats.start()
+    if initial_board.is_goal_state():
+        if stats is not None:
+            stats.finish(0, 0, 0, 0, 0, 0)
+            if stats.on_goal is not None:
+                stats.on_goal(state, 0)
+        return Node(state, "", None), {
+            "visited_nodes": 0,
+            "explored_states": 0,
+            "max_frontier": 0,
+            "solution_depth": 0,
+            "iterations": 0
+        }
+    if not initial_board.is_solvable():
+        if stats is not None:
+            stats.finish(0, 0, 0, 0, 0, -1)
+        return None, {
+            "visited_nodes": 0,
+            "explored_states": 0,
+            "max_frontier": 0,
+            "solution_depth": -1,
+            "iterations": 0
+        }
+
+    heuristic = get_heuristic('manhattan').for_size(layout.size)
+    costs = heuristic.costs
+    neighbors = layout.neighbors
+    tiles = layout.unpack(state)
+    moves = []  # caminho atual (única estrutura que cresce com a profundidade)
+    visited_nodes = 0
+    generated_nodes = 0
+    max_depth = 0
+    on_expand = stats.on_expand if stats is not None else None
+    on_generate = stats.on_generate if stats is not None else None
+
+    def search(blank: int, previous_blank: int, g: int, h: int, bound: int) -> int:
+        """DFS limitada por f; retorna FOUND ou o menor f que excedeu o limite"""
+        nonlocal visited_nodes, generated_nodes, max_depth
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0:
+            return FOUND
+        visited_nodes += 1
+        if progress is not None and visited_nodes % progress.interval == 0:
+            progress.report(visited_nodes, g)
+        if g > max_depth:
+            max_depth = g
+        if on_expand is not None or on_generate is not None:
+            parent = layout.pack(tiles)
+            if on_expand is not None:
+                on_expand(parent, g)
+
+        minimum = float('inf')
+        for target, action in neighbors[blank]:
+            if target == previous_blank:
+                continue  # poda o movimento que desfaz o anterior
+            tile = tiles[target]
+            # Só a peça deslocada muda de lugar: h é atualizado por delta
+            child_h = h + costs[tile][blank] - costs[tile][target]
+
+            # Aplica o movimento no lugar
+            tiles[blank] = tile
+            tiles[target] = 0
+            moves.append(action)
+            generated_nodes += 1
+            if on_generate is not None:
+                on_generate(layout.pack(tiles), parent)
+
+            t = search(target, blank, g + 1, child_h, bound)
+            if t == FOUND:
+                return FOUND
+
+            # Desfaz o movimento
+            moves.pop()
+            tiles[target] = tile
+            tiles[blank] = 0
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    blank = tiles.index(0)
+    initial_h = heuristic(state)
+    bound = initial_h
+    iterations = 0
+    while True:
+        iterations += 1
+        t = search(blank, -1, 0, initial_h, bound)
+        if t == FOUND:
+            break
+        bound = t
+
+    solution = Node.from_moves(state, moves, layout)
+    if stats is not None:
+        stats.finish(visited_nodes, generated_nodes, 0, max_depth, 0, len(moves))
+        if stats.on_goal is not None:
+            stats.on_goal(solution.state, len(moves))
+    return solution, {
+        "visited_nodes": visited_nodes,
+        "explored_states": generated_nodes,
+        "max_frontier": len(moves),
+        "solution_depth": len(moves),
+        "iterations": iterations
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    board = Board([
+        [8, 6, 7],
+        [2, 5, 4],
+        [3, 0, 1]
+    ])
+    start_time = time.perf_counter()
+    solution, metrics = ida_star_search(board)
+    print(f"Tempo: {time.perf_counter() - start_time:.3f}s")
+    print(f"Passos: {metrics['solution_depth']}")
+    print(f"Nós visitados: {metrics['visited_nodes']}")
+    print(f"Iterações: {metrics['iterations']}")
@@ -6,13 +6,30 @@ Permite ao usuário interagir com o tabuleiro e definir estados iniciais.
 import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk
 from typing import List, Optional
+import queue
 import random
-from breath_first_search import bfs, backtracking
+import threading
+from breath_first_search import bfs, bidirectional_bfs, backtracking
 from Node import Node
 from puzzle_game import Board
 
 from a_star_search import a_star_search
-from deep_first_search import dfs
+from deep_first_search import DEFAULT_DEPTH_LIMIT, depth_limited_dfs, dfs, iterative_deepening_dfs
+from distance_oracle import oracle_search
+from ida_star import ida_star_search
+from search_progress import SearchCancelled, SearchProgress
+from solution_cache import get_solution_cache
+
+# Métodos que devolvem soluções ótimas (índices de solving_methods): só eles usam o cache
+OPTIMAL_METHODS = (0, 3, 4, 5, 6, 8)
+
+# Profundidade máxima da DFS limitada e da DFS iterativa. Busca cega: com o
+# diâmetro do 8-puzzle (31) um tabuleiro difícil não termina, então a
+# interface usa o padrão (20) e avisa quando a solução não cabe no limite
+DFS_DEPTH_LIMIT = DEFAULT_DEPTH_LIMIT
+
+# Intervalo da consulta ao progresso da busca em andamento (ms)
+POLL_INTERVAL_MS = 100
 
 
 class PuzzleGUI:
@@ -26,6 +43,12 @@ class PuzzleGUI:
         self.current_solution = list()
         # Estado do jogo
         self.board = Board()
+        # Soluções ótimas já encontradas (e os sufixos de cada caminho)
+        self.solution_cache = get_solution_cache()
+        # Busca em andamento (thread de trabalho, progresso e fila do resultado)
+        self.search_thread = None
+        self.search_progress = None
+        self.search_results = None
         
         
         # Cores
@@ -133,7 +156,12 @@ class PuzzleGUI:
             "Busca em Largura (BFS)",
             "Busca em Profundidade (DFS)",
             "Busca Heurística",
-            "A*"
+            "A*",
+            "Oráculo de Distâncias",
+            "BFS Bidirecional",
+            "IDA*",
+            "DFS Limitada",
+            "DFS Iterativa (IDDFS)"
         ]
         
         self.method_var = tk.StringVar(value=self.solving_methods[0])
@@ -148,18 +176,30 @@ class PuzzleGUI:
         )
         self.method_combobox.grid(row=3, column=0, columnspan=2, padx=10, pady=(0, 10))
         
-        # Quinta linha - botão resolver
-        btn_solve = tk.Button(
+        # Quinta linha - botões resolver e cancelar
+        self.btn_solve = tk.Button(
             controls_frame,
             text="Resolver",
             font=("Arial", 12, "bold"),
             bg="#2e7d32",
             fg="black",
             command=self.solve_puzzle,
-            width=40,
+            width=18,
             height=2
         )
-        btn_solve.grid(row=4, column=0, columnspan=2, padx=10, pady=10)
+        self.btn_solve.grid(row=4, column=0, padx=10, pady=10)
+        
+        self.btn_cancel = tk.Button(
+            controls_frame,
+            text="Cancelar",
+            font=("Arial", 12),
+            bg=self.colors['button'],
+            command=self.cancel_search,
+            width=18,
+            height=2,
+            state=tk.DISABLED
+        )
+        self.btn_cancel.grid(row=4, column=1, padx=10, pady=10)
         
         # Frame de informações
         info_frame = tk.Frame(main_frame, bg=self.colors['background'])
@@ -190,14 +230,24 @@ class PuzzleGUI:
         )
         self.solvable_label.pack()
         
+        # Progresso da busca em andamento
+        self.progress_label = tk.Label(
+            info_frame,
+            text="",
+            font=("Arial", 10),
+            bg=self.colors['background']
+        )
+        self.progress_label.pack()
+        
         # Contador de movimentos
         self.move_count = 0
     
     def update_display(self):
         """Atualiza a exibição do tabuleiro"""
+        state = self.board.state
         for i in range(3):
             for j in range(3):
-                value = self.board.state[i][j]
+                value = state[i][j]
                 btn = self.buttons[i][j]
                 
                 if value == 0:
@@ -281,7 +331,10 @@ class PuzzleGUI:
         self.root.after(300, lambda: self.play_solution(moves, index + 1))             
     
     def solve_puzzle(self):
-        """Resolve o puzzle usando o método selecionado"""
+        """Resolve o puzzle usando o método selecionado (a busca roda em uma thread)"""
+        if self.search_thread is not None:
+            return  # já existe uma busca em andamento
+        
         if self.board.is_goal_state():
             print("\n" + "="*50)
             print("O puzzle já está no estado final!")
@@ -296,98 +349,185 @@ class PuzzleGUI:
         
         selected_method = self.solving_methods.index(self.method_var.get()) 
         
-        if selected_method == 0:
-            state_board_in_list = list()
-            self.current_solution = list()
-            #PQ IMPLEMENTEI EM FORMATO APENAS DE LISTA N LISTA DE LISTAS
-            for i in range(3):
-                for j in range(3):
-                    state_board_in_list.append(self.board.state[i][j])
-            
-            root = Node(state_board_in_list, None, None)
-            solve_node, node_visited, list_explored_nodes_len = bfs(root)
-            if not solve_node:
+        if selected_method in OPTIMAL_METHODS:
+            moves = self.solution_cache.get(self.board.packed)
+            if moves is not None:
+                stats = self.solution_cache.stats()
                 print("\n" + "="*50)
-                print("ERRO: BFS não encontrou uma solução para esse tabuleiro")
+                print("Solução ótima encontrada no cache!")
                 print("="*50)
+                print(f"Passos da solução: {len(moves)}")
+                print(f"Cache: {stats['entries']} estados, {stats['hits']} acertos, {stats['misses']} falhas")
+                print("\nReproduzindo solução...")
+                print("="*50)
+                
+                self.move_count = 0
+                self.play_solution(moves)
+                messagebox.showinfo("RESULTADOS",f"Passos da solução: {len(moves)}\nSolução obtida do cache (nenhum nó expandido)\n")
                 return
-            list_backtracking_nodes = solve_node.path()
-            for node in list_backtracking_nodes:
-                self.current_solution.append(node.action)
-            
-            # Mostra informações sobre a solução no console
+        
+        # A busca roda em uma thread de trabalho sobre uma cópia do tabuleiro;
+        # a thread do Tk só consulta o progresso (poll_search) e recebe o resultado
+        self.search_progress = SearchProgress()
+        self.search_results = queue.Queue()
+        board = self.board.copy()
+        self.search_thread = threading.Thread(
+            target=self.run_search,
+            args=(selected_method, board, self.search_progress, self.search_results),
+            daemon=True
+        )
+        self.search_thread.start()
+        
+        self.btn_solve.config(state=tk.DISABLED)
+        self.btn_cancel.config(state=tk.NORMAL)
+        self.progress_label.config(text=f"Resolvendo com {self.method_var.get()}...")
+        self.root.after(POLL_INTERVAL_MS, self.poll_search, selected_method, board.packed)
+    
+    def cancel_search(self):
+        """Pede o cancelamento da busca em andamento (atendido pela própria busca)"""
+        if self.search_progress is not None:
+            self.search_progress.cancel()
+            self.progress_label.config(text="Cancelando...")
+    
+    @staticmethod
+    def run_search(method, board, progress, results):
+        """Executa a busca na thread de trabalho e entrega o resultado na fila"""
+        try:
+            results.put(("done", PuzzleGUI.compute_solution(method, board, progress)))
+        except SearchCancelled:
+            results.put(("cancelled", None))
+        except Exception as e:
+            results.put(("error", e))
+    
+    @staticmethod
+    def compute_solution(method, board, progress):
+        """
+        Executa o método escolhido (sem tocar no Tk).
+        
+        Returns:
+            None se não encontrou solução; senão um dict com moves, visited,
+            explored e, para a busca gulosa em loop, loop_after
+        """
+        if method in (0, 5): # BFS / BFS bidirecional
+            search = bfs if method == 0 else bidirectional_bfs
+            result = search(Node(board.packed, None, None), progress=progress)
+            if not result:
+                return None
+            solve_node, node_visited, list_explored_nodes_len = result
+            moves = [node.action for node in solve_node.path()[1:]]
+            return {"moves": moves, "visited": node_visited, "explored": list_explored_nodes_len}
+        if method == 1: # DFS
+            solve_node, visited_nodes, list_explored_nodes_len = dfs(Node(board.packed), progress=progress)
+            if solve_node is None:
+                return None
+            moves = [node.action for node in solve_node.path()[1:]]
+            return {"moves": moves, "visited": visited_nodes, "explored": list_explored_nodes_len}
+        if method in (7, 8): # DFS limitada / DFS iterativa
+            if method == 7:
+                result = depth_limited_dfs(Node(board.packed), limit=DFS_DEPTH_LIMIT, progress=progress)
+            else:
+                result = iterative_deepening_dfs(Node(board.packed), max_depth=DFS_DEPTH_LIMIT, progress=progress)
+            solve_node, visited_nodes, path_len = result
+            if solve_node is None:
+                return None
+            moves = [node.action for node in solve_node.path()[1:]]
+            return {"moves": moves, "visited": visited_nodes, "explored": path_len}
+        if method == 2: # Busca Heurística
+            from heuristic_search import greedy_best_first_search_with_loop
+            result = greedy_best_first_search_with_loop(board, progress=progress)
+            if result is None:
+                return None
+            moves, num_moves, visited, finals = result
+            if moves is None:
+                return {"moves": None, "loop_after": num_moves}
+            return {"moves": moves, "visited": visited, "explored": finals}
+        if method in (3, 6): # A* / IDA*
+            if method == 3:
+                result = a_star_search(board, progress=progress)
+            else:
+                result = ida_star_search(board, progress=progress)
+        else: # Oráculo de distâncias (consulta direta, sem progresso)
+            result = oracle_search(board)
+        if result is None or result[0] is None:
+            return None
+        solution_node, metrics = result
+        moves = [node.action for node in solution_node.path()[1:] if node.action]
+        return {"moves": moves, "visited": metrics['visited_nodes'], "explored": metrics['explored_states']}
+    
+    def poll_search(self, method, start_state):
+        """Atualiza o progresso pelo root.after até o resultado chegar"""
+        try:
+            status, result = self.search_results.get_nowait()
+        except queue.Empty:
+            progress = self.search_progress.snapshot()
+            if not self.search_progress.cancelled:
+                self.progress_label.config(
+                    text=f"Expandidos: {progress['expanded']} | Fronteira: {progress['frontier']} | "
+                         f"{progress['rate']:.0f} nós/s | {progress['elapsed']:.1f}s"
+                )
+            self.root.after(POLL_INTERVAL_MS, self.poll_search, method, start_state)
+            return
+        
+        progress = self.search_progress.snapshot()
+        self.search_thread = None
+        self.search_progress = None
+        self.btn_solve.config(state=tk.NORMAL)
+        self.btn_cancel.config(state=tk.DISABLED)
+        
+        if status == "cancelled":
+            self.progress_label.config(text=f"Busca cancelada após {progress['expanded']} nós expandidos")
+            return
+        if status == "error":
+            self.progress_label.config(text="")
+            messagebox.showerror("Erro", f"Falha na busca: {result}")
+            return
+        self.progress_label.config(text=f"Busca concluída em {progress['elapsed']:.2f}s")
+        if self.board.packed != start_state:
+            # O tabuleiro foi mexido durante a busca: a solução não vale mais
             print("\n" + "="*50)
-            print("BFS encontrou solução!")
+            print("AVISO: O tabuleiro mudou durante a busca; solução descartada.")
             print("="*50)
-            print(f"Passos da solução: {len(self.current_solution)}")
-            print(f"Nós visitados: {node_visited}")
-            print(f"Estados explorados: {list_explored_nodes_len}")
-            print("\nReproduzindo solução...")
+            return
+        self.show_solution(method, result)
+    
+    def show_solution(self, method, result):
+        """Mostra as métricas e reproduz a solução (na thread do Tk)"""
+        method_name = self.solving_methods[method]
+        if result is None and method in (7, 8):
+            messagebox.showwarning(
+                "Limite de profundidade",
+                f"{method_name} não encontrou solução com até {DFS_DEPTH_LIMIT} movimentos.\n"
+                "Para tabuleiros mais fundos use A*, IDA* ou o Oráculo de Distâncias."
+            )
+            return
+        if result is None:
+            print("\n" + "="*50)
+            print(f"ERRO: O algoritmo {method_name} não encontrou uma solução para este tabuleiro!")
             print("="*50)
-            
-            self.move_count = 0    
-            self.play_solution(self.current_solution)
-            messagebox.showinfo("RESULTADOS",f"Passos da solução: {len(self.current_solution)}\nNós visitados: {node_visited}\nEstados explorados: {list_explored_nodes_len}\n")
-        if selected_method == 1: # DFS
-            state_board_in_list = list()
-            self.current_solution = list()
-            for i in range(3):
-                for j in range(3):
-                    state_board_in_list.append(self.board.state[i][j])
-            root = Node(state_board_in_list)
-            solve_node, visited_nodes, list_explored_nodes_len = dfs(root)
-            list_backtracking_nodes = solve_node.path()
-            for node in list_backtracking_nodes:
-                self.current_solution.append(node.action)
-            self.move_count = 0
-            self.play_solution(self.current_solution)
-            messagebox.showinfo("RESULTADOS",f"Passos da solução: {len(self.current_solution)}\nNós visitados: {visited_nodes}\nEstados explorados: {list_explored_nodes_len}\n")
-            pass
-        if selected_method == 2:
-            from heuristic_search import greedy_best_first_search_with_loop
-            moves, num_moves, visited, finals = greedy_best_first_search_with_loop(self.board)
-            if moves is None:
-                messagebox.showerror("Loop",f"AVISO: Busca Heurística entrou em loop após {num_moves} movimentos.")
-                return
-            elif not moves:
-                print("\n" + "="*50)
-                print("O puzzle já estava resolvido!")
-                print("="*50)
-                return
-            self.move_count = 0
-            self.play_solution(moves)
-            messagebox.showinfo("RESULTADOS",f"Passos da solução: {num_moves}\nNós visitados: {visited}\nEstados explorados: {finals}\n")
-            pass
-        if selected_method == 3: # A*
-            # Executa o algoritmo A*
-            result = a_star_search(self.board)
-            
-            if result is None or result[0] is None:
-                print("\n" + "="*50)
-                print("ERRO: O algoritmo A* não encontrou uma solução para este tabuleiro!")
-                print("="*50)
-                return
-            
-            # Extrai a solução e métricas
-            solution_node, metrics = result
-            solution_path = solution_node.path()
-            
-            # Converte o caminho de nós para lista de ações
-            moves = []
-            for node in solution_path[1:]:  # Pula o estado inicial
-                if node.action:
-                    moves.append(node.action)
-            
-            if not moves:
-                print("\n" + "="*50)
-                print("O puzzle já estava no estado final!")
-                print("="*50)
-                return
-            
-            # Reproduz a solução
-            self.move_count = 0
-            self.play_solution(moves)
-            messagebox.showinfo("RESULTADOS",f"Passos da solução: {len(self.current_solution)}\nNós visitados: {metrics['visited_nodes']}\nEstados explorados: {metrics['explored_states']}\n")
+            return
+        if result["moves"] is None:
+            messagebox.showerror("Loop",f"AVISO: Busca Heurística entrou em loop após {result['loop_after']} movimentos.")
+            return
+        
+        moves = result["moves"]
+        if method in OPTIMAL_METHODS:
+            self.solution_cache.put(self.board.packed, moves)
+        self.current_solution = moves
+        
+        # Mostra informações sobre a solução no console
+        print("\n" + "="*50)
+        print(f"{method_name} encontrou solução!")
+        print("="*50)
+        print(f"Passos da solução: {len(moves)}")
+        print(f"Nós visitados: {result['visited']}")
+        print(f"Estados explorados: {result['explored']}")
+        print("\nReproduzindo solução...")
+        print("="*50)
+        
+        self.move_count = 0
+        self.play_solution(moves)
+        messagebox.showinfo("RESULTADOS",f"Passos da solução: {len(moves)}\nNós visitados: {result['visited']}\nEstados explorados: {result['explored']}\n")
+
 
 class CustomStateDialog:
     """Dialog para definir um estado personalizado do tabuleiro"""
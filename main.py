@@ -3,6 +3,7 @@ Arquivo principal para executar o jogo do 8 (8-puzzle)
 """
 
 from interface import main
+from puzzle_db import get_database
 
 if __name__ == "__main__":
     print("Iniciando o Puzzle 8...")
@@ -15,6 +16,10 @@ if __name__ == "__main__":
     print("1 2 3")
     print("4 5 6")
     print("7 8  ")
+    if get_database() is None:
+        print("\nBanco de distâncias ausente (gere com: python puzzle_db.py build)")
+    else:
+        print("\nBanco de distâncias carregado")
     print("\nAbrindo interface...")
     
     main()
\ No newline at end of file
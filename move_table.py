@@ -0,0 +1,147 @@
+"""
+Tabela de transições pré-calculada para todo o espaço de estados do 8-puzzle.
+
+Para cada rank denso (ver state_rank) a tabela guarda os ranks dos até 4
+sucessores, um slot por ação na ordem de ACTIONS (UP, DOWN, LEFT, RIGHT),
+com -1 quando o movimento é inválido. Os 181.440 × 4 valores ficam em um
+único buffer array('i') contíguo, que pode ser salvo em disco e recarregado.
+O arquivo é opcional e só é gravado sob pedido (python move_table.py).
+
+As buscas (table_for) só usam a tabela se ela já estiver em memória ou no
+disco: calculá-la leva alguns segundos, mais do que a maioria das buscas,
+então sem o arquivo os ranks dos filhos saem de rank_state. Quem precisa da
+tabela inteira (oráculo de distâncias, vector_bfs) a calcula com
+get_move_table().
+
+A tabela descreve a classe dos estados solvíveis; tabuleiros não solvíveis
+continuam sendo expandidos pela aritmética de packed_state.
+"""
+
+import os
+import sys
+from array import array
+from typing import List, Optional, Tuple
+
+from packed_state import ACTIONS, BLANK_SHIFT, MOVE_TARGETS, move_blank, is_solvable
+from state_rank import REACHABLE_STATES, rank_state, unrank_state
+
+MAGIC = b'P8MT'
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'move_table.bin')
+
+# Índice do slot de cada ação
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+class MoveTable:
+    """Transições rank -> ranks sucessores, em um buffer plano de int32"""
+
+    def __init__(self, successors: array):
+        if len(successors) != REACHABLE_STATES * 4:
+            raise ValueError("Tabela de movimentos com tamanho inválido")
+        self.successors = successors
+
+    @classmethod
+    def build(cls) -> 'MoveTable':
+        """Calcula a tabela percorrendo todos os ranks solvíveis"""
+        successors = array('i', [-1]) * (REACHABLE_STATES * 4)
+        for rank in range(REACHABLE_STATES):
+            state = unrank_state(rank)
+            base = rank * 4
+            for action, target in MOVE_TARGETS[state >> BLANK_SHIFT].items():
+                successors[base + ACTION_CODES[action]] = rank_state(move_blank(state, target))
+        return cls(successors)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> 'MoveTable':
+        """Carrega a tabela salva por save()"""
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Arquivo não é uma tabela de movimentos: {path}")
+            successors = array('i')
+            successors.fromfile(f, REACHABLE_STATES * 4)
+        if sys.byteorder == 'big':
+            successors.byteswap()
+        return cls(successors)
+
+    def save(self, path: str = DEFAULT_PATH) -> None:
+        """Salva a tabela em disco (int32 little-endian)"""
+        data = self.successors
+        if sys.byteorder == 'big':
+            data = array('i', data)
+            data.byteswap()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            data.tofile(f)
+        os.replace(tmp_path, path)
+
+    def child(self, rank: int, action: str) -> int:
+        """Rank do sucessor pela ação, ou -1 se o movimento é inválido"""
+        return self.successors[rank * 4 + ACTION_CODES[action]]
+
+    def expand(self, rank: int) -> List[Tuple[int, str]]:
+        """Retorna [(rank_filho, ação)] para todos os movimentos válidos"""
+        base = rank * 4
+        return [(child, ACTIONS[code])
+                for code, child in enumerate(self.successors[base:base + 4])
+                if child >= 0]
+
+
+_move_table: Optional[MoveTable] = None
+
+
+def get_move_table(path: Optional[str] = DEFAULT_PATH) -> MoveTable:
+    """
+    Retorna a tabela compartilhada, construída uma única vez por processo.
+
+    Se `path` existir, a tabela é carregada do disco; senão é calculada em
+    memória. Nada é gravado aqui: o arquivo só é criado explicitamente, por
+    MoveTable.save() ou pela linha de comando (python move_table.py).
+    """
+    global _move_table
+    if _move_table is None:
+        if path is not None and os.path.exists(path):
+            try:
+                _move_table = MoveTable.load(path)
+            except (OSError, EOFError, ValueError):
+                _move_table = None
+        if _move_table is None:
+            _move_table = MoveTable.build()
+    return _move_table
+
+
+def loaded_move_table() -> Optional[MoveTable]:
+    """
+    Tabela compartilhada se já existe sem calcular: em memória ou no arquivo
+    DEFAULT_PATH. None caso contrário.
+    """
+    global _move_table
+    if _move_table is None and os.path.exists(DEFAULT_PATH):
+        try:
+            _move_table = MoveTable.load(DEFAULT_PATH)
+        except (OSError, EOFError, ValueError):
+            _move_table = None
+    return _move_table
+
+
+def table_for(state: int) -> Optional[MoveTable]:
+    """
+    Tabela aplicável à busca a partir de `state`: None se o estado não é
+    solvível ou se a tabela ainda não existe (a busca usa rank_state)
+    """
+    return loaded_move_table() if is_solvable(state) else None
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Gera e salva a tabela de movimentos do 8-puzzle")
+    parser.add_argument("--path", default=DEFAULT_PATH, help="arquivo de saída")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    table = MoveTable.build()
+    print(f"Tabela construída em {time.perf_counter() - start_time:.2f}s")
+    table.save(args.path)
+    print(f"Salva em {args.path} ({os.path.getsize(args.path)} bytes)")
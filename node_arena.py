@@ -0,0 +1,88 @@
+"""
+Arena de nós da árvore de busca em colunas array.array.
+
+Em vez de um objeto Node por estado gerado (objeto + inteiros + string da
+ação + ponteiro para o pai, mantidos vivos só para Node.path()), as buscas
+guardam cada nó como um índice inteiro (handle) em colunas paralelas:
+
+    states   estado empacotado (array 'Q' no 3x3; lista nos tamanhos cujo estado não cabe em 64 bits)
+    parents  handle do pai (-1 na raiz)              array 'i'
+    moves    código da ação (índice em ACTIONS)      array 'B'
+    costs    g (profundidade)                        array 'I'
+    ranks    rank denso, só no 3x3                   array 'i'
+
+Um nó do 3x3 ocupa 21 bytes. A profundidade usa 32 bits porque a DFS
+sem limite desce bem além de 65535 níveis. O caminho é refeito a partir dos índices e só
+a solução vira uma cadeia de Node (to_node), mantendo o contrato dos solvers.
+"""
+
+from array import array
+from typing import List, Optional
+
+from Node import Node
+from packed_state import ACTIONS, Layout, get_layout
+
+NO_MOVE = 0xFF
+
+
+class NodeArena:
+    """Nós de uma busca como handles inteiros em colunas paralelas"""
+
+    __slots__ = ('layout', 'states', 'parents', 'moves', 'costs', 'ranks', 'keys')
+
+    def __init__(self, layout: Optional[Layout] = None):
+        self.layout = layout if layout is not None else get_layout(3)
+        state_bits = self.layout.blank_shift + (self.layout.cells - 1).bit_length()
+        self.states = array('Q') if state_bits <= 64 else []
+        self.parents = array('i')
+        self.moves = array('B')
+        self.costs = array('I')
+        # Chave do conjunto fechado de cada nó (ver state_rank.state_key):
+        # rank denso no 3x3, o próprio estado nos demais tamanhos
+        self.ranks = array('i') if self.layout.size == 3 else None
+        self.keys = self.ranks if self.ranks is not None else self.states
+
+    def add(self, state: int, parent: int = -1, move: int = NO_MOVE, rank: int = -1) -> int:
+        """Cria um nó e devolve o seu handle"""
+        handle = len(self.parents)
+        self.states.append(state)
+        self.parents.append(parent)
+        self.moves.append(move)
+        self.costs.append(self.costs[parent] + 1 if parent >= 0 else 0)
+        if self.ranks is not None:
+            self.ranks.append(rank)
+        return handle
+
+    def actions(self, handle: int) -> List[str]:
+        """Ações da raiz até o nó"""
+        parents = self.parents
+        moves = self.moves
+        actions = []
+        while parents[handle] >= 0:
+            actions.append(ACTIONS[moves[handle]])
+            handle = parents[handle]
+        actions.reverse()
+        return actions
+
+    def root_of(self, handle: int) -> int:
+        parents = self.parents
+        while parents[handle] >= 0:
+            handle = parents[handle]
+        return handle
+
+    def to_node(self, handle: int) -> Node:
+        """Cadeia de Node da raiz até o nó (usada só para a solução)"""
+        return Node.from_moves(self.states[self.root_of(handle)], self.actions(handle), self.layout)
+
+    def nbytes(self) -> int:
+        """Memória das colunas (sem o overhead fixo dos objetos array)"""
+        columns = [self.parents, self.moves, self.costs]
+        if self.ranks is not None:
+            columns.append(self.ranks)
+        total = sum(column.itemsize * len(column) for column in columns)
+        if isinstance(self.states, array):
+            return total + self.states.itemsize * len(self.states)
+        return total + sum(state.__sizeof__() + 8 for state in self.states)
+
+    def __len__(self) -> int:
+        return len(self.parents)
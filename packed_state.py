@@ -0,0 +1,307 @@
+"""
+Representação compacta do estado do 8-puzzle.
+
+Cada estado é um único inteiro imutável:
+- bits 0..35: as 9 peças, 4 bits por célula (célula i ocupa os bits 4*i..4*i+3)
+- bits 36..39: índice da célula vazia (cache da posição do 0)
+
+Como o inteiro é o próprio estado, ele pode ser usado diretamente como
+chave em sets/dicts, sem conversões para listas, tuplas ou strings.
+
+As funções e constantes de módulo tratam o 3x3. Para tabuleiros N×N
+(15-puzzle, 24-puzzle) get_layout(N) devolve um Layout com o mesmo formato
+(N² peças com 4 ou 5 bits cada, seguidas do índice do vazio), vizinhos,
+objetivo e regra de solvibilidade gerados e guardados em cache por tamanho.
+
+O objetivo é simétrico pela transposição com troca de peças (Layout.reflect):
+caches e lotes podem guardar e resolver só o representante canônico de cada
+par de gêmeos (Layout.canonical) e espelhar as ações (reflect_moves).
+"""
+
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+CELL_BITS = 4
+CELL_MASK = 0xF
+BLANK_SHIFT = 36
+TILES_MASK = (1 << BLANK_SHIFT) - 1
+
+# Ordem canônica dos movimentos do espaço vazio
+ACTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+
+# Ação que desfaz cada movimento do vazio
+INVERSE_ACTIONS = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+
+# Ação equivalente no tabuleiro transposto (ver Layout.reflect)
+MIRROR_ACTIONS = {'UP': 'LEFT', 'LEFT': 'UP', 'DOWN': 'RIGHT', 'RIGHT': 'DOWN'}
+
+# Vizinhos de cada posição do vazio: (célula destino, ação).
+# Mantém a ordem de expansão usada historicamente por create_successors.
+NEIGHBORS = (
+    ((1, "RIGHT"), (3, "DOWN")),
+    ((0, "LEFT"), (2, "RIGHT"), (4, "DOWN")),
+    ((1, "LEFT"), (5, "DOWN")),
+    ((0, "UP"), (4, "RIGHT"), (6, "DOWN")),
+    ((1, "UP"), (3, "LEFT"), (5, "RIGHT"), (7, "DOWN")),
+    ((2, "UP"), (4, "LEFT"), (8, "DOWN")),
+    ((3, "UP"), (7, "RIGHT")),
+    ((4, "UP"), (6, "LEFT"), (8, "RIGHT")),
+    ((5, "UP"), (7, "LEFT")),
+)
+
+# Para cada posição do vazio: ação -> célula destino, na ordem canônica
+MOVE_TARGETS = tuple(
+    {action: target
+     for action in ACTIONS
+     for target, neighbor_action in NEIGHBORS[blank]
+     if neighbor_action == action}
+    for blank in range(9)
+)
+
+
+def pack(tiles: Sequence[int]) -> int:
+    """
+    Empacota uma lista 1D de 9 peças em um inteiro.
+
+    Raises:
+        ValueError: se o tabuleiro não contém o espaço vazio (0)
+    """
+    value = 0
+    for i, tile in enumerate(tiles):
+        value |= tile << (i * CELL_BITS)
+    try:
+        blank = list(tiles).index(0)
+    except ValueError:
+        raise ValueError("Tabuleiro inválido: espaço vazio não encontrado")
+    return value | (blank << BLANK_SHIFT)
+
+
+def unpack(state: int) -> List[int]:
+    """Desempacota o estado em uma lista 1D de 9 peças"""
+    return [(state >> (i * CELL_BITS)) & CELL_MASK for i in range(9)]
+
+
+def from_matrix(matrix: Sequence[Sequence[int]]) -> int:
+    """Empacota uma matriz 3x3"""
+    return pack([num for row in matrix for num in row])
+
+
+def to_matrix(state: int) -> List[List[int]]:
+    """Desempacota o estado em uma matriz 3x3"""
+    tiles = unpack(state)
+    return [tiles[0:3], tiles[3:6], tiles[6:9]]
+
+
+def blank_index(state: int) -> int:
+    """Índice (0-8) da célula vazia"""
+    return state >> BLANK_SHIFT
+
+
+def tile_at(state: int, cell: int) -> int:
+    """Peça na célula informada"""
+    return (state >> (cell * CELL_BITS)) & CELL_MASK
+
+
+def move_blank(state: int, target: int) -> int:
+    """
+    Move o espaço vazio para a célula vizinha `target`.
+
+    A peça em `target` vai para a posição antiga do vazio; como o vazio vale 0,
+    basta somar/subtrair a peça deslocada nas duas posições.
+    """
+    blank = state >> BLANK_SHIFT
+    tiles = state & TILES_MASK
+    tile = (tiles >> (target * CELL_BITS)) & CELL_MASK
+    tiles += (tile << (blank * CELL_BITS)) - (tile << (target * CELL_BITS))
+    return tiles | (target << BLANK_SHIFT)
+
+
+def successors(state: int) -> List[Tuple[int, str]]:
+    """Retorna [(estado_filho, ação)] para todos os movimentos válidos"""
+    return [(move_blank(state, target), action)
+            for target, action in NEIGHBORS[state >> BLANK_SHIFT]]
+
+
+def is_solvable(state: int) -> bool:
+    """Um estado é solvível se o número de inversões (sem o 0) é par"""
+    flat = [tile for tile in unpack(state) if tile != 0]
+    inversions = 0
+    for i in range(len(flat)):
+        for j in range(i + 1, len(flat)):
+            if flat[i] > flat[j]:
+                inversions += 1
+    return inversions % 2 == 0
+
+
+def to_string(state: int) -> str:
+    """Representação textual no mesmo formato de Board.__str__"""
+    rows = []
+    for row in to_matrix(state):
+        rows.append(' '.join(str(num) if num != 0 else ' ' for num in row))
+    return '\n'.join(rows)
+
+
+GOAL_STATE = pack([1, 2, 3,
+                   4, 5, 6,
+                   7, 8, 0])
+
+# Posição objetivo (linha, coluna) de cada peça
+GOAL_POSITIONS = {tile: divmod(cell, 3) for cell, tile in enumerate(unpack(GOAL_STATE))}
+
+
+class Layout:
+    """Formato do estado empacotado e tabelas de um tabuleiro N×N"""
+
+    def __init__(self, size: int):
+        if size < 2:
+            raise ValueError(f"Tamanho de tabuleiro inválido: {size}")
+        self.size = size
+        self.cells = size * size
+        self.cell_bits = max(CELL_BITS, (self.cells - 1).bit_length())
+        self.cell_mask = (1 << self.cell_bits) - 1
+        self.blank_shift = self.cells * self.cell_bits
+        self.tiles_mask = (1 << self.blank_shift) - 1
+
+        # Vizinhos em ordem crescente de célula (UP, LEFT, RIGHT, DOWN),
+        # a mesma ordem histórica do 3x3
+        neighbors = []
+        for cell in range(self.cells):
+            row, col = divmod(cell, size)
+            cell_neighbors = []
+            if row > 0:
+                cell_neighbors.append((cell - size, "UP"))
+            if col > 0:
+                cell_neighbors.append((cell - 1, "LEFT"))
+            if col < size - 1:
+                cell_neighbors.append((cell + 1, "RIGHT"))
+            if row < size - 1:
+                cell_neighbors.append((cell + size, "DOWN"))
+            neighbors.append(tuple(cell_neighbors))
+        self.neighbors = tuple(neighbors)
+        self.move_targets = tuple(
+            {action: target
+             for action in ACTIONS
+             for target, neighbor_action in self.neighbors[blank]
+             if neighbor_action == action}
+            for blank in range(self.cells)
+        )
+
+        self.goal_tiles = list(range(1, self.cells)) + [0]
+        self.goal_state = self.pack(self.goal_tiles)
+        self.goal_positions = {tile: divmod(cell, size) for cell, tile in enumerate(self.goal_tiles)}
+
+        # Simetria do objetivo: transpor o tabuleiro e trocar cada peça pela que
+        # o objetivo tem na célula transposta (no 3x3: 2<->4, 3<->7, 6<->8).
+        # O objetivo é fixo por essa troca, então um estado e o seu gêmeo têm
+        # soluções espelhadas (UP<->LEFT, DOWN<->RIGHT) e de mesmo tamanho.
+        self.mirror_cells = tuple((cell % size) * size + cell // size for cell in range(self.cells))
+        self.mirror_tiles = [0] * self.cells
+        for cell, tile in enumerate(self.goal_tiles):
+            self.mirror_tiles[tile] = self.goal_tiles[self.mirror_cells[cell]]
+
+    def pack(self, tiles: Sequence[int]) -> int:
+        """Empacota uma lista 1D de N² peças"""
+        value = 0
+        for i, tile in enumerate(tiles):
+            value |= tile << (i * self.cell_bits)
+        try:
+            blank = list(tiles).index(0)
+        except ValueError:
+            raise ValueError("Tabuleiro inválido: espaço vazio não encontrado")
+        return value | (blank << self.blank_shift)
+
+    def unpack(self, state: int) -> List[int]:
+        return [(state >> (i * self.cell_bits)) & self.cell_mask for i in range(self.cells)]
+
+    def from_matrix(self, matrix: Sequence[Sequence[int]]) -> int:
+        return self.pack([num for row in matrix for num in row])
+
+    def to_matrix(self, state: int) -> List[List[int]]:
+        tiles = self.unpack(state)
+        return [tiles[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+
+    def blank_index(self, state: int) -> int:
+        return state >> self.blank_shift
+
+    def tile_at(self, state: int, cell: int) -> int:
+        return (state >> (cell * self.cell_bits)) & self.cell_mask
+
+    def move_blank(self, state: int, target: int) -> int:
+        """Mesma aritmética de move_blank, com os deslocamentos do tamanho"""
+        bits = self.cell_bits
+        blank = state >> self.blank_shift
+        tiles = state & self.tiles_mask
+        tile = (tiles >> (target * bits)) & self.cell_mask
+        tiles += (tile << (blank * bits)) - (tile << (target * bits))
+        return tiles | (target << self.blank_shift)
+
+    def successors(self, state: int) -> List[Tuple[int, str]]:
+        return [(self.move_blank(state, target), action)
+                for target, action in self.neighbors[state >> self.blank_shift]]
+
+    def is_solvable(self, state: int) -> bool:
+        """
+        Largura ímpar: inversões pares.
+        Largura par: inversões + linha do vazio contada de baixo (a partir de 0)
+        deve ser par, pois cada movimento vertical troca a paridade dos dois.
+        """
+        tiles = self.unpack(state)
+        flat = [tile for tile in tiles if tile != 0]
+        inversions = 0
+        for i in range(len(flat)):
+            for j in range(i + 1, len(flat)):
+                if flat[i] > flat[j]:
+                    inversions += 1
+        if self.size % 2 == 1:
+            return inversions % 2 == 0
+        blank_row_from_bottom = self.size - 1 - tiles.index(0) // self.size
+        return (inversions + blank_row_from_bottom) % 2 == 0
+
+    def reflect(self, state: int) -> int:
+        """Gêmeo simétrico do estado (transposto e com as peças trocadas)"""
+        bits = self.cell_bits
+        mask = self.cell_mask
+        mirror_tiles = self.mirror_tiles
+        value = 0
+        for cell, target in enumerate(self.mirror_cells):
+            value |= mirror_tiles[(state >> (cell * bits)) & mask] << (target * bits)
+        return value | (self.mirror_cells[state >> self.blank_shift] << self.blank_shift)
+
+    def canonical(self, state: int) -> Tuple[int, bool]:
+        """
+        Representante canônico do par {estado, gêmeo}: o menor dos dois inteiros.
+        Retorna (canônico, refletido); se refletido, as ações do canônico
+        valem para o estado original depois de reflect_moves.
+        """
+        twin = self.reflect(state)
+        if twin < state:
+            return twin, True
+        return state, False
+
+    def to_string(self, state: int) -> str:
+        width = len(str(self.cells - 1))
+        rows = []
+        for row in self.to_matrix(state):
+            rows.append(' '.join(str(num).rjust(width) if num != 0 else ' ' * width for num in row))
+        return '\n'.join(rows)
+
+
+@lru_cache(maxsize=None)
+def get_layout(size: int = 3) -> Layout:
+    """Layout compartilhado do tamanho (criado uma vez por processo)"""
+    return Layout(size)
+
+
+def reflect(state: int) -> int:
+    """Gêmeo simétrico de um estado 3x3 (ver Layout.reflect)"""
+    return get_layout(3).reflect(state)
+
+
+def canonical(state: int) -> Tuple[int, bool]:
+    """Representante canônico de um estado 3x3 (ver Layout.canonical)"""
+    return get_layout(3).canonical(state)
+
+
+def reflect_moves(moves: Sequence[str]) -> List[str]:
+    """Converte uma sequência de ações para o tabuleiro gêmeo (e vice-versa)"""
+    return [MIRROR_ACTIONS[move] for move in moves]
@@ -0,0 +1,321 @@
+"""
+Bancos de padrões (pattern databases) aditivos e disjuntos para quebra-cabeças
+deslizantes N×N.
+
+Cada banco considera só um subconjunto de peças (o padrão). Uma BFS 0-1
+retrógrada a partir do objetivo, no espaço abstrato (posições das peças do
+padrão + posição do vazio), conta apenas os movimentos das peças do padrão;
+mover outra peça custa 0. Assim a soma dos valores de padrões disjuntos é
+admissível. O valor mínimo sobre as posições do vazio é gravado em um
+bytearray indexado pelo rank das posições das peças (k-permutação de N²).
+
+Na consulta também se usa o truque da reflexão: o tabuleiro transposto (com
+as peças renomeadas pela transposição do objetivo) tem a mesma distância,
+então h = max(h(estado), h(refletido)).
+
+O banco de k peças tem N²!/(N²-k)! entradas, e a BFS visita cada uma com
+cada posição do vazio, em Python puro (da ordem de 10⁵ estados abstratos
+por segundo). Tamanhos viáveis:
+
+- 3x3: qualquer partição (4+4 leva uma fração de segundo)
+- 4x4 com até 5 peças por padrão: ~1 minuto por padrão de 5 peças, então a
+  partição 5-5-5 do 15-puzzle leva alguns minutos
+- 4x4 com 6 peças: ~92 milhões de estados abstratos, da ordem de 10 minutos
+  e algumas centenas de MB por padrão
+- 4x4 com 7 ou 8 peças (partições 7-8, 6-6-3...): bilhões de estados, fora
+  do alcance desta implementação
+
+Um padrão tem no máximo N²-3 peças (ver PatternDatabase.build).
+
+Uso (construção offline, com progresso; partição 5-5-5 do 15-puzzle):
+    python pattern_database.py --size 4 --pattern 1,2,3,4,7 --pattern 5,6,9,10,13 --pattern 8,11,12,14,15 --out pdb_4
+"""
+
+import argparse
+import os
+import struct
+from array import array
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from packed_state import get_layout
+
+MAGIC = b'P8PD'
+HEADER = struct.Struct('<4sHH')
+
+
+def goal_tiles(size: int) -> List[int]:
+    """Objetivo N×N em lista 1D: 1..N²-1 seguido do vazio"""
+    return list(range(1, size * size)) + [0]
+
+
+def grid_neighbors(size: int) -> List[List[int]]:
+    """Células vizinhas de cada célula de um tabuleiro N×N"""
+    neighbors = []
+    for cell in range(size * size):
+        row, col = divmod(cell, size)
+        cells = []
+        if row > 0:
+            cells.append(cell - size)
+        if row < size - 1:
+            cells.append(cell + size)
+        if col > 0:
+            cells.append(cell - 1)
+        if col < size - 1:
+            cells.append(cell + 1)
+        neighbors.append(cells)
+    return neighbors
+
+
+def rank_positions(positions: Sequence[int], cells: int) -> int:
+    """Rank (0..cells!/(cells-k)! - 1) de k posições distintas, em ordem"""
+    rank = 0
+    used = 0
+    for i, position in enumerate(positions):
+        rank = rank * (cells - i) + position - bin(used & ((1 << position) - 1)).count('1')
+        used |= 1 << position
+    return rank
+
+
+def unrank_positions(rank: int, k: int, cells: int) -> List[int]:
+    """Inverso de rank_positions"""
+    digits = []
+    for i in range(k - 1, -1, -1):
+        rank, digit = divmod(rank, cells - i)
+        digits.append(digit)
+    digits.reverse()
+    free = list(range(cells))
+    return [free.pop(digit) for digit in digits]
+
+
+def permutation_count(k: int, cells: int) -> int:
+    count = 1
+    for i in range(k):
+        count *= cells - i
+    return count
+
+
+class PatternDatabase:
+    """Distâncias abstratas de um padrão de peças"""
+
+    def __init__(self, size: int, pattern: Sequence[int], table: bytearray):
+        self.size = size
+        self.pattern = tuple(pattern)
+        self.table = table
+        self.pattern_index = {tile: i for i, tile in enumerate(self.pattern)}
+
+    @classmethod
+    def build(cls, size: int, pattern: Sequence[int],
+              progress: Optional[Callable[[int, int], None]] = None) -> 'PatternDatabase':
+        """
+        BFS 0-1 retrógrada a partir do objetivo, nível de custo a nível.
+
+        Cada nível é uma pilha array('q') de índices (rank * N² + vazio): os
+        movimentos de custo 0 voltam para a pilha do nível, os de custo 1 vão
+        para a do próximo. Além das pilhas, a memória é o bitmap de estados
+        fechados (permutações × N² bits) e a tabela (1 byte por permutação).
+
+        Args:
+            progress: chamada como progress(preenchidos, total) ao fim de
+                      cada nível de custo
+
+        Raises:
+            ValueError: peças repetidas ou fora de 1..N²-1, ou padrão com mais
+                de N²-3 peças. Com todas as peças, ou todas menos uma, a
+                posição das demais fica determinada e a paridade deixa parte
+                das entradas inalcançável; o 0xFF delas entraria na soma e
+                tornaria h inadmissível
+        """
+        cells = size * size
+        k = len(pattern)
+        if len(set(pattern)) != k or not all(1 <= tile < cells for tile in pattern):
+            raise ValueError(f"Padrão inválido para {size}x{size}: {tuple(pattern)}")
+        if not 0 < k <= cells - 3:
+            raise ValueError(f"O padrão deve ter de 1 a {cells - 3} peças (recebido: {k})")
+        entries = permutation_count(k, cells)
+        neighbors = grid_neighbors(size)
+        goal = goal_tiles(size)
+        goal_cell = {tile: cell for cell, tile in enumerate(goal)}
+
+        table = bytearray([0xFF]) * entries
+        # Estados abstratos já fechados: bit (rank * cells + vazio)
+        closed = bytearray((entries * cells + 7) // 8)
+
+        start_positions = [goal_cell[tile] for tile in pattern]
+        level = array('q', [rank_positions(start_positions, cells) * cells + goal_cell[0]])
+        filled = 0
+        cost = 0
+
+        while level:
+            next_level = array('q')
+            while level:
+                index = level.pop()
+                if closed[index >> 3] & (1 << (index & 7)):
+                    continue
+                closed[index >> 3] |= 1 << (index & 7)
+
+                rank, blank = divmod(index, cells)
+                if table[rank] == 0xFF:
+                    table[rank] = cost
+                    filled += 1
+
+                positions = unrank_positions(rank, k, cells)
+                for target in neighbors[blank]:
+                    if target in positions:
+                        # Peça do padrão vai para a célula do vazio: custo 1
+                        moved = list(positions)
+                        moved[positions.index(target)] = blank
+                        child = rank_positions(moved, cells) * cells + target
+                        if not closed[child >> 3] & (1 << (child & 7)):
+                            next_level.append(child)
+                    else:
+                        # Outra peça se move: custo 0, mesmo nível
+                        child = rank * cells + target
+                        if not closed[child >> 3] & (1 << (child & 7)):
+                            level.append(child)
+            if progress is not None:
+                progress(filled, entries)
+            level = next_level
+            cost += 1
+
+        return cls(size, pattern, table)
+
+    def lookup(self, tiles: Sequence[int]) -> int:
+        """Valor do padrão para um tabuleiro em lista 1D"""
+        positions = [0] * len(self.pattern)
+        index = self.pattern_index
+        for cell, tile in enumerate(tiles):
+            i = index.get(tile)
+            if i is not None:
+                positions[i] = cell
+        return self.table[rank_positions(positions, self.size * self.size)]
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.size, len(self.pattern)))
+            f.write(bytes(self.pattern))
+            f.write(self.table)
+
+    @classmethod
+    def load(cls, path: str) -> 'PatternDatabase':
+        with open(path, 'rb') as f:
+            magic, size, k = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Arquivo não é um banco de padrões: {path}")
+            pattern = tuple(f.read(k))
+            table = bytearray(f.read())
+        if len(table) != permutation_count(k, size * size):
+            raise ValueError(f"Banco de padrões truncado: {path}")
+        return cls(size, pattern, table)
+
+
+class AdditivePDB:
+    """Soma de bancos de padrões disjuntos, com o máximo sobre a reflexão"""
+
+    def __init__(self, databases: Sequence[PatternDatabase]):
+        if not databases:
+            raise ValueError("É necessário ao menos um banco de padrões")
+        self.databases = list(databases)
+        self.size = self.databases[0].size
+        seen = set()
+        for database in self.databases:
+            if database.size != self.size or seen & set(database.pattern):
+                raise ValueError("Os padrões devem ser disjuntos e do mesmo tamanho de tabuleiro")
+            seen |= set(database.pattern)
+
+        # Transposição das células e renomeação das peças pelo objetivo transposto
+        # (a mesma simetria de Layout.reflect, aplicada à lista de peças)
+        layout = get_layout(self.size)
+        self.mirror_cells = layout.mirror_cells
+        self.mirror_tiles = layout.mirror_tiles
+
+    @classmethod
+    def build(cls, size: int, patterns: Iterable[Sequence[int]],
+              progress: Optional[Callable[[int, int], None]] = None) -> 'AdditivePDB':
+        return cls([PatternDatabase.build(size, pattern, progress) for pattern in patterns])
+
+    def reflect(self, tiles: Sequence[int]) -> List[int]:
+        """Tabuleiro transposto com as peças renomeadas"""
+        reflected = [0] * len(tiles)
+        for cell, tile in enumerate(tiles):
+            reflected[self.mirror_cells[cell]] = self.mirror_tiles[tile]
+        return reflected
+
+    def evaluate(self, tiles: Sequence[int]) -> int:
+        direct = sum(database.lookup(tiles) for database in self.databases)
+        reflected_tiles = self.reflect(tiles)
+        reflected = sum(database.lookup(reflected_tiles) for database in self.databases)
+        return max(direct, reflected)
+
+    __call__ = evaluate
+
+    def save(self, directory: str) -> List[str]:
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for i, database in enumerate(self.databases):
+            path = os.path.join(directory, f"pattern_{i}.pdb")
+            database.save(path)
+            paths.append(path)
+        return paths
+
+    @classmethod
+    def load(cls, directory: str) -> 'AdditivePDB':
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.pdb'))
+        return cls([PatternDatabase.load(os.path.join(directory, name)) for name in names])
+
+
+# Partição padrão do 8-puzzle: {1,2,3,4} + {5,6,7,8}
+DEFAULT_PATTERNS_3X3 = ((1, 2, 3, 4), (5, 6, 7, 8))
+
+# Diretório dos bancos dos tabuleiros maiores (gerados pela CLI abaixo)
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdb_{size}')
+
+_default_pdbs = {}
+
+
+def get_default_pdb(size: int = 3) -> AdditivePDB:
+    """
+    PDB aditivo padrão do tamanho. O do 8-puzzle é construído em memória na
+    primeira chamada; os maiores são lidos de pdb_N/ (ver DEFAULT_DIRECTORY).
+
+    Raises:
+        FileNotFoundError: se o banco de um tabuleiro maior não foi gerado
+    """
+    pdb = _default_pdbs.get(size)
+    if pdb is None:
+        if size == 3:
+            pdb = AdditivePDB.build(3, DEFAULT_PATTERNS_3X3)
+        else:
+            directory = DEFAULT_DIRECTORY.format(size=size)
+            if not os.path.isdir(directory):
+                raise FileNotFoundError(
+                    f"Banco de padrões {size}x{size} não encontrado em {directory} "
+                    f"(gere com: python pattern_database.py --size {size} --pattern ... --out {directory})")
+            pdb = AdditivePDB.load(directory)
+        _default_pdbs[size] = pdb
+    return pdb
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Constrói bancos de padrões aditivos")
+    parser.add_argument("--size", type=int, default=4, help="lado do tabuleiro (3 = 8-puzzle, 4 = 15-puzzle)")
+    parser.add_argument("--pattern", action="append", required=True,
+                        help="peças do padrão separadas por vírgula (repita para cada padrão)")
+    parser.add_argument("--out", required=True, help="diretório de saída")
+    args = parser.parse_args(argv)
+
+    patterns = [tuple(int(tile) for tile in pattern.split(',')) for pattern in args.pattern]
+
+    def report(filled: int, total: int) -> None:
+        print(f"  {filled}/{total} entradas ({100.0 * filled / total:.1f}%)", flush=True)
+
+    databases = []
+    for pattern in patterns:
+        print(f"Padrão {pattern}:")
+        databases.append(PatternDatabase.build(args.size, pattern, report))
+    for path in AdditivePDB(databases).save(args.out):
+        print(f"Salvo: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+"""
+Banco de dados em disco com distâncias e melhores movimentos do 8-puzzle.
+
+Formato (versão 1, little-endian):
+
+    offset  tamanho  campo
+    0       4        magic b'P8DB'
+    4       2        versão do formato
+    6       2        esquema de rank (1 = state_rank.rank_state)
+    8       8        estado objetivo empacotado
+    16      4        número de estados (181440)
+    20      4        CRC32 do payload
+    24      8        reservado (zeros)
+    32      N        distância ótima por rank (0xFF = desconhecido)
+    32+N    N        código do melhor movimento por rank (índice em ACTIONS, 0xFF no objetivo)
+
+O arquivo é aberto com mmap somente leitura: vários processos compartilham
+as mesmas páginas sem cópia. get_database confere o CRC32 uma vez ao abrir
+(menos de 1 ms) e trata um arquivo corrompido como ausente; solve ainda
+limita a descida pela distância gravada.
+
+Uso:
+    python puzzle_db.py build [--path ARQUIVO]
+    python puzzle_db.py verify [--path ARQUIVO]
+    python puzzle_db.py inspect [--path ARQUIVO]
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from Node import Node
+from puzzle_game import Board
+from packed_state import ACTIONS, GOAL_STATE, MOVE_TARGETS, BLANK_SHIFT, move_blank, is_solvable
+from state_rank import REACHABLE_STATES, rank_state
+
+MAGIC = b'P8DB'
+FORMAT_VERSION = 1
+RANK_SCHEME = 1
+HEADER = struct.Struct('<4sHHQII8x')
+NO_MOVE = 0xFF
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'puzzle_db.bin')
+
+
+class DatabaseError(Exception):
+    """Arquivo ausente, corrompido ou incompatível"""
+
+
+def build_database(path: str = DEFAULT_PATH, oracle=None) -> None:
+    """Gera o arquivo a partir do oráculo de distâncias"""
+    from distance_oracle import UNKNOWN, get_distance_oracle
+
+    if oracle is None:
+        oracle = get_distance_oracle()
+    distances = oracle.distances
+    successors = oracle.table.successors
+
+    best_moves = bytearray([NO_MOVE]) * REACHABLE_STATES
+    for rank in range(REACHABLE_STATES):
+        depth = distances[rank]
+        if depth == 0 or depth == UNKNOWN:
+            continue
+        base = rank * 4
+        for code in range(4):
+            child = successors[base + code]
+            if child >= 0 and distances[child] == depth - 1:
+                best_moves[rank] = code
+                break
+
+    payload = bytes(distances) + bytes(best_moves)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, RANK_SCHEME, GOAL_STATE,
+                         REACHABLE_STATES, zlib.crc32(payload))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class PuzzleDatabase:
+    """Leitura do banco via mmap (somente leitura, sem cópia)"""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except DatabaseError:
+            self._mmap.close()
+            raise
+        self._view = memoryview(self._mmap)
+        self.distances = self._view[HEADER.size:HEADER.size + self.count]
+        self.best_moves = self._view[HEADER.size + self.count:HEADER.size + 2 * self.count]
+
+    def _read_header(self) -> None:
+        if len(self._mmap) < HEADER.size:
+            raise DatabaseError(f"Arquivo truncado: {self.path}")
+        magic, version, scheme, goal, count, checksum = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise DatabaseError(f"Arquivo não é um banco do 8-puzzle: {self.path}")
+        if version != FORMAT_VERSION:
+            raise DatabaseError(f"Versão {version} não suportada (esperada {FORMAT_VERSION})")
+        if scheme != RANK_SCHEME or goal != GOAL_STATE or count != REACHABLE_STATES:
+            raise DatabaseError("Banco gerado para outro esquema de rank ou objetivo")
+        if len(self._mmap) != HEADER.size + 2 * count:
+            raise DatabaseError(f"Tamanho inválido: {len(self._mmap)} bytes")
+        self.version = version
+        self.rank_scheme = scheme
+        self.goal = goal
+        self.count = count
+        self.checksum = checksum
+
+    def verify(self) -> bool:
+        """Confere o CRC32 do payload"""
+        return zlib.crc32(self._view[HEADER.size:]) == self.checksum
+
+    def info(self) -> Dict[str, Any]:
+        """Resumo do cabeçalho e do conteúdo"""
+        histogram = [0] * 32
+        for depth in self.distances:
+            if depth < len(histogram):
+                histogram[depth] += 1
+        while histogram and histogram[-1] == 0:
+            histogram.pop()
+        return {
+            "path": self.path,
+            "version": self.version,
+            "rank_scheme": self.rank_scheme,
+            "goal": hex(self.goal),
+            "states": self.count,
+            "checksum": f"{self.checksum:08x}",
+            "size_bytes": len(self._mmap),
+            "max_distance": len(histogram) - 1,
+            "states_per_distance": histogram,
+        }
+
+    def distance(self, state: int) -> int:
+        """Distância ótima do estado ao objetivo (-1 se não solvível)"""
+        if not is_solvable(state):
+            return -1
+        return self.distances[rank_state(state)]
+
+    def solve(self, state: int) -> Optional[List[str]]:
+        """
+        Segue os melhores movimentos gravados até o objetivo, no máximo a
+        distância gravada do estado inicial.
+
+        Raises:
+            DatabaseError: se os movimentos gravados não levam ao objetivo
+                nessa distância (arquivo corrompido)
+        """
+        if not is_solvable(state):
+            return None
+        distance = self.distances[rank_state(state)]
+        moves = []
+        code = self.best_moves[rank_state(state)]
+        while code != NO_MOVE:
+            target = MOVE_TARGETS[state >> BLANK_SHIFT].get(ACTIONS[code]) if code < len(ACTIONS) else None
+            if target is None or len(moves) == distance:
+                raise DatabaseError(f"Movimentos gravados inválidos: {self.path}")
+            moves.append(ACTIONS[code])
+            state = move_blank(state, target)
+            code = self.best_moves[rank_state(state)]
+        if state != GOAL_STATE or len(moves) != distance:
+            raise DatabaseError(f"Movimentos gravados inválidos: {self.path}")
+        return moves
+
+    def close(self) -> None:
+        self.distances.release()
+        self.best_moves.release()
+        self._view.release()
+        self._mmap.close()
+
+
+_database: Optional[PuzzleDatabase] = None
+
+
+def get_database(path: str = DEFAULT_PATH) -> Optional[PuzzleDatabase]:
+    """
+    Banco compartilhado do processo, ou None se o arquivo não existe, é
+    inválido ou o CRC32 não confere (conferido uma vez, ao abrir)
+    """
+    global _database
+    if _database is None or _database.path != path:
+        if not os.path.exists(path):
+            return None
+        try:
+            database = PuzzleDatabase(path)
+        except (OSError, ValueError, DatabaseError):
+            return None
+        if not database.verify():
+            database.close()
+            return None
+        _database = database
+    return _database
+
+
+def database_search(initial_board: Board, path: str = DEFAULT_PATH, stats=None) -> Tuple[Optional[Node], Dict[str, Any]]:
+    """
+    Resolve consultando o banco em disco; sem o arquivo (ou com ele
+    corrompido), recorre ao A*.
+
+    Mesmo contrato de a_star_search: (nó solução, métricas). Tabuleiros que
+    não são 3x3 também vão direto para o A*. `stats` (SearchStats, opcional)
+    conta cada passo da descida como uma expansão.
+    """
+    database = get_database(path) if initial_board.size == 3 else None
+    if database is not None:
+        if stats is not None:
+            stats.start()
+        try:
+            moves = database.solve(initial_board.packed)
+        except DatabaseError:
+            database = None
+    if database is None:
+        # O A* reinicia as métricas de `stats`
+        from a_star_search import a_star_search
+        return a_star_search(initial_board, stats=stats)
+
+    if moves is None:
+        if stats is not None:
+            stats.finish(0, 0, 0, 0, 0, -1)
+        return None, {
+            "visited_nodes": 0,
+            "explored_states": 0,
+            "max_frontier": 0,
+            "solution_depth": -1
+        }
+
+    solution = Node.from_moves(initial_board.packed, moves)
+    if stats is not None:
+        stats.finish(len(moves), 0, 0, 0, 0, len(moves))
+        if stats.on_goal is not None:
+            stats.on_goal(solution.state, len(moves))
+    return solution, {
+        "visited_nodes": len(moves),
+        "explored_states": len(moves) + 1,
+        "max_frontier": 0,
+        "solution_depth": len(moves)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Banco de distâncias do 8-puzzle")
+    parser.add_argument("command", choices=["build", "verify", "inspect"])
+    parser.add_argument("--path", default=DEFAULT_PATH, help="arquivo do banco")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        import time
+        start_time = time.perf_counter()
+        build_database(args.path)
+        print(f"Banco gerado em {time.perf_counter() - start_time:.2f}s: {args.path}")
+        return 0
+
+    try:
+        database = PuzzleDatabase(args.path)
+    except (OSError, DatabaseError) as e:
+        print(f"ERRO: {e}")
+        return 1
+
+    if args.command == "verify":
+        ok = database.verify()
+        print("Checksum OK" if ok else "ERRO: checksum não confere")
+        database.close()
+        return 0 if ok else 1
+
+    for key, value in database.info().items():
+        print(f"{key}: {value}")
+    database.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
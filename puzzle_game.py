@@ -4,65 +4,60 @@ Este módulo contém a representação do tabuleiro e lógica básica do jogo.
 """
 
 import random
-import copy
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
+
+from packed_state import get_layout
 
 
 class Board:
-    """Representa o estado do tabuleiro 3x3 do puzzle 8"""
+    """Representa o estado do tabuleiro N×N do puzzle (3x3 por padrão)"""
     
-    def __init__(self, state: Optional[List[List[int]]] = None):
+    def __init__(self, state: Optional[Union[List[List[int]], int]] = None, size: Optional[int] = None):
         """
         Inicializa o tabuleiro.
         
         Args:
-            state: Estado inicial do tabuleiro. Se None, usa o estado final.
+            state: Estado inicial do tabuleiro (matriz N×N ou estado empacotado).
+                   Se None, usa o estado final.
+            size: Lado do tabuleiro (3 = 8-puzzle, 4 = 15-puzzle, 5 = 24-puzzle).
+                  Se None, é deduzido da matriz ou vale 3.
         """
+        if size is None:
+            size = len(state) if isinstance(state, (list, tuple)) else 3
+        self.layout = get_layout(size)
         if state is None:
             # Estado final (objetivo)
-            self.state = [
-                [1, 2, 3],
-                [4, 5, 6],
-                [7, 8, 0]  # 0 representa o espaço vazio
-            ]
+            self.packed = self.layout.goal_state
+        elif isinstance(state, int):
+            self.packed = state
         else:
-            self.state = copy.deepcopy(state)
-        
-        self.empty_pos = self._find_empty_position()
+            self.packed = self.layout.from_matrix(state)
+    
+    @property
+    def size(self) -> int:
+        """Lado do tabuleiro"""
+        return self.layout.size
+    
+    @property
+    def state(self) -> List[List[int]]:
+        """Matriz N×N do estado atual (0 representa o espaço vazio)"""
+        return self.layout.to_matrix(self.packed)
+    
+    @property
+    def empty_pos(self) -> Tuple[int, int]:
+        """Posição (linha, coluna) do espaço vazio"""
+        return divmod(self.packed >> self.layout.blank_shift, self.layout.size)
+    
     def ret_state(self):
         return self.state
-    def _find_empty_position(self) -> Tuple[int, int]:
-        """Encontra a posição do espaço vazio (0)"""
-        for i in range(3):
-            for j in range(3):
-                if self.state[i][j] == 0:
-                    return (i, j)
-        raise ValueError("Tabuleiro inválido: espaço vazio não encontrado")
     
     def is_goal_state(self) -> bool:
         """Verifica se o tabuleiro está no estado final"""
-        goal = [
-            [1, 2, 3],
-            [4, 5, 6],
-            [7, 8, 0]
-        ]
-        return self.state == goal
+        return self.packed == self.layout.goal_state
     
     def get_possible_moves(self) -> List[str]:
         """Retorna lista de movimentos possíveis"""
-        moves = []
-        row, col = self.empty_pos
-        
-        if row > 0:
-            moves.append('UP')
-        if row < 2:
-            moves.append('DOWN')
-        if col > 0:
-            moves.append('LEFT')
-        if col < 2:
-            moves.append('RIGHT')
-        
-        return moves
+        return list(self.layout.move_targets[self.packed >> self.layout.blank_shift])
     
     def move(self, direction: str) -> bool:
         """
@@ -74,26 +69,11 @@ class Board:
         Returns:
             True se o movimento foi realizado, False caso contrário
         """
-        if direction not in self.get_possible_moves():
+        target = self.layout.move_targets[self.packed >> self.layout.blank_shift].get(direction)
+        if target is None:
             return False
         
-        row, col = self.empty_pos
-        new_row, new_col = row, col
-        
-        if direction == 'UP':
-            new_row = row - 1
-        elif direction == 'DOWN':
-            new_row = row + 1
-        elif direction == 'LEFT':
-            new_col = col - 1
-        elif direction == 'RIGHT':
-            new_col = col + 1
-        
-        # Troca as posições
-        self.state[row][col] = self.state[new_row][new_col]
-        self.state[new_row][new_col] = 0
-        self.empty_pos = (new_row, new_col)
-        
+        self.packed = self.layout.move_blank(self.packed, target)
         return True
     
     def move_piece(self, piece_row: int, piece_col: int) -> bool:
@@ -106,17 +86,11 @@ class Board:
         Returns:
             True se o movimento foi realizado, False caso contrário
         """
-        empty_row, empty_col = self.empty_pos
+        target = piece_row * self.layout.size + piece_col
         
         # Verifica se a peça está adjacente ao espaço vazio
-        if (abs(piece_row - empty_row) == 1 and piece_col == empty_col) or \
-           (abs(piece_col - empty_col) == 1 and piece_row == empty_row):
-            
-            # Troca as posições
-            self.state[empty_row][empty_col] = self.state[piece_row][piece_col]
-            self.state[piece_row][piece_col] = 0
-            self.empty_pos = (piece_row, piece_col)
-            
+        if target in self.layout.move_targets[self.packed >> self.layout.blank_shift].values():
+            self.packed = self.layout.move_blank(self.packed, target)
             return True
         
         return False
@@ -136,12 +110,7 @@ class Board:
     
     def reset_to_goal(self) -> None:
         """Reseta o tabuleiro para o estado final"""
-        self.state = [
-            [1, 2, 3],
-            [4, 5, 6],
-            [7, 8, 0]
-        ]
-        self.empty_pos = (2, 2)
+        self.packed = self.layout.goal_state
     
     def set_state(self, new_state: List[List[int]]) -> bool:
         """
@@ -154,14 +123,14 @@ class Board:
             True se o estado é válido, False caso contrário
         """
         if self._is_valid_state(new_state):
-            self.state = copy.deepcopy(new_state)
-            self.empty_pos = self._find_empty_position()
+            self.packed = self.layout.from_matrix(new_state)
             return True
         return False
     
     def _is_valid_state(self, state: List[List[int]]) -> bool:
-        """Verifica se um estado é válido (contém números 0-8 exatamente uma vez)"""
-        if len(state) != 3 or any(len(row) != 3 for row in state):
+        """Verifica se um estado é válido (N×N com os números 0..N²-1 exatamente uma vez)"""
+        size = self.layout.size
+        if len(state) != size or any(len(row) != size for row in state):
             return False
         
         numbers = []
@@ -169,52 +138,30 @@ class Board:
             for num in row:
                 numbers.append(num)
         
-        return sorted(numbers) == list(range(9))
+        return sorted(numbers) == list(range(self.layout.cells))
     
     def is_solvable(self) -> bool:
         """
         Verifica se o estado atual é solvível.
-        Um puzzle 8 é solvível se o número de inversões é par.
+        Largura ímpar (8-puzzle): o número de inversões é par.
+        Largura par (15-puzzle): inversões + linha do vazio, contada de baixo, é par.
         """
-        # Converte para lista 1D (sem o 0)
-        flat = []
-        for row in self.state:
-            for num in row:
-                if num != 0:
-                    flat.append(num)
-        
-        # Conta inversões
-        inversions = 0
-        for i in range(len(flat)):
-            for j in range(i + 1, len(flat)):
-                if flat[i] > flat[j]:
-                    inversions += 1
-        
-        return inversions % 2 == 0
+        return self.layout.is_solvable(self.packed)
     
     def copy(self) -> 'Board':
         """Retorna uma cópia do tabuleiro"""
-        return Board(self.state)
+        return Board(self.packed, self.layout.size)
     
     def __str__(self) -> str:
         """Representação string do tabuleiro"""
-        result = []
-        for row in self.state:
-            row_str = []
-            for num in row:
-                if num == 0:
-                    row_str.append(' ')
-                else:
-                    row_str.append(str(num))
-            result.append(' '.join(row_str))
-        return '\n'.join(result)
+        return self.layout.to_string(self.packed)
     
     def __eq__(self, other) -> bool:
         """Compara dois tabuleiros"""
         if not isinstance(other, Board):
             return False
-        return self.state == other.state
+        return self.packed == other.packed and self.layout is other.layout
     
     def __hash__(self) -> int:
         """Hash do tabuleiro para uso em sets e dicts"""
-        return hash(str(self.state))
\ No newline at end of file
+        return hash(self.packed)
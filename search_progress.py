@@ -0,0 +1,78 @@
+"""
+Progresso e cancelamento cooperativo das buscas.
+
+As buscas aceitam um SearchProgress opcional e, a cada `interval` nós
+expandidos, chamam report(expandidos, fronteira). O report grava o
+instantâneo, que outra thread lê quando quiser (a interface consulta via
+root.after), e levanta SearchCancelled se cancel() foi chamado: a busca para
+no próximo report, sem ser interrompida no meio de uma expansão. Sem
+progress (None) o custo é um teste de None por nó expandido.
+
+    progress = SearchProgress()
+    threading.Thread(target=lambda: a_star_search(board, progress=progress)).start()
+    ...
+    progress.snapshot()   # {"expanded": ..., "frontier": ..., "elapsed": ..., "rate": ...}
+    progress.cancel()     # a busca levanta SearchCancelled
+
+Com `deadline` (instante de time.time()) a busca também é interrompida no
+primeiro report depois do prazo; serve para processos separados, onde não há
+como chamar cancel() (ver solver_service).
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class SearchCancelled(Exception):
+    """Busca interrompida por SearchProgress.cancel()"""
+
+
+class SearchProgress:
+    """Instantâneo do andamento de uma busca, compartilhado entre threads"""
+
+    def __init__(self, interval: int = 1024, deadline: Optional[float] = None):
+        if interval < 1:
+            raise ValueError("interval deve ser positivo")
+        self.interval = interval
+        self.deadline = deadline
+        self.expanded = 0
+        self.frontier = 0
+        self.start_time = time.perf_counter()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Pede o fim da busca (atendido no próximo report)"""
+        self._cancelled.set()
+
+    def report(self, expanded: int, frontier: int) -> None:
+        """
+        Chamado pela busca a cada `interval` expansões.
+
+        Raises:
+            SearchCancelled: se cancel() foi chamado ou o prazo passou
+        """
+        self.expanded = expanded
+        self.frontier = frontier
+        if self._cancelled.is_set() or (self.deadline is not None and time.time() >= self.deadline):
+            raise SearchCancelled()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    def rate(self) -> float:
+        """Nós expandidos por segundo desde a criação"""
+        elapsed = self.elapsed()
+        return self.expanded / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "expanded": self.expanded,
+            "frontier": self.frontier,
+            "elapsed": self.elapsed(),
+            "rate": self.rate(),
+        }
@@ -0,0 +1,97 @@
+"""
+Métricas comuns a todas as buscas e ganchos de instrumentação.
+
+Cada busca aceita `stats=SearchStats(...)` (opcional). Ao terminar, a busca
+preenche as mesmas métricas, qualquer que seja o algoritmo:
+
+- expansions: nós cujos sucessores foram gerados
+- generations: sucessores gerados
+- duplicates: sucessores descartados por já terem sido vistos
+- peak_frontier / peak_closed: maiores tamanhos da fronteira e do conjunto fechado
+- solution_depth: profundidade da solução (-1 se não houver)
+- wall_time / cpu_time: tempo de relógio e de CPU da busca
+
+Os ganchos são chamados durante a busca, se definidos:
+
+- on_expand(estado, g): antes de gerar os sucessores de um nó
+- on_generate(filho, pai): para cada sucessor gerado
+- on_goal(estado, profundidade): ao encontrar o objetivo
+
+Sem stats (ou sem um gancho) a busca faz só um teste de None por nó, nada de
+chamadas nem alocações. Os contadores saem dos contadores que cada busca já
+mantém, sem custo extra por nó. As buscas por tabela (oráculo, banco em
+disco, BFS vetorizada) não expandem nós um a um: só preenchem as métricas e
+chamam on_goal.
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+ExpandHook = Callable[[int, int], None]
+GenerateHook = Callable[[int, int], None]
+GoalHook = Callable[[int, int], None]
+
+
+class SearchStats:
+    """Métricas de uma busca e ganchos opcionais"""
+
+    __slots__ = ('on_expand', 'on_generate', 'on_goal',
+                 'expansions', 'generations', 'duplicates', 'peak_frontier', 'peak_closed',
+                 'solution_depth', 'wall_time', 'cpu_time', '_wall_start', '_cpu_start')
+
+    def __init__(self, on_expand: Optional[ExpandHook] = None, on_generate: Optional[GenerateHook] = None,
+                 on_goal: Optional[GoalHook] = None):
+        self.on_expand = on_expand
+        self.on_generate = on_generate
+        self.on_goal = on_goal
+        self.reset()
+
+    def reset(self) -> None:
+        self.expansions = 0
+        self.generations = 0
+        self.duplicates = 0
+        self.peak_frontier = 0
+        self.peak_closed = 0
+        self.solution_depth = -1
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+
+    def start(self) -> None:
+        """Zera as métricas e dispara os cronômetros (chamado pela busca)"""
+        self.reset()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def finish(self, expansions: int, generations: int, duplicates: int,
+               peak_frontier: int, peak_closed: int, solution_depth: int) -> None:
+        """Grava as métricas finais e para os cronômetros (chamado pela busca)"""
+        self.wall_time = time.perf_counter() - self._wall_start
+        self.cpu_time = time.process_time() - self._cpu_start
+        self.expansions = expansions
+        self.generations = generations
+        self.duplicates = duplicates
+        self.peak_frontier = peak_frontier
+        self.peak_closed = peak_closed
+        self.solution_depth = solution_depth
+
+    def rate(self) -> float:
+        """Nós expandidos por segundo de relógio"""
+        return self.expansions / self.wall_time if self.wall_time > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "expansions": self.expansions,
+            "generations": self.generations,
+            "duplicates": self.duplicates,
+            "peak_frontier": self.peak_frontier,
+            "peak_closed": self.peak_closed,
+            "solution_depth": self.solution_depth,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+        }
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{key}={value!r}" for key, value in self.as_dict().items())
+        return f"SearchStats({fields})"
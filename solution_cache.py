@@ -0,0 +1,134 @@
+"""
+Cache LRU de soluções ótimas, com chave no estado empacotado.
+
+Um caminho ótimo até o objetivo contém o caminho ótimo de cada estado
+intermediário (o seu sufixo). Por isso o cache não guarda listas de
+movimentos: cada estado do caminho vira uma entrada com o próximo movimento
+e a distância restante, e a solução de qualquer estado é refeita seguindo
+essas entradas até o objetivo. Gravar uma solução de d movimentos custa d+1
+entradas, e qualquer consulta que caia em um caminho conhecido é respondida
+sem busca.
+
+Só devem entrar soluções ótimas (BFS, A* com heurística admissível, IDA*,
+oráculo...): o sufixo de um caminho subótimo não é necessariamente ótimo.
+
+A chave de cada entrada é o representante canônico do estado (ver
+Layout.canonical), com o movimento escrito para o representante: um estado e
+o seu gêmeo simétrico ocupam uma única entrada, e uma solução gravada serve
+também para todos os gêmeos do caminho.
+
+O cache é limitado a `max_entries` estados; ao passar do limite, os menos
+usados recentemente são descartados. Os estados de um caminho são gravados
+do início para o objetivo, então o descarte começa pelos estados mais
+distantes e os sufixos que restam continuam completos.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from packed_state import ACTIONS, MIRROR_ACTIONS, Layout, get_layout
+
+CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+# Código do movimento equivalente no gêmeo (UP<->LEFT, DOWN<->RIGHT)
+MIRROR_CODES = tuple(CODES[MIRROR_ACTIONS[action]] for action in ACTIONS)
+
+
+class SolutionCache:
+    """LRU de sufixos ótimos: estado canônico -> (distância ao objetivo, próximo movimento)"""
+
+    def __init__(self, max_entries: int = 200_000, layout: Optional[Layout] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries deve ser positivo")
+        self.max_entries = max_entries
+        self.layout = layout or get_layout(3)
+        # estado canônico -> (distância << 2) | código do movimento no canônico
+        self.entries: 'OrderedDict[int, int]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, state: int) -> bool:
+        return self.layout.canonical(state)[0] in self.entries
+
+    def _next_state(self, state: int, code: int) -> int:
+        layout = self.layout
+        target = layout.move_targets[state >> layout.blank_shift][ACTIONS[code]]
+        return layout.move_blank(state, target)
+
+    def get(self, state: int) -> Optional[List[str]]:
+        """Solução ótima do estado, ou None se ele não está no cache"""
+        entries = self.entries
+        canonical = self.layout.canonical
+        key, reflected = canonical(state)
+        entry = entries.get(key)
+        chain = []
+        moves = []
+        # O caminho é percorrido no próprio estado; só as chaves são canônicas
+        while entry is not None and entry >> 2 > 0:
+            chain.append(key)
+            code = MIRROR_CODES[entry & 3] if reflected else entry & 3
+            moves.append(ACTIONS[code])
+            state = self._next_state(state, code)
+            depth = entry >> 2
+            key, reflected = canonical(state)
+            entry = entries.get(key)
+            if entry is not None and entry >> 2 != depth - 1:
+                entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        # Renova o caminho inteiro, na mesma ordem em que foi gravado
+        chain.append(key)
+        for visited in chain:
+            entries.move_to_end(visited)
+        self.hits += 1
+        return moves
+
+    def put(self, state: int, moves: List[str]) -> None:
+        """Grava a solução ótima `moves` de `state` e os sufixos de todos os estados do caminho"""
+        entries = self.entries
+        canonical = self.layout.canonical
+        depth = len(moves)
+        for move in moves:
+            code = CODES[move]
+            key, reflected = canonical(state)
+            entries[key] = (depth << 2) | (MIRROR_CODES[code] if reflected else code)
+            entries.move_to_end(key)
+            state = self._next_state(state, code)
+            depth -= 1
+        entries[state] = 0  # objetivo (o próprio canônico)
+        entries.move_to_end(state)
+
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_caches: Dict[int, SolutionCache] = {}
+
+
+def get_solution_cache(size: int = 3) -> SolutionCache:
+    """Cache compartilhado do processo para tabuleiros size×size"""
+    cache = _caches.get(size)
+    if cache is None:
+        cache = _caches[size] = SolutionCache(layout=get_layout(size))
+    return cache
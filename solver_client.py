@@ -0,0 +1,109 @@
+"""
+Cliente do serviço de resolução (solver_service).
+
+Uma única conexão carrega muitos pedidos em paralelo (pipelining): cada
+pedido recebe um id, é escrito imediatamente e aguarda a resposta com o
+mesmo id, que pode chegar fora de ordem.
+
+    async with await SolverClient.connect(port=8765) as client:
+        result = await client.solve([[8, 6, 7], [2, 5, 4], [3, 0, 1]])
+        results = await client.solve_many(boards, algorithm="bfs")
+"""
+
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+from solver_service import DEFAULT_HOST, DEFAULT_PORT
+
+
+class SolverError(Exception):
+    """Erro devolvido pelo serviço ou conexão encerrada"""
+
+
+class SolverClient:
+    """Conexão com pedidos em pipeline para o solver_service"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count()
+        self.waiting: Dict[int, asyncio.Future] = {}
+        self.receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                      unix_path: Optional[str] = None) -> 'SolverClient':
+        if unix_path is not None:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self) -> None:
+        """Entrega cada resposta ao pedido de mesmo id"""
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self.waiting.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self.waiting.values():
+                if not future.done():
+                    future.set_exception(SolverError("Conexão encerrada pelo serviço"))
+            self.waiting.clear()
+
+    async def request(self, board: Any, algorithm: str = "astar", heuristic: Optional[str] = None,
+                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Envia um pedido e devolve a resposta bruta (com "error" em caso de falha)"""
+        if self.receiver.done():
+            raise SolverError("Conexão encerrada pelo serviço")
+        request_id = next(self.ids)
+        message = {"id": request_id, "board": board, "algorithm": algorithm}
+        if heuristic is not None:
+            message["heuristic"] = heuristic
+        if timeout is not None:
+            message["timeout"] = timeout
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()  # respeita o backpressure do servidor
+        return await future
+
+    async def solve(self, board: Any, algorithm: str = "astar", heuristic: Optional[str] = None,
+                    timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Resolve um tabuleiro.
+
+        Raises:
+            SolverError: se o serviço respondeu com erro (prazo, tabuleiro inválido...)
+        """
+        response = await self.request(board, algorithm, heuristic, timeout)
+        if "error" in response:
+            raise SolverError(response["error"])
+        return response
+
+    async def solve_many(self, boards: Iterable[Any], algorithm: str = "astar",
+                         heuristic: Optional[str] = None, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Envia todos os pedidos de uma vez e devolve as respostas na ordem dos tabuleiros"""
+        return await asyncio.gather(*(self.request(board, algorithm, heuristic, timeout) for board in boards))
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        self.receiver.cancel()
+
+    async def __aenter__(self) -> 'SolverClient':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
@@ -0,0 +1,246 @@
+"""
+Serviço local de resolução com asyncio (sem interface gráfica).
+
+Protocolo: uma mensagem JSON por linha, nos dois sentidos, sobre TCP em
+localhost ou um socket Unix. Pedido:
+
+    {"id": 7, "board": [[8, 6, 7], [2, 5, 4], [3, 0, 1]], "algorithm": "astar",
+     "heuristic": "linear_conflict", "timeout": 5.0}
+
+Resposta (podem chegar fora de ordem; o id as associa aos pedidos):
+
+    {"id": 7, "solved": true, "moves": [...], "depth": 31, "metrics": {...},
+     "time": 0.21, "wait": 0.22, "coalesced": false}
+    {"id": 8, "error": "..."}
+
+Os solvers rodam em um ProcessPoolExecutor (ver batch_solver.solve_request).
+Pedidos simultâneos para o mesmo tabuleiro (ou o seu gêmeo simétrico, ver
+Layout.canonical), algoritmo e heurística são unidos em uma única
+computação. Cada conexão tem no máximo `max_inflight` pedidos em andamento;
+acima disso o servidor para de ler o socket, e o cliente sente a pressão
+pelo próprio TCP. Cada pedido tem um prazo
+(`timeout` no pedido ou o padrão do servidor): ao expirar, o cliente recebe
+erro. O prazo também vai para o processo do executor (ver
+batch_solver.solve_request): a busca para sozinha no prazo e libera o
+processo, então pedidos que estouram o prazo não prendem os workers. Uma
+computação compartilhada para no prazo do pedido que a iniciou; quem se
+juntou a ela e ainda tem tempo inicia outra com o próprio prazo. As consultas por tabela (oráculo, banco,
+BFS vetorizada) não são interrompidas, mas são curtas. Pedidos inválidos
+(JSON, tabuleiro, algoritmo) sempre recebem {"id": ..., "error": ...}.
+
+Uso:
+    python solver_service.py --port 8765 --workers 4
+    python solver_service.py --unix /tmp/puzzle.sock
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import stat
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from batch_solver import ALGORITHMS, parse_board, solve_request, warm_up
+from packed_state import reflect_moves
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def _init_worker() -> None:
+    warm_up("astar")
+
+
+class SolverService:
+    """Servidor JSON lines que resolve tabuleiros em um executor"""
+
+    def __init__(self, executor: Optional[Executor] = None, workers: Optional[int] = None,
+                 max_inflight: int = 64, default_timeout: Optional[float] = 30.0):
+        self.owns_executor = executor is None
+        self.executor = executor or ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self.max_inflight = max_inflight
+        self.default_timeout = default_timeout
+        # (algoritmo, heurística, tamanho, estado canônico) -> (computação em andamento, estado resolvido)
+        self.pending: Dict[Tuple[str, Optional[str], int, int], Tuple[asyncio.Future, int]] = {}
+        self.stats = {"requests": 0, "computations": 0, "coalesced": 0, "timeouts": 0, "errors": 0}
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.connections = set()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        if unix_path is not None:
+            # Socket deixado por uma execução anterior interrompida
+            if os.path.exists(unix_path) and stat.S_ISSOCK(os.stat(unix_path).st_mode):
+                os.unlink(unix_path)
+            self.server = await asyncio.start_unix_server(self.handle_connection, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in list(self.connections):
+            task.cancel()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        if self.owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = asyncio.current_task()
+        self.connections.add(connection)
+        inflight = asyncio.Semaphore(self.max_inflight)
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line: bytes) -> None:
+            try:
+                response = await self.handle_request(line)
+                async with write_lock:
+                    writer.write(json.dumps(response).encode() + b"\n")
+                    await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                inflight.release()
+
+        try:
+            while True:
+                # Backpressure: com max_inflight pedidos pendentes, não lê mais nada
+                await inflight.acquire()
+                line = await reader.readline()
+                if not line:
+                    inflight.release()
+                    break
+                task = asyncio.ensure_future(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            # Serviço encerrando: descarta os pedidos ainda pendentes
+            for task in tasks:
+                task.cancel()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections.discard(connection)
+            writer.close()
+
+    async def handle_request(self, line: bytes) -> Dict[str, Any]:
+        """Resposta de um pedido; nunca levanta exceção (falhas viram {"id", "error"})"""
+        self.stats["requests"] += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("O pedido deve ser um objeto JSON")
+            request_id = request.get("id")
+            algorithm = request.get("algorithm", "astar")
+            if algorithm not in ALGORITHMS:
+                raise ValueError(f"Algoritmo desconhecido: {algorithm!r}")
+            heuristic = request.get("heuristic")
+            if heuristic is not None and not isinstance(heuristic, str):
+                raise ValueError(f"Heurística inválida: {heuristic!r}")
+            timeout = request.get("timeout", self.default_timeout)
+            if timeout is not None:
+                timeout = float(timeout)
+            board, _ = parse_board(request.get("board"))
+            key = (algorithm, heuristic, board.size, board.layout.canonical(board.packed)[0])
+        except Exception as e:  # JSON, tipos e tabuleiro inválidos
+            self.stats["errors"] += 1
+            return {"id": request_id, "error": f"Pedido inválido: {e}"}
+
+        try:
+            return await self._solve(request_id, board, algorithm, heuristic, timeout, key)
+        except Exception as e:  # falha no processo do executor
+            self.stats["errors"] += 1
+            return {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+
+    async def _solve(self, request_id: Any, board, algorithm: str, heuristic: Optional[str],
+                     timeout: Optional[float], key: Tuple[str, Optional[str], int, int]) -> Dict[str, Any]:
+        deadline = time.time() + timeout if timeout is not None else None
+        start_time = time.perf_counter()
+        coalesced = False
+        while True:
+            entry = self.pending.get(key)
+            if entry is not None:
+                coalesced = True
+                self.stats["coalesced"] += 1
+            else:
+                self.stats["computations"] += 1
+                loop = asyncio.get_running_loop()
+                # O prazo vai junto: a busca para sozinha e libera o processo
+                future = loop.run_in_executor(self.executor, solve_request, board.state, algorithm, heuristic, deadline)
+                entry = self.pending[key] = (future, board.packed)
+
+                def release(_, entry=entry):
+                    if self.pending.get(key) is entry:
+                        del self.pending[key]
+                future.add_done_callback(release)
+            future, solved_state = entry
+
+            remaining = deadline - time.time() if deadline is not None else None
+            try:
+                # shield: o prazo de um pedido não cancela a computação dos outros
+                result = await asyncio.wait_for(asyncio.shield(future), remaining)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                return {"id": request_id, "error": f"Prazo de {timeout}s excedido"}
+            # Computação compartilhada interrompida pelo prazo de quem a iniciou:
+            # se este pedido ainda tem tempo, começa outra com o prazo dele
+            if result.get("cancelled"):
+                if deadline is not None and time.time() >= deadline:
+                    # O worker parou no prazo antes do wait_for: mesmo erro de prazo
+                    self.stats["timeouts"] += 1
+                    return {"id": request_id, "error": f"Prazo de {timeout}s excedido"}
+                if self.pending.get(key) is entry:
+                    del self.pending[key]
+                continue
+            break
+
+        response = dict(result, id=request_id, coalesced=coalesced)
+        if solved_state != board.packed:
+            # Gêmeo do tabuleiro resolvido: espelha as ações
+            response["board"] = board.state
+            if response.get("moves") is not None:
+                response["moves"] = reflect_moves(response["moves"])
+        response["wait"] = time.perf_counter() - start_time
+        return response
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Optional[str] = None,
+                workers: Optional[int] = None, max_inflight: int = 64,
+                default_timeout: Optional[float] = 30.0) -> None:
+    service = SolverService(workers=workers, max_inflight=max_inflight, default_timeout=default_timeout)
+    server = await service.start(host, port, unix_path)
+    where = unix_path or f"{host}:{port}"
+    print(f"Serviço de resolução ouvindo em {where}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serviço local de resolução (JSON lines)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="caminho de um socket Unix (no lugar de TCP)")
+    parser.add_argument("--workers", type=int, default=None, help="processos do executor")
+    parser.add_argument("--max-inflight", type=int, default=64, help="pedidos pendentes por conexão")
+    parser.add_argument("--timeout", type=float, default=30.0, help="prazo padrão por pedido (s)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.max_inflight, args.timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
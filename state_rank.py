@@ -0,0 +1,173 @@
+"""
+Ranqueamento de permutações (código de Lehmer) para o 8-puzzle.
+
+- rank_permutation/unrank_permutation: bijeção entre as 9! permutações
+  e os inteiros 0..362879.
+- rank_state/unrank_state: bijeção densa entre os 181.440 estados de uma
+  mesma classe de paridade (todos os estados alcançáveis a partir de um
+  tabuleiro) e os inteiros 0..181439.
+- StateBitmap: conjunto de estados visitados em um bytearray de 1 bit por
+  estado (~23 KB), usado como explorados/fechados pelos algoritmos de busca.
+- StateSet: mesma interface sobre um set, para tabuleiros N×N maiores, cujo
+  espaço de estados não cabe em um bitmap; a chave é o próprio estado
+  empacotado (ver state_key/closed_set).
+
+O rank denso é blank * 20160 + rank das 8 peças (sem o vazio). Como um
+movimento nunca altera a paridade das inversões no 3x3, os dois últimos
+dígitos de Lehmer das peças são determinados pelos seis primeiros.
+"""
+
+from math import factorial
+from typing import List, Sequence
+
+from packed_state import BLANK_SHIFT, CELL_BITS, CELL_MASK
+
+PERMUTATIONS = factorial(9)            # 362880
+TILE_RANKS = factorial(8) // 2         # 20160 arranjos de peças por posição do vazio
+REACHABLE_STATES = 9 * TILE_RANKS      # 181440
+
+# POPCOUNT[m] = número de bits 1 em m (peças 1..8 cabem em 9 bits)
+POPCOUNT = bytes(bin(m).count('1') for m in range(1 << 9))
+
+
+def rank_permutation(tiles: Sequence[int]) -> int:
+    """Rank lexicográfico (0..n!-1) de uma permutação de 0..n-1"""
+    n = len(tiles)
+    used = 0
+    rank = 0
+    for i, tile in enumerate(tiles):
+        smaller_unused = tile - bin(used & ((1 << tile) - 1)).count('1')
+        rank = rank * (n - i) + smaller_unused
+        used |= 1 << tile
+    return rank
+
+
+def unrank_permutation(rank: int, n: int = 9) -> List[int]:
+    """Inverso de rank_permutation"""
+    digits = []
+    for radix in range(1, n + 1):
+        rank, digit = divmod(rank, radix)
+        digits.append(digit)
+    remaining = list(range(n))
+    return [remaining.pop(digit) for digit in reversed(digits)]
+
+
+def rank_state(state: int) -> int:
+    """
+    Rank denso (0..181439) de um estado empacotado.
+
+    Estados solvíveis e não solvíveis compartilham o mesmo intervalo; como
+    uma busca nunca troca de classe de paridade, o rank é único dentro dela.
+    """
+    blank = state >> BLANK_SHIFT
+    used = 0
+    rank = 0
+    i = 0
+    for cell in range(9):
+        if cell == blank:
+            continue
+        tile = (state >> (cell * CELL_BITS)) & CELL_MASK
+        # Dígito de Lehmer: peças ainda não usadas menores que esta
+        rank = rank * (8 - i) + tile - 1 - POPCOUNT[used & ((1 << tile) - 1)]
+        used |= 1 << tile
+        i += 1
+        if i == 6:
+            break
+    return blank * TILE_RANKS + rank
+
+
+def unrank_state(rank: int, solvable: bool = True) -> int:
+    """Inverso de rank_state para a classe de paridade escolhida"""
+    blank, rank = divmod(rank, TILE_RANKS)
+    digits = []
+    for radix in (3, 4, 5, 6, 7, 8):
+        rank, digit = divmod(rank, radix)
+        digits.append(digit)
+    digits.reverse()
+    # O penúltimo dígito fixa a paridade das inversões (soma dos dígitos)
+    digits.append((sum(digits) + (0 if solvable else 1)) % 2)
+    digits.append(0)
+
+    remaining = list(range(1, 9))
+    tiles = [remaining.pop(digit) for digit in digits]
+    tiles.insert(blank, 0)
+
+    state = 0
+    for cell, tile in enumerate(tiles):
+        state |= tile << (cell * CELL_BITS)
+    return state | (blank << BLANK_SHIFT)
+
+
+class StateBitmap:
+    """Conjunto de estados empacotados com 1 bit por rank denso"""
+
+    def __init__(self):
+        self.bits = bytearray((REACHABLE_STATES + 7) // 8)
+        self.count = 0
+
+    def add_rank(self, rank: int) -> bool:
+        """Marca o rank; retorna True se ele ainda não estava no conjunto"""
+        mask = 1 << (rank & 7)
+        byte = self.bits[rank >> 3]
+        if byte & mask:
+            return False
+        self.bits[rank >> 3] = byte | mask
+        self.count += 1
+        return True
+
+    def has_rank(self, rank: int) -> bool:
+        return bool(self.bits[rank >> 3] & (1 << (rank & 7)))
+
+    def discard_rank(self, rank: int) -> None:
+        """Desmarca o rank (reabertura de um estado no A*)"""
+        mask = 1 << (rank & 7)
+        byte = self.bits[rank >> 3]
+        if byte & mask:
+            self.bits[rank >> 3] = byte & ~mask
+            self.count -= 1
+
+    def add(self, state: int) -> bool:
+        """Adiciona um estado empacotado; retorna True se era novo"""
+        return self.add_rank(rank_state(state))
+
+    def __contains__(self, state: int) -> bool:
+        return self.has_rank(rank_state(state))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class StateSet:
+    """Conjunto fechado para tabuleiros N×N (4x4, 5x5): a chave é o estado empacotado"""
+
+    def __init__(self):
+        self.states = set()
+
+    def add_rank(self, key: int) -> bool:
+        """Marca a chave; retorna True se ela ainda não estava no conjunto"""
+        if key in self.states:
+            return False
+        self.states.add(key)
+        return True
+
+    def has_rank(self, key: int) -> bool:
+        return key in self.states
+
+    def discard_rank(self, key: int) -> None:
+        self.states.discard(key)
+
+    add = add_rank
+    __contains__ = has_rank
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+
+def state_key(state: int, size: int = 3) -> int:
+    """Chave do conjunto fechado (Node.rank): rank denso no 3x3, o próprio estado nos demais"""
+    return rank_state(state) if size == 3 else state
+
+
+def closed_set(size: int = 3):
+    """StateBitmap no 3x3, StateSet nos tamanhos maiores"""
+    return StateBitmap() if size == 3 else StateSet()
@@ -1,10 +1,22 @@
+import argparse
+import cProfile
+import linecache
+import os
+import re
 import time
+import tracemalloc
+import unicodedata
 from Node import Node
-from breath_first_search import bfs
-from deep_first_search import dfs
+from breath_first_search import bfs, bidirectional_bfs
+from deep_first_search import depth_limited_dfs, dfs, iterative_deepening_dfs
 from a_star_search import a_star_search
 from heuristic_search import greedy_best_first_search_with_loop
+from distance_oracle import oracle_search
+from ida_star import ida_star_search
 from puzzle_game import Board
+from packed_state import pack
+from solution_cache import SolutionCache
+from search_stats import SearchStats
 
 class TestAllAlgorithms:
     def __init__(self):
@@ -42,8 +54,54 @@ class TestAllAlgorithms:
             "BFS": self.test_bfs,
             "DFS": self.test_dfs,
             "Busca Heurística": self.test_heuristic,
-            "A*": self.test_astar
+            "A*": self.test_astar,
+            "Oráculo": self.test_oracle,
+            "BFS Bidirecional": self.test_bidirectional_bfs,
+            "IDA*": self.test_ida_star,
+            "A* Conflito Linear": self.test_astar_linear_conflict,
+            "DFS Limitada": self.test_depth_limited_dfs,
+            "IDDFS": self.test_iddfs
         }
+        
+        # Algoritmos com solução ótima: só eles consultam e alimentam o cache
+        self.optimal_algorithms = {"BFS", "A*", "Oráculo", "BFS Bidirecional", "IDA*", "A* Conflito Linear", "IDDFS"}
+        
+        # Cache de soluções (desligado por padrão para não distorcer as medições)
+        self.solution_cache = None
+        
+        # Ganchos de SearchStats para as execuções (o modo de perfil instala on_expand)
+        self.stats_hooks = {}
+    
+    def toggle_cache(self):
+        """Liga/desliga o cache de soluções ótimas; retorna True se ficou ligado"""
+        self.solution_cache = SolutionCache() if self.solution_cache is None else None
+        return self.solution_cache is not None
+    
+    def run_algorithm(self, algorithm_name, initial_matrix):
+        """Executa um algoritmo, respondendo pelo cache quando ligado e o algoritmo é ótimo"""
+        if self.solution_cache is None or algorithm_name not in self.optimal_algorithms:
+            return self.algorithms[algorithm_name](initial_matrix)
+        
+        state = pack(self.matrix_to_list(initial_matrix))
+        start_time = time.perf_counter()
+        moves = self.solution_cache.get(state)
+        if moves is not None:
+            path = Node.from_moves(state, moves).path()
+            return {
+                "success": True,
+                "time": time.perf_counter() - start_time,
+                "solution_depth": len(moves),
+                "visited_nodes": 0,
+                "explored_states": 0,
+                "moves": moves,
+                "path": path,
+                "cached": True
+            }
+        
+        result = self.algorithms[algorithm_name](initial_matrix)
+        if result["success"]:
+            self.solution_cache.put(state, result["moves"])
+        return result
     
     def matrix_to_list(self, matrix):
         """Converte matriz 3x3 para lista 1D"""
@@ -61,12 +119,13 @@ class TestAllAlgorithms:
     def test_bfs(self, initial_matrix):
         """Testa o algoritmo BFS"""
         try:
-            # Converte matriz para lista 1D para o BFS
+            # Converte matriz para estado empacotado para o BFS
             initial_list = self.matrix_to_list(initial_matrix)
-            root = Node(initial_list, None, None)
+            root = Node(pack(initial_list), None, None)
             
+            stats = SearchStats(**self.stats_hooks)
             start_time = time.perf_counter()
-            result = bfs(root)
+            result = bfs(root, stats=stats)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
             
@@ -91,7 +150,8 @@ class TestAllAlgorithms:
                 "visited_nodes": visited_nodes,
                 "explored_states": explored_states_len,
                 "moves": moves,
-                "path": path
+                "path": path,
+                "stats": stats.as_dict()
             }
             
         except Exception as e:
@@ -104,12 +164,13 @@ class TestAllAlgorithms:
     def test_dfs(self, initial_matrix):
         """Testa o algoritmo DFS"""
         try:
-            # Converte matriz para lista 1D para o DFS
+            # Converte matriz para estado empacotado para o DFS
             initial_list = self.matrix_to_list(initial_matrix)
-            root = Node(initial_list, None, None)
+            root = Node(pack(initial_list), None, None)
             
+            stats = SearchStats(**self.stats_hooks)
             start_time = time.perf_counter()
-            result = dfs(root)
+            result = dfs(root, stats=stats)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
             
@@ -134,7 +195,51 @@ class TestAllAlgorithms:
                 "visited_nodes": visited_nodes,
                 "explored_states": explored_states_len,
                 "moves": moves,
-                "path": path
+                "path": path,
+                "stats": stats.as_dict()
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "time": 0
+            }
+    
+    def test_bidirectional_bfs(self, initial_matrix):
+        """Testa o algoritmo BFS bidirecional"""
+        try:
+            initial_list = self.matrix_to_list(initial_matrix)
+            root = Node(pack(initial_list), None, None)
+            
+            stats = SearchStats(**self.stats_hooks)
+            start_time = time.perf_counter()
+            result = bidirectional_bfs(root, stats=stats)
+            end_time = time.perf_counter()
+            execution_time = end_time - start_time
+            
+            if result is None or result[0] is None:
+                return {
+                    "success": False,
+                    "time": execution_time,
+                    "error": "Nenhuma solução encontrada"
+                }
+            
+            solve_node, visited_nodes, explored_states_len = result
+            path = solve_node.path()
+            
+            # Extrai movimentos
+            moves = [node.action for node in path[1:] if node.action]
+            
+            return {
+                "success": True,
+                "time": execution_time,
+                "solution_depth": len(path) - 1,
+                "visited_nodes": visited_nodes,
+                "explored_states": explored_states_len,
+                "moves": moves,
+                "path": path,
+                "stats": stats.as_dict()
             }
             
         except Exception as e:
@@ -150,37 +255,38 @@ class TestAllAlgorithms:
             # Converte matriz para Board para a busca heurística
             board = self.matrix_to_board(initial_matrix)
             
+            stats = SearchStats(**self.stats_hooks)
             start_time = time.perf_counter()
-            moves, steps = greedy_best_first_search_with_loop(board)
+            result = greedy_best_first_search_with_loop(board, stats=stats)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
             
-            if moves is None:
+            if result is None:
                 return {
                     "success": False,
                     "time": execution_time,
-                    "error": f"Algoritmo entrou em loop após {steps} movimentos"
+                    "error": "Nenhuma solução encontrada"
                 }
             
-            if not moves:  # Já resolvido
+            # (movimentos, número de movimentos, nós visitados, nós finais)
+            moves, steps, visited_nodes, _ = result
+            if moves is None:
                 return {
-                    "success": True,
+                    "success": False,
                     "time": execution_time,
-                    "solution_depth": 0,
-                    "visited_nodes": steps,
-                    "explored_states": steps,
-                    "moves": [],
-                    "path": []
+                    "error": f"Algoritmo entrou em loop após {steps} movimentos",
+                    "stats": stats.as_dict()
                 }
             
             return {
                 "success": True,
                 "time": execution_time,
                 "solution_depth": len(moves),
-                "visited_nodes": steps,
-                "explored_states": steps,  # Aproximação
+                "visited_nodes": visited_nodes,
+                "explored_states": stats.peak_closed,
                 "moves": moves,
-                "path": []  # Busca heurística não retorna caminho completo
+                "path": Node.from_moves(board.packed, moves).path(),
+                "stats": stats.as_dict()
             }
             
         except Exception as e:
@@ -192,12 +298,77 @@ class TestAllAlgorithms:
     
     def test_astar(self, initial_matrix):
         """Testa o algoritmo A*"""
+        return self.run_board_search(a_star_search, initial_matrix)
+    
+    def test_astar_linear_conflict(self, initial_matrix):
+        """Testa o A* com a heurística Manhattan + conflitos lineares"""
+        return self.run_board_search(lambda board, stats: a_star_search(board, 'linear_conflict', stats=stats),
+                                     initial_matrix)
+    
+    def test_ida_star(self, initial_matrix):
+        """Testa o algoritmo IDA*"""
+        return self.run_board_search(ida_star_search, initial_matrix)
+    
+    def test_oracle(self, initial_matrix):
+        """Testa o oráculo de distâncias exatas"""
+        return self.run_board_search(oracle_search, initial_matrix)
+    
+    def test_depth_limited_dfs(self, initial_matrix):
+        """Testa a DFS limitada a DEFAULT_DEPTH_LIMIT (20) movimentos (memória O(profundidade))"""
+        return self.run_node_search(depth_limited_dfs, initial_matrix)
+    
+    def test_iddfs(self, initial_matrix):
+        """Testa a DFS com aprofundamento iterativo até DEFAULT_DEPTH_LIMIT (20) movimentos"""
+        return self.run_node_search(iterative_deepening_dfs, initial_matrix)
+    
+    def run_node_search(self, search, initial_matrix):
+        """Executa um algoritmo com o contrato de dfs: (nó solução, visitados, armazenados)"""
         try:
-            # Converte matriz para Board para o A*
+            root = Node(pack(self.matrix_to_list(initial_matrix)))
+            
+            stats = SearchStats(**self.stats_hooks)
+            start_time = time.perf_counter()
+            solve_node, visited_nodes, stored_states = search(root, stats=stats)
+            execution_time = time.perf_counter() - start_time
+            
+            if solve_node is None:
+                return {
+                    "success": False,
+                    "time": execution_time,
+                    "error": "Nenhuma solução encontrada",
+                    "stats": stats.as_dict()
+                }
+            
+            path = solve_node.path()
+            moves = [node.action for node in path[1:] if node.action]
+            
+            return {
+                "success": True,
+                "time": execution_time,
+                "solution_depth": len(moves),
+                "visited_nodes": visited_nodes,
+                "explored_states": stored_states,
+                "moves": moves,
+                "path": path,
+                "stats": stats.as_dict()
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "time": 0
+            }
+    
+    def run_board_search(self, search, initial_matrix):
+        """Executa um algoritmo com o contrato de a_star_search: (nó solução, métricas)"""
+        try:
+            # Converte matriz para Board
             board = self.matrix_to_board(initial_matrix)
             
+            stats = SearchStats(**self.stats_hooks)
             start_time = time.perf_counter()
-            result = a_star_search(board)
+            result = search(board, stats=stats)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
             
@@ -223,7 +394,8 @@ class TestAllAlgorithms:
                 "explored_states": metrics['explored_states'],
                 "max_frontier": metrics.get('max_frontier', 0),
                 "moves": moves,
-                "path": path
+                "path": path,
+                "stats": stats.as_dict()
             }
             
         except Exception as e:
@@ -246,10 +418,10 @@ class TestAllAlgorithms:
             print(f"❌ Algoritmo '{algorithm_name}' não encontrado!")
             return None
         
-        result = self.algorithms[algorithm_name](initial_matrix)
+        result = self.run_algorithm(algorithm_name, initial_matrix)
         
         if result["success"]:
-            print(f"✅ SUCESSO!")
+            print(f"✅ SUCESSO!" + (" (cache)" if result.get("cached") else ""))
             print(f"⏱️  Tempo de execução: {result['time']:.4f} segundos")
             print(f"📊 Profundidade da solução: {result['solution_depth']} movimentos")
             print(f"🔍 Nós visitados: {result['visited_nodes']}")
@@ -258,6 +430,12 @@ class TestAllAlgorithms:
             if 'max_frontier' in result:
                 print(f"🚀 Fronteira máxima: {result['max_frontier']}")
             
+            if 'stats' in result:
+                stats = result['stats']
+                print(f"🧮 Expansões: {stats['expansions']} | Gerados: {stats['generations']} | "
+                      f"Duplicados: {stats['duplicates']} | Pico fronteira: {stats['peak_frontier']} | "
+                      f"Pico fechados: {stats['peak_closed']} | CPU: {stats['cpu_time']:.4f}s")
+            
             if result['solution_depth'] > 0:
                 print(f"📈 Eficiência: {result['visited_nodes']/result['solution_depth']:.2f} nós/movimento")
             
@@ -324,7 +502,7 @@ class TestAllAlgorithms:
         results = {}
         for algorithm_name in self.algorithms.keys():
             print(f"\n--- {algorithm_name} ---")
-            result = self.algorithms[algorithm_name](initial_matrix)
+            result = self.run_algorithm(algorithm_name, initial_matrix)
             results[algorithm_name] = result
             
             if result["success"]:
@@ -347,6 +525,136 @@ class TestAllAlgorithms:
         
         return results
     
+    def profile_algorithm(self, algorithm_name, test_index=3, top=15, out_dir=".", warmup=True):
+        """
+        Perfila um algoritmo em um caso de teste.
+        
+        Execuções separadas, para uma ferramenta não distorcer a outra: uma
+        sob cProfile (grava o .prof e lista as funções com mais tempo próprio)
+        e duas sob tracemalloc (acham o pico e listam os pontos de alocação
+        nele, além dos bytes por nó expandido sem o custo fixo). O aquecimento tira da medição imports e tabelas
+        carregadas uma única vez (oráculo, move table...). O cache de soluções
+        não é consultado.
+        """
+        if algorithm_name not in self.algorithms:
+            print(f"❌ Algoritmo '{algorithm_name}' não encontrado!")
+            return None
+        if not 0 <= test_index < len(self.test_cases):
+            print("❌ Índice de teste inválido!")
+            return None
+        
+        test_name, initial_matrix = self.test_cases[test_index]
+        run = self.algorithms[algorithm_name]
+        print(f"\n{'='*80}")
+        print(f"🔬 PERFIL: {algorithm_name} - {test_name}")
+        print(f"{'='*80}")
+        
+        if warmup:
+            run(initial_matrix)
+        
+        # Tempo: cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        result = run(initial_matrix)
+        profiler.disable()
+        if not result["success"]:
+            # Uma busca que falha também é perfilada (laço da gulosa, limite de profundidade...)
+            print(f"⚠️  Sem solução: {result.get('error', 'Erro desconhecido')}")
+        
+        slug = re.sub(r"[^a-z0-9]+", "_", unicodedata.normalize("NFKD", algorithm_name.replace("*", " star"))
+                      .encode("ascii", "ignore").decode().lower()).strip("_")
+        os.makedirs(out_dir, exist_ok=True)
+        prof_path = os.path.join(out_dir, f"profile_{slug}_caso{test_index}.prof")
+        profiler.dump_stats(prof_path)
+        
+        profiler.create_stats()
+        hot = sorted(profiler.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        print(f"\n🔥 FUNÇÕES MAIS QUENTES (tempo próprio, top {top}):")
+        print(f"{'Chamadas':>10} {'Próprio (s)':>12} {'Acumulado (s)':>14}  Função")
+        for (filename, line, function), (_, calls, own_time, cumulative, _) in hot:
+            where = f"{os.path.basename(filename)}:{line}" if line else filename
+            print(f"{calls:>10} {own_time:>12.4f} {cumulative:>14.4f}  {function} ({where})")
+        
+        # Memória: tracemalloc, em duas execuções da mesma busca (determinística).
+        # A primeira só lê a memória viva a cada expansão e acha a expansão do
+        # pico; a segunda tira a foto nessa expansão, então os pontos de alocação
+        # são os da busca no pico, e não o que sobra ao fim. O que já estava vivo
+        # na primeira expansão (bitmap, tabelas, raiz) é custo fixo e fica fora
+        # dos bytes por nó.
+        probe = {"expansions": 0, "setup": None, "top": -1, "top_at": 0}
+        
+        def measure(state, g):
+            probe["expansions"] += 1
+            live = tracemalloc.get_traced_memory()[0]
+            if probe["setup"] is None:
+                probe["setup"] = live
+            if live > probe["top"]:
+                probe["top"], probe["top_at"] = live, probe["expansions"]
+        
+        tracemalloc.start()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        self.stats_hooks = {"on_expand": measure}
+        try:
+            result = run(initial_matrix)
+        finally:
+            self.stats_hooks = {}
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        current -= start_bytes
+        peak -= start_bytes
+        setup = probe["setup"] - start_bytes if probe["setup"] is not None else 0
+        
+        shot = {"expansions": 0, "snapshot": None}
+        
+        def capture(state, g):
+            shot["expansions"] += 1
+            if shot["expansions"] == probe["top_at"]:
+                shot["snapshot"] = tracemalloc.take_snapshot()
+        
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+        self.stats_hooks = {"on_expand": capture}
+        try:
+            run(initial_matrix)
+            # Buscas por tabela não expandem nós: foto ao fim
+            snapshot = shot["snapshot"] or tracemalloc.take_snapshot()
+        finally:
+            self.stats_hooks = {}
+            tracemalloc.stop()
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+        growth = snapshot.filter_traces(filters).compare_to(baseline.filter_traces(filters), "lineno")
+        growth = [stat for stat in growth if stat.size_diff > 0][:top]
+        where = f"na expansão {probe['top_at']}" if shot["snapshot"] is not None else "ao fim da busca"
+        print(f"\n📦 PONTOS DE ALOCAÇÃO (crescimento desde o início, no pico {where}, top {top}):")
+        print(f"{'KiB':>10} {'Blocos':>8}  Local")
+        for stat in growth:
+            frame = stat.traceback[0]
+            source = linecache.getline(frame.filename, frame.lineno).strip()
+            print(f"{stat.size_diff / 1024:>10.1f} {stat.count_diff:>8}  "
+                  f"{os.path.basename(frame.filename)}:{frame.lineno}  {source}")
+        
+        expansions = result.get("stats", {}).get("expansions", 0)
+        bytes_per_node = max(peak - setup, 0) / expansions if expansions else 0.0
+        print(f"\n💾 Pico de memória: {peak / 1024:.1f} KiB | Ao fim: {current / 1024:.1f} KiB | "
+              f"Custo fixo (1ª expansão): {setup / 1024:.1f} KiB")
+        print(f"🧮 Expansões: {expansions} | Bytes por nó expandido (pico - custo fixo): {bytes_per_node:.1f}")
+        print(f"📝 Perfil salvo em {prof_path} (python -m pstats {prof_path})")
+        
+        return {
+            "prof_path": prof_path,
+            "expansions": expansions,
+            "peak_bytes": peak,
+            "current_bytes": current,
+            "setup_bytes": setup,
+            "bytes_per_node": bytes_per_node,
+            "allocation_sites": [(f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                                  stat.size_diff) for stat in growth],
+            "hot_functions": [function for (_, _, function), _ in hot],
+        }
+    
     def print_algorithm_summary(self, algorithm_name, results, total_time):
         """Imprime resumo de um algoritmo"""
         print(f"\n📋 RESUMO - {algorithm_name}")
@@ -405,15 +713,30 @@ class TestAllAlgorithms:
                 avg_moves = sum(r["solution_depth"] for r in successful) / len(successful)
                 avg_nodes = sum(r["visited_nodes"] for r in successful) / len(successful)
                 
-                print(f"{algorithm_name:<15}: {len(successful)}/5 sucessos | "
+                print(f"{algorithm_name:<15}: {len(successful)}/{len(test_results)} sucessos | "
                       f"Tempo médio: {avg_time:.4f}s | "
                       f"Movimentos médios: {avg_moves:.1f} | "
                       f"Nós médios: {avg_nodes:.1f}")
 
-def main():
+def main(argv=None):
     """Função principal para executar os testes"""
     tester = TestAllAlgorithms()
     
+    parser = argparse.ArgumentParser(description="Testes dos algoritmos do 8-puzzle (sem argumentos: menu interativo)")
+    parser.add_argument("--profile", metavar="ALGORITMO",
+                        help=f"perfila um algoritmo (nome ou número: {', '.join(f'{i}={name}' for i, name in enumerate(tester.algorithms))})")
+    parser.add_argument("--case", type=int, default=3, help="caso de teste do perfil (0-4, padrão 3)")
+    parser.add_argument("--top", type=int, default=15, help="linhas nos resumos do perfil")
+    parser.add_argument("--out-dir", default=".", help="diretório dos arquivos .prof")
+    parser.add_argument("--no-warmup", action="store_true", help="não aquece antes de perfilar")
+    args = parser.parse_args(argv)
+    
+    if args.profile is not None:
+        algorithms = list(tester.algorithms)
+        name = algorithms[int(args.profile)] if args.profile.isdigit() and int(args.profile) < len(algorithms) else args.profile
+        result = tester.profile_algorithm(name, args.case, args.top, args.out_dir, not args.no_warmup)
+        return 0 if result is not None else 1
+    
     print("🧩 SISTEMA COMPLETO DE TESTES PARA ALGORITMOS DO 8-PUZZLE")
     print("=" * 70)
     
@@ -425,8 +748,10 @@ def main():
         print("4. 📊 Teste rápido (caso médio)")
         print("5. 📋 Listar casos de teste")
         print("6. ❌ Sair")
+        print("7. 🗄️  Ligar/desligar cache de soluções")
+        print("8. 🔬 Perfilar algoritmo (cProfile + tracemalloc)")
         
-        choice = input("\n👉 Escolha uma opção (1-6): ").strip()
+        choice = input("\n👉 Escolha uma opção (1-8): ").strip()
         
         if choice == "1":
             tester.run_all_tests()
@@ -438,7 +763,7 @@ def main():
                 print(f"  {i}: {algo}")
             
             try:
-                algo_idx = int(input("\n👉 Digite o número do algoritmo (0-3): "))
+                algo_idx = int(input(f"\n👉 Digite o número do algoritmo (0-{len(algorithms) - 1}): "))
                 if 0 <= algo_idx < len(algorithms):
                     tester.run_algorithm_tests(algorithms[algo_idx])
                 else:
@@ -476,8 +801,35 @@ def main():
             print("👋 Encerrando testes. Até logo!")
             break
             
+        elif choice == "7":
+            if tester.solution_cache is not None:
+                stats = tester.solution_cache.stats()
+                print(f"📊 Cache: {stats['entries']} estados | {stats['hits']} acertos | "
+                      f"{stats['misses']} falhas | {stats['evictions']} descartes")
+            if tester.toggle_cache():
+                print("🗄️  Cache de soluções LIGADO (algoritmos ótimos reutilizam soluções e sufixos)")
+            else:
+                print("🗄️  Cache de soluções DESLIGADO")
+            
+        elif choice == "8":
+            algorithms = list(tester.algorithms.keys())
+            for i, algo in enumerate(algorithms):
+                print(f"  {i}: {algo}")
+            
+            try:
+                algo_idx = int(input(f"\n👉 Digite o número do algoritmo (0-{len(algorithms) - 1}): "))
+                test_idx = int(input("👉 Digite o número do caso (0-4): "))
+                if 0 <= algo_idx < len(algorithms):
+                    tester.profile_algorithm(algorithms[algo_idx], test_idx)
+                else:
+                    print("❌ Número inválido!")
+            except ValueError:
+                print("❌ Por favor, digite um número válido!")
+            
         else:
             print("❌ Opção inválida! Tente novamente.")
+    
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
\ No newline at end of file
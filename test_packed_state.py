@@ -0,0 +1,241 @@
+"""
+Testes para validar a representação empacotada do estado (packed_state)
+"""
+
+from packed_state import (
+    GOAL_STATE, pack, unpack, from_matrix, to_matrix,
+    blank_index, successors, is_solvable,
+    NEIGHBORS, MOVE_TARGETS, get_layout,
+    reflect, canonical, reflect_moves,
+)
+from heuristics import manhattan
+from puzzle_game import Board
+from state_rank import (
+    REACHABLE_STATES, StateBitmap, rank_state, unrank_state,
+    rank_permutation, unrank_permutation,
+)
+from move_table import MoveTable, get_move_table
+from batch_eval import np, screen
+
+
+def test_pack_roundtrip():
+    """Testa empacotamento e desempacotamento"""
+    print("=== Teste: Empacotamento ===")
+    
+    tiles = [8, 6, 7, 2, 5, 4, 3, 0, 1]
+    state = pack(tiles)
+    print(f"Estado {tiles} -> {state:#x}")
+    assert unpack(state) == tiles
+    assert blank_index(state) == 7
+    assert to_matrix(from_matrix([[1, 2, 3], [4, 5, 6], [7, 8, 0]])) == [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    assert from_matrix([[1, 2, 3], [4, 5, 6], [7, 8, 0]]) == GOAL_STATE
+    print()
+
+
+def test_successors():
+    """Testa geração de sucessores no estado empacotado"""
+    print("=== Teste: Sucessores ===")
+    
+    children = successors(GOAL_STATE)
+    print(f"Sucessores do objetivo: {[action for _, action in children]}")
+    assert sorted(action for _, action in children) == ['LEFT', 'UP']
+    for child, action in children:
+        board = Board()
+        board.move(action)
+        assert board.packed == child
+        assert unpack(child).count(0) == 1
+    print()
+
+
+def test_board_uses_packed_state():
+    """Testa se Board opera sobre o estado empacotado"""
+    print("=== Teste: Board empacotado ===")
+    
+    board = Board([[1, 2, 3], [4, 0, 5], [7, 8, 6]])
+    copy = board.copy()
+    copy.move('RIGHT')
+    copy.move('DOWN')
+    print(copy)
+    assert copy.is_goal_state()
+    assert not board.is_goal_state()
+    assert board.empty_pos == (1, 1)
+    assert hash(copy) == hash(Board())
+    assert manhattan(board.packed) == 2
+    assert is_solvable(board.packed)
+    assert not is_solvable(pack([1, 2, 3, 4, 5, 6, 8, 7, 0]))
+    print()
+
+
+def test_state_rank():
+    """Testa o ranqueamento denso e o bitmap de visitados"""
+    print("=== Teste: Rank de estados ===")
+    
+    for rank in range(0, REACHABLE_STATES, 997):
+        assert rank_state(unrank_state(rank)) == rank
+        assert is_solvable(unrank_state(rank))
+        assert not is_solvable(unrank_state(rank, solvable=False))
+    assert rank_permutation(unrank_permutation(12345)) == 12345
+    
+    visited = StateBitmap()
+    assert visited.add(GOAL_STATE)
+    assert not visited.add(GOAL_STATE)
+    assert GOAL_STATE in visited
+    assert len(visited) == 1
+    print(f"Rank do objetivo: {rank_state(GOAL_STATE)}, bitmap: {len(visited.bits)} bytes")
+    print()
+
+
+def test_move_table():
+    """Testa a tabela de transições pré-calculada"""
+    print("=== Teste: Tabela de movimentos ===")
+    
+    table = get_move_table()
+    for rank in range(0, REACHABLE_STATES, 1009):
+        expected = sorted((rank_state(child), action) for child, action in successors(unrank_state(rank)))
+        assert sorted(table.expand(rank)) == expected
+    print(f"Sucessores do objetivo: {table.expand(rank_state(GOAL_STATE))}")
+    
+    # A consulta não grava nada; o arquivo só existe se salvo explicitamente
+    import os
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), "move_table.bin")
+    assert get_move_table(path) is table and not os.path.exists(path)
+    table.save(path)
+    assert MoveTable.load(path).successors == table.successors
+    
+    # Processo novo sem o arquivo: a busca usa rank_state e não calcula a tabela
+    import move_table
+    from a_star_search import a_star_search
+    hard = Board([[8, 6, 7], [2, 5, 4], [3, 0, 1]])
+    with_table, _ = a_star_search(hard)
+    saved = move_table._move_table, move_table.DEFAULT_PATH
+    move_table._move_table, move_table.DEFAULT_PATH = None, os.path.join(tempfile.mkdtemp(), "ausente.bin")
+    try:
+        without_table, _ = a_star_search(hard)
+        assert move_table._move_table is None
+        assert [n.action for n in without_table.path()] == [n.action for n in with_table.path()]
+        # Com o arquivo salvo, a tabela é carregada em vez de calculada
+        move_table.DEFAULT_PATH = path
+        assert move_table.table_for(hard.packed).successors == table.successors
+    finally:
+        move_table._move_table, move_table.DEFAULT_PATH = saved
+    print()
+
+
+def test_layout_nxn():
+    """Testa o layout N×N e a regra de solvibilidade de largura par"""
+    print("=== Teste: Tabuleiros N×N ===")
+    
+    layout = get_layout(3)
+    assert layout is get_layout(3)
+    assert layout.neighbors == NEIGHBORS and layout.move_targets == MOVE_TARGETS
+    assert layout.goal_state == GOAL_STATE
+    
+    board = Board(size=4)
+    assert board.is_goal_state() and board.is_solvable()
+    assert board.state[3] == [13, 14, 15, 0]
+    assert board.get_possible_moves() == ['UP', 'LEFT']
+    assert board.move('UP') and board.empty_pos == (2, 3)
+    assert board.is_solvable()
+    
+    # Trocar duas peças inverte a paridade; mover o vazio de linha não
+    swapped = Board([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 15, 14, 0]])
+    assert swapped.size == 4 and not swapped.is_solvable()
+    # Sem contar a linha do vazio este estado pareceria solvível (inversões ímpares)
+    shifted = Board([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 0], [13, 14, 15, 12]])
+    assert shifted.is_solvable()
+    
+    board = Board(size=5)
+    board.shuffle(50)
+    assert board.is_solvable()
+    assert Board(board.state).packed == board.packed
+    print(Board(size=4))
+    print()
+
+
+def test_batch_eval():
+    """Testa a triagem vetorizada contra as funções por tabuleiro"""
+    print("=== Teste: Avaliação em lote (NumPy) ===")
+    if np is None:
+        print("NumPy ausente: teste ignorado\n")
+        return
+    
+    boards = [unpack(unrank_state(rank, rank % 2 == 0)) for rank in range(0, REACHABLE_STATES, 997)]
+    boards.append([1] * 9)
+    result = screen(np.array(boards, dtype=np.uint8))
+    for i, tiles in enumerate(boards[:-1]):
+        state = pack(tiles)
+        assert result["valid"][i]
+        assert result["solvable"][i] == is_solvable(state)
+        assert result["manhattan"][i] == manhattan(state)
+    assert not result["valid"][-1] and not result["solvable"][-1]
+    
+    # 15-puzzle: a linha do vazio entra na regra
+    result = screen([[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 0, 13, 14, 15, 12],
+                     [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 15, 14, 0]])
+    assert list(result["solvable"]) == [True, False]
+    assert list(result["manhattan"]) == [1, 2] and list(result["misplaced"]) == [1, 2]
+    
+    # Peças fora de 0..N²-1 ou não inteiras: ValueError, sem truncar 256 para 0
+    for bad in ([1, 2, 3, 4, 5, 6, 7, 8, 256], [1, 2, 3, 4, 5, 6, 7, 8, 9], [1, 2, 3, 4, 5, 6, 7, 8, -1],
+                np.array([1, 2, 3, 4, 5, 6, 7, 8, 0], dtype=float), [True] * 9):
+        try:
+            screen(bad)
+            assert False, f"deveria rejeitar {bad}"
+        except ValueError:
+            pass
+    print(f"{len(boards)} tabuleiros avaliados")
+    print()
+
+
+def test_symmetry():
+    """Testa o gêmeo simétrico (transposto e reetiquetado) e o canônico"""
+    print("=== Teste: Simetria do objetivo ===")
+    assert reflect(GOAL_STATE) == GOAL_STATE
+    assert to_matrix(reflect(from_matrix([[8, 6, 7], [2, 5, 4], [3, 0, 1]]))) == [[6, 4, 7], [8, 5, 0], [3, 2, 1]]
+    
+    for rank in range(0, REACHABLE_STATES, 577):
+        state = unrank_state(rank)
+        twin = reflect(state)
+        assert reflect(twin) == state and is_solvable(twin)
+        assert manhattan(twin) == manhattan(state)
+        key, reflected = canonical(state)
+        assert key == min(state, twin) and canonical(twin)[0] == key
+        assert reflected == (key != state)
+    
+    # Ações espelhadas levam o gêmeo pelo caminho espelhado
+    board = Board([[1, 2, 3], [5, 0, 6], [4, 7, 8]])
+    moves = ['LEFT', 'UP', 'RIGHT', 'DOWN', 'DOWN', 'RIGHT']
+    twin = Board(reflect(board.packed))
+    for move, mirrored in zip(moves, reflect_moves(moves)):
+        assert board.move(move) and twin.move(mirrored)
+        assert twin.packed == reflect(board.packed)
+    
+    # Vale para qualquer N: o vazio do objetivo está na diagonal
+    layout = get_layout(4)
+    board = Board(size=4)
+    board.shuffle(40)
+    twin = layout.reflect(board.packed)
+    assert layout.reflect(twin) == board.packed and layout.is_solvable(twin)
+    print(layout.to_string(twin))
+    print()
+
+
+def run_all_tests():
+    """Executa todos os testes"""
+    print("🧪 EXECUTANDO TESTES DO ESTADO EMPACOTADO 🧪\n")
+    
+    test_pack_roundtrip()
+    test_successors()
+    test_board_uses_packed_state()
+    test_state_rank()
+    test_move_table()
+    test_layout_nxn()
+    test_batch_eval()
+    test_symmetry()
+    
+    print("✅ TODOS OS TESTES CONCLUÍDOS!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
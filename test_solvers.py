@@ -0,0 +1,672 @@
+"""
+Testes para validar os algoritmos de busca sobre os mesmos tabuleiros
+"""
+
+import json
+import time
+
+from puzzle_game import Board
+from Node import Node
+from breath_first_search import bfs, bidirectional_bfs
+from a_star_search import a_star_search
+from heuristic_search import greedy_best_first_search_with_loop
+from ida_star import ida_star_search
+from distance_oracle import get_distance_oracle, oracle_search
+from puzzle_db import HEADER, DatabaseError, PuzzleDatabase, build_database, database_search, get_database
+from pattern_database import AdditivePDB, PatternDatabase, goal_tiles
+from bucket_queue import BucketQueue
+from node_arena import NodeArena
+from batch_solver import parse_board, read_jsonl, solve_many, solve_request
+from vector_bfs import np, sweep, vector_bfs_search
+from solver_service import SolverService
+from solver_client import SolverClient, SolverError
+from heuristics import Heuristic, manhattan
+from solution_cache import SolutionCache
+from packed_state import ACTIONS, GOAL_STATE, get_layout, reflect, reflect_moves
+from state_rank import REACHABLE_STATES, rank_state
+from search_progress import SearchCancelled, SearchProgress
+from search_stats import SearchStats
+from deep_first_search import DEFAULT_DEPTH_LIMIT, PUZZLE_DIAMETER, depth_limited_dfs, dfs, iterative_deepening_dfs
+from benchmark import (
+    DEPTH_CAPS, build_corpus, compare_reports, parse_caps, percentile, run_benchmark, write_report,
+    main as benchmark_main,
+)
+import test_all_algorithms
+
+# (estado, profundidade ótima)
+CASES = [
+    ([[1, 2, 3], [4, 5, 6], [7, 8, 0]], 0),
+    ([[1, 2, 3], [4, 5, 6], [0, 7, 8]], 2),
+    ([[1, 2, 3], [5, 0, 6], [4, 7, 8]], 4),
+    ([[2, 5, 3], [1, 0, 6], [4, 7, 8]], 6),
+    ([[8, 6, 7], [2, 5, 4], [3, 0, 1]], 31),
+]
+
+
+def apply_moves(board: Board, moves) -> Board:
+    """Aplica os movimentos em uma cópia do tabuleiro"""
+    board = board.copy()
+    for move in moves:
+        assert board.move(move), f"Movimento inválido: {move}"
+    return board
+
+
+def test_optimal_solvers_agree():
+    """Testa se BFS, A* e o oráculo encontram soluções ótimas"""
+    print("=== Teste: Soluções ótimas ===")
+    
+    for matrix, depth in CASES:
+        board = Board(matrix)
+        
+        for heuristic in ('manhattan', 'misplaced', 'linear_conflict', 'pdb'):
+            if heuristic == 'misplaced' and depth > 6:
+                continue  # fraca demais para o caso de 31 movimentos em um teste rápido
+            node, metrics = a_star_search(board, heuristic)
+            assert metrics["solution_depth"] == depth, heuristic
+        
+        node, metrics = ida_star_search(board)
+        assert metrics["solution_depth"] == depth
+        assert apply_moves(board, [n.action for n in node.path()[1:]]).is_goal_state()
+        
+        node, metrics = oracle_search(board)
+        moves = [n.action for n in node.path()[1:]]
+        assert len(moves) == depth
+        assert apply_moves(board, moves).is_goal_state()
+        
+        node, _, _ = bidirectional_bfs(Node(board.packed))
+        assert len(node.path()) - 1 == depth
+        assert apply_moves(board, [n.action for n in node.path()[1:]]).is_goal_state()
+        
+        if depth <= 6:
+            node, _, _ = bfs(Node(board.packed))
+            assert len(node.path()) - 1 == depth
+        print(f"{matrix} -> {depth} movimentos")
+    print()
+
+
+def test_oracle_unsolvable():
+    """Testa o oráculo com um tabuleiro não solvível"""
+    print("=== Teste: Oráculo sem solução ===")
+    
+    board = Board([[1, 2, 3], [4, 5, 6], [8, 7, 0]])
+    assert get_distance_oracle().distance(board.packed) == -1
+    assert oracle_search(board)[0] is None
+    assert get_distance_oracle().max_distance() == 31
+    print()
+
+
+def test_database_roundtrip(tmp_path=None):
+    """Testa geração, verificação e consulta do banco em disco"""
+    print("=== Teste: Banco em disco ===")
+    import os
+    import tempfile
+    
+    directory = str(tmp_path) if tmp_path is not None else tempfile.mkdtemp()
+    path = os.path.join(directory, "puzzle_db.bin")
+    build_database(path)
+    database = PuzzleDatabase(path)
+    assert database.verify()
+    assert database.info()["max_distance"] == 31
+    
+    board = Board(CASES[-1][0])
+    moves = database.solve(board.packed)
+    assert len(moves) == 31
+    assert apply_moves(board, moves).is_goal_state()
+    database.close()
+    
+    # Sem o arquivo, a consulta recorre à busca A*
+    node, metrics = database_search(board, os.path.join(directory, "inexistente.bin"))
+    assert metrics["solution_depth"] == 31
+    
+    # Corrompido: o primeiro movimento do caso difícil volta do filho para ele (ciclo)
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    moves_at = HEADER.size + REACHABLE_STATES
+    first = data[moves_at + rank_state(board.packed)]
+    child = apply_moves(Board(CASES[-1][0]), [ACTIONS[first]]).packed
+    data[moves_at + rank_state(child)] = ACTIONS.index({"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT",
+                                                        "RIGHT": "LEFT"}[ACTIONS[first]])
+    corrupt = os.path.join(directory, "corrompido.bin")
+    with open(corrupt, "wb") as f:
+        f.write(data)
+    database = PuzzleDatabase(corrupt)
+    assert not database.verify()
+    try:
+        database.solve(board.packed)
+        assert False, "o ciclo deveria ser detectado"
+    except DatabaseError:
+        pass
+    database.close()
+    assert get_database(corrupt) is None
+    node, metrics = database_search(board, corrupt)
+    assert metrics["solution_depth"] == 31 and "stale_pops" in metrics  # resolvido pelo A*
+    print()
+
+
+def test_pattern_database_4x4():
+    """Testa um PDB aditivo pequeno no 15-puzzle"""
+    print("=== Teste: PDB 4x4 ===")
+    
+    pdb = AdditivePDB.build(4, [(1, 2), (5, 6)])
+    tiles = goal_tiles(4)
+    assert pdb(tiles) == 0
+    
+    # Troca 1 e 2 de lugar (e 5 e 6): os pares precisam "contornar" um ao outro
+    tiles[0], tiles[1] = tiles[1], tiles[0]
+    tiles[4], tiles[5] = tiles[5], tiles[4]
+    print(f"h = {pdb(tiles)}")
+    assert pdb(tiles) > 4  # mais forte que Manhattan (2 + 2)
+    assert pdb.reflect(pdb.reflect(tiles)) == tiles
+    
+    # Padrões com todas as peças (ou todas menos uma) têm entradas inalcançáveis (0xFF)
+    for pattern in [(1, 2, 3, 4, 5, 6, 7, 8), (1, 2, 3, 4, 5, 6, 7), (1, 1), (0, 1), (1, 9)]:
+        try:
+            PatternDatabase.build(3, pattern)
+            assert False, f"Padrão {pattern} deveria ser rejeitado"
+        except ValueError:
+            pass
+    assert 0xFF not in PatternDatabase.build(3, (1, 2, 3, 4, 5, 6)).table
+    print()
+
+
+def test_solvers_15_puzzle():
+    """Testa A*, IDA*, busca gulosa e BFS bidirecional no 4x4"""
+    print("=== Teste: 15-puzzle ===")
+    
+    board = Board([[5, 1, 8, 12], [6, 0, 4, 7], [9, 10, 2, 3], [13, 14, 11, 15]])  # 22 movimentos
+    results = {
+        "A*": a_star_search(board)[0],
+        "A* Conflito Linear": a_star_search(board, 'linear_conflict')[0],
+        "IDA*": ida_star_search(board)[0],
+        "BFS Bidirecional": bidirectional_bfs(Node(board.packed), 4)[0],
+    }
+    for name, node in results.items():
+        moves = [n.action for n in node.path()[1:]]
+        assert len(moves) == 22, f"{name}: {len(moves)} movimentos"
+        assert apply_moves(board, moves).is_goal_state(), name
+    
+    easy = Board([[1, 2, 3, 4], [5, 6, 0, 8], [9, 10, 7, 11], [13, 14, 15, 12]])
+    moves, num_moves, _, _ = greedy_best_first_search_with_loop(easy)
+    assert num_moves == 3 and apply_moves(easy, moves).is_goal_state()
+    
+    unsolvable = Board([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 15, 14, 0]])
+    node, metrics = a_star_search(unsolvable)
+    assert node is None and metrics["solution_depth"] == -1
+    assert bidirectional_bfs(Node(unsolvable.packed), 4) is None
+    print()
+
+
+def test_bucket_queue():
+    """Testa a ordem da fila por baldes: menor f, depois menor g, FIFO nos empates"""
+    print("=== Teste: Fila por baldes ===")
+    
+    queue = BucketQueue()
+    for item, f, g in [("a", 5, 2), ("b", 3, 1), ("c", 5, 1), ("d", 3, 1), ("e", 4, 0)]:
+        queue.push(item, f, g)
+    assert len(queue) == 5
+    assert [queue.pop() for _ in range(3)] == [(3, 1, "b"), (3, 1, "d"), (4, 0, "e")]
+    
+    # Inserir abaixo dos cursores continua correto
+    queue.push("f", 2, 7)
+    queue.push("g", 5, 0)
+    assert [queue.pop()[2] for _ in range(len(queue))] == ["f", "g", "c", "a"]
+    assert not queue
+    print()
+
+
+def test_a_star_open_set():
+    """Testa o melhor g do conjunto aberto e as reaberturas do A*"""
+    print("=== Teste: Conjunto aberto do A* ===")
+    
+    board = Board(CASES[-1][0])
+    node, metrics = a_star_search(board)
+    assert metrics["duplicates_suppressed"] > 0
+    assert metrics["reopenings"] == 0  # Manhattan é consistente
+    assert metrics["visited_nodes"] == metrics["explored_states"] + metrics["stale_pops"]
+    
+    # Admissível mas inconsistente: estados já explorados precisam ser reabertos
+    flaky = Heuristic('flaky', lambda state: manhattan(state) if state % 3 else 0)
+    node, metrics = a_star_search(board, flaky)
+    print(f"Reaberturas: {metrics['reopenings']}, entradas obsoletas: {metrics['stale_pops']}")
+    assert metrics["solution_depth"] == 31 and metrics["reopenings"] > 0
+    print()
+
+
+def test_node_arena():
+    """Testa a arena de nós: custos, caminho e conversão para Node"""
+    print("=== Teste: Arena de nós ===")
+    
+    board = Board(CASES[3][0])
+    arena = NodeArena()
+    handle = arena.add(board.packed)
+    moves = ["DOWN", "LEFT", "UP", "RIGHT"]
+    for move in moves:
+        board.move(move)
+        handle = arena.add(board.packed, handle, ["UP", "DOWN", "LEFT", "RIGHT"].index(move))
+    assert len(arena) == 5 and arena.costs[handle] == 4
+    assert arena.actions(handle) == moves and arena.root_of(handle) == 0
+    
+    node = arena.to_node(handle)
+    assert node.state == board.packed and node.cost == 4
+    assert [n.action for n in node.path()[1:]] == moves
+    print(f"{len(arena)} nós em {arena.nbytes()} bytes")
+    
+    # A DFS sem limite gera caminhos com mais de 65535 níveis
+    for _ in range(70000):
+        handle = arena.add(board.packed, handle, 0)
+    assert arena.costs[handle] == 70004
+    
+    # No 4x4 o estado não cabe em 64 bits e a chave é o próprio estado
+    arena = NodeArena(Board(size=4).layout)
+    handle = arena.add(Board(size=4).packed)
+    assert arena.keys is arena.states and arena.keys[handle] == Board(size=4).packed
+    print()
+
+
+def test_solve_many():
+    """Testa a resolução em lote, no próprio processo e em um pool"""
+    print("=== Teste: Resolução em lote ===")
+    
+    boards = [matrix for matrix, _ in CASES] + [[1, 2, 3], {"id": "x", "board": [1, 2, 3, 4, 5, 6, 8, 7, 0]}]
+    inline = list(solve_many(boards, "astar", workers=0))
+    assert [record["index"] for record in inline] == list(range(len(boards)))
+    assert [record["depth"] for record in inline[:len(CASES)]] == [depth for _, depth in CASES]
+    assert "error" in inline[len(CASES)]
+    assert inline[-1]["id"] == "x" and not inline[-1]["solved"]
+    
+    pooled = list(solve_many(boards, "astar", workers=2, chunksize=2, max_pending=1))
+    assert [record.get("moves") for record in pooled] == [record.get("moves") for record in inline]
+    unordered = list(solve_many(boards, "ida", workers=2, ordered=False, chunksize=1))
+    assert sorted(record["index"] for record in unordered) == list(range(len(boards)))
+    
+    # Entradas inválidas viram registros de erro sem interromper o lote
+    bad = [0, 12345, 2 ** 40 + 5, -1, True, [1, 2, 3, 4, 5, 6, 7, 8, 0, 5], [[1, 2, 3], 4, 5],
+           [[1, 2, 3], [4, 5, 6], [7, 8, "0"]], [[1.0, 2, 3], [4, 5, 6], [7, 8, 0]], [0], "123"]
+    for payload in bad:
+        try:
+            parse_board(payload)
+            assert False, f"{payload!r} deveria ser rejeitado"
+        except ValueError:
+            pass
+    records = list(solve_many(bad + [CASES[1][0]], "astar", workers=0))
+    assert all("error" in record for record in records[:-1]) and records[-1]["depth"] == CASES[1][1]
+    assert parse_board(Board(CASES[2][0]).packed)[0].state == CASES[2][0]
+    assert parse_board([1, 2, 3, 4, 5, 6, 7, 8, 0])[0].is_goal_state()
+    
+    # JSON lines com uma linha malformada: registro de erro com o número da linha
+    import io
+    lines = io.StringIO(f"{json.dumps(CASES[1][0])}\n\n{{\"board\": [1, 2\n{json.dumps(CASES[2][0])}\n")
+    records = list(solve_many(read_jsonl(lines), "astar", workers=2, chunksize=1))
+    assert [record.get("depth") for record in records] == [CASES[1][1], None, CASES[2][1]]
+    assert records[1]["line"] == 3 and records[1]["id"] is None and "Linha 3" in records[1]["error"]
+    
+    # Gêmeo simétrico no mesmo bloco: resolvido uma vez, com as ações espelhadas
+    hard = Board(CASES[-1][0])
+    twin = Board(reflect(hard.packed))
+    first, second = solve_many([hard.state, twin.state], "astar", workers=0)
+    assert "coalesced" not in first and second["coalesced"]
+    assert second["board"] == twin.state and second["depth"] == 31
+    assert apply_moves(twin, second["moves"]).is_goal_state()
+    print()
+
+
+def test_vector_bfs():
+    """Testa a BFS vetorizada contra o oráculo de distâncias"""
+    print("=== Teste: BFS vetorizada (NumPy) ===")
+    if np is None:
+        print("NumPy ausente: teste ignorado\n")
+        return
+    
+    for matrix, depth in CASES:
+        board = Board(matrix)
+        node, metrics = vector_bfs_search(board)
+        moves = [n.action for n in node.path()[1:]]
+        assert metrics["solution_depth"] == depth == len(moves)
+        assert apply_moves(board, moves).is_goal_state()
+    
+    engine = sweep()
+    oracle = get_distance_oracle()
+    assert bytes(engine.distances) == bytes(oracle.distances)
+    assert engine.levels[-1]["new"] == 0 and len(engine.levels) == 32
+    node, metrics = vector_bfs_search(Board([[1, 2, 3], [4, 5, 6], [8, 7, 0]]))
+    assert node is None
+    print()
+
+
+def test_solver_service():
+    """Testa o serviço local: pipelining, união de pedidos iguais e prazo"""
+    print("=== Teste: Serviço de resolução ===")
+    import asyncio
+    import subprocess
+    import sys
+    
+    async def scenario():
+        service = SolverService(workers=2, max_inflight=8)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            async with await SolverClient.connect(port=port) as client:
+                hard = CASES[-1][0]
+                twin = Board(reflect(Board(hard).packed))
+                results = await client.solve_many([hard] * 5 + [twin.state] + [matrix for matrix, _ in CASES[:-1]])
+                assert [r["depth"] for r in results] == [31] * 6 + [depth for _, depth in CASES[:-1]]
+                assert sum(r["coalesced"] for r in results[:6]) == 5
+                # O gêmeo entra na mesma computação e recebe as ações espelhadas
+                assert results[5]["board"] == twin.state
+                assert apply_moves(twin, results[5]["moves"]).is_goal_state()
+                
+                result = await client.solve(CASES[2][0], algorithm="bfs")
+                assert result["depth"] == CASES[2][1]
+                try:
+                    await client.solve(hard, algorithm="bfs", timeout=0.001)
+                    assert False, "o prazo deveria ter expirado"
+                except SolverError as e:
+                    print(f"Prazo: {e}")
+                response = await client.request([1, 2, 3])
+                assert "error" in response
+                # Inteiro que não é um estado: resposta de erro com o mesmo id (não fica pendente)
+                for payload in (12345, 2 ** 40 + 5, True):
+                    response = await asyncio.wait_for(client.request(payload), 5)
+                    assert "error" in response
+                
+                # O prazo vai para o worker: buscas que expiram não prendem os 2 processos
+                deep = [hard, Board(build_corpus([30], per_depth=1)[0][1]).state]
+                expired = await asyncio.gather(*(client.request(board, algorithm="iddfs", timeout=0.3) for board in deep))
+                assert all("error" in response for response in expired)
+                result = await client.solve(CASES[2][0], timeout=20)
+                assert result["depth"] == CASES[2][1] and result["wait"] < 5
+        finally:
+            await service.close()
+        return service.stats
+    
+    stats = asyncio.run(scenario())
+    print(f"Estatísticas: {stats}")
+    assert stats["coalesced"] >= 5 and stats["timeouts"] == 3
+    
+    # No próprio processo: a busca para no prazo e marca o registro
+    start_time = time.time()
+    result = solve_request(CASES[-1][0], "iddfs", deadline=start_time + 0.2)
+    assert result["cancelled"] and "error" in result and time.time() - start_time < 5
+    assert solve_request(CASES[-1][0], "astar", deadline=start_time - 1)["cancelled"]
+    
+    # O serviço sobe sem interface gráfica
+    check = "import sys, solver_service, solver_client; sys.exit('tkinter' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", check]).returncode == 0
+    print()
+
+
+def test_solution_cache():
+    """Cache de soluções: sufixos dos caminhos ótimos, contadores e descarte LRU"""
+    print("=== Teste: Cache de soluções ===")
+    oracle = get_distance_oracle()
+    board = Board([[8, 6, 7], [2, 5, 4], [3, 0, 1]])
+    moves = oracle.solve(board.packed)
+    
+    cache = SolutionCache(max_entries=100)
+    assert cache.get(board.packed) is None
+    cache.put(board.packed, moves)
+    assert len(cache) == 32
+    assert cache.get(board.packed) == moves
+    
+    # Qualquer estado do caminho é respondido com o seu sufixo ótimo
+    middle = apply_moves(board, moves[:10])
+    suffix = cache.get(middle.packed)
+    assert suffix == moves[10:]
+    assert len(suffix) == oracle.distance(middle.packed)
+    assert cache.get(Board().packed) == []
+    
+    # O gêmeo simétrico (transposto e reetiquetado) usa as mesmas entradas
+    twin = reflect(middle.packed)
+    assert cache.get(twin) == reflect_moves(suffix)
+    assert apply_moves(Board(twin), cache.get(twin)).is_goal_state()
+    
+    # Limite pequeno: descarta primeiro os estados mais distantes do objetivo
+    small = SolutionCache(max_entries=8)
+    small.put(board.packed, moves)
+    assert len(small) == 8 and small.evictions == 24
+    assert small.get(board.packed) is None
+    assert small.get(apply_moves(board, moves[:24]).packed) == moves[24:]
+    
+    stats = cache.stats()
+    print(f"Estatísticas: {stats}")
+    assert stats["hits"] == 5 and stats["misses"] == 1
+    print()
+
+
+def test_search_progress():
+    """Progresso periódico e cancelamento cooperativo em todas as buscas"""
+    print("=== Teste: Progresso e cancelamento ===")
+    board = Board(CASES[3][0])
+    searches = {
+        "bfs": lambda progress: bfs(Node(board.packed), progress=progress),
+        "bidirectional": lambda progress: bidirectional_bfs(Node(board.packed), progress=progress),
+        "dfs": lambda progress: dfs(Node(board.packed), progress=progress),
+        "dls": lambda progress: depth_limited_dfs(Node(board.packed), progress=progress),
+        "iddfs": lambda progress: iterative_deepening_dfs(Node(board.packed), progress=progress),
+        "greedy": lambda progress: greedy_best_first_search_with_loop(board, progress=progress),
+        "astar": lambda progress: a_star_search(board, progress=progress),
+        "ida": lambda progress: ida_star_search(board, progress=progress),
+    }
+    for name, search in searches.items():
+        progress = SearchProgress(interval=2)
+        search(progress)
+        assert progress.expanded > 0 and progress.expanded % 2 == 0, name
+        
+        cancelled = SearchProgress(interval=2)
+        cancelled.cancel()
+        try:
+            search(cancelled)
+            assert False, f"{name} deveria ter sido cancelada"
+        except SearchCancelled:
+            assert cancelled.expanded == 2
+        print(f"{name}: {progress.expanded} nós até o último relatório")
+    
+    # Sem progress o resultado não muda
+    node, metrics = a_star_search(board)
+    assert metrics["solution_depth"] == CASES[3][1]
+    print()
+
+
+def test_search_stats():
+    """Métricas comuns e ganchos: as contagens dos ganchos batem com as métricas"""
+    print("=== Teste: SearchStats e ganchos ===")
+    board = Board(CASES[3][0])
+    depth = CASES[3][1]
+    searches = {
+        "bfs": lambda stats: bfs(Node(board.packed), stats=stats),
+        "bidirectional": lambda stats: bidirectional_bfs(Node(board.packed), stats=stats),
+        "dfs": lambda stats: dfs(Node(board.packed), stats=stats),
+        "dls": lambda stats: depth_limited_dfs(Node(board.packed), stats=stats),
+        "iddfs": lambda stats: iterative_deepening_dfs(Node(board.packed), stats=stats),
+        "greedy": lambda stats: greedy_best_first_search_with_loop(board, stats=stats),
+        "astar": lambda stats: a_star_search(board, stats=stats),
+        "ida": lambda stats: ida_star_search(board, stats=stats),
+        "oracle": lambda stats: oracle_search(board, stats=stats),
+    }
+    for name, search in searches.items():
+        counts = {"expand": 0, "generate": 0, "goal": []}
+        def on_expand(state, g):
+            counts["expand"] += 1
+        def on_generate(child, parent):
+            counts["generate"] += 1
+        def on_goal(state, solution_depth):
+            assert state == GOAL_STATE
+            counts["goal"].append(solution_depth)
+        
+        stats = SearchStats(on_expand, on_generate, on_goal)
+        search(stats)
+        assert len(counts["goal"]) == 1 and counts["goal"][0] == stats.solution_depth, name
+        assert stats.wall_time > 0 and stats.cpu_time >= 0, name
+        if name != "oracle":  # consulta por tabela: só on_goal
+            assert counts["expand"] == stats.expansions > 0, name
+            assert counts["generate"] == stats.generations >= stats.expansions, name
+            assert 0 <= stats.duplicates <= stats.generations, name
+        if name not in ("dfs", "dls", "greedy"):
+            assert stats.solution_depth == depth, name
+        print(f"{name}: {stats.as_dict()}")
+    
+    # Sem objetivo alcançável: profundidade -1 e nenhum on_goal
+    stats = SearchStats(on_goal=lambda state, d: None)
+    a_star_search(Board([[1, 2, 3], [4, 5, 6], [8, 7, 0]]), stats=stats)
+    assert stats.solution_depth == -1
+    print()
+
+
+def test_benchmark():
+    """Corpus estratificado, relatório e comparação de regressões"""
+    print("=== Teste: benchmark estratificado ===")
+    import os
+    import tempfile
+    
+    oracle = get_distance_oracle()
+    corpus = build_corpus([0, 5, 31], per_depth=3, seed=1)
+    assert corpus == build_corpus([0, 5, 31], per_depth=3, seed=1)
+    assert [depth for depth, _ in corpus] == [0, 5, 5, 5, 31, 31]  # só 1 estado a 0 e 2 a 31
+    for depth, state in corpus:
+        assert oracle.distance(state) == depth
+    
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert percentile([0.0, 10.0], 95) == 9.5
+    
+    report = run_benchmark(["astar", "ida"], depths=range(0, 9, 2), per_depth=2, repeats=2, warmup=1)
+    assert report["meta"]["depths"] == [0, 2, 4, 6, 8]
+    for name, result in report["results"].items():
+        summary = result["summary"]
+        assert summary["cases"] == 9 and summary["samples"] == 18, name
+        assert summary["optimal"] == 9, name
+        assert summary["median"] <= summary["p95"] <= summary["p99"] <= summary["max"], name
+        assert summary["nodes_per_s"] > 0, name
+        assert set(result["by_depth"]) == {"0", "2", "4", "6", "8"}, name
+        print(f"{name}: mediana {summary['median'] * 1000:.3f} ms, {summary['nodes_per_s']:.0f} nós/s")
+    
+    # Teto de profundidade: o IDDFS pula os tabuleiros acima de 4 e o BFS usa o padrão (24)
+    capped = run_benchmark(["iddfs", "bfs"], depths=[2, 6], per_depth=1, repeats=1, warmup=0, caps={"iddfs": 4})
+    assert capped["meta"]["caps"] == {"iddfs": 4, "bfs": DEPTH_CAPS["bfs"]}
+    assert list(capped["results"]["iddfs"]["by_depth"]) == ["2"]
+    assert list(capped["results"]["bfs"]["by_depth"]) == ["2", "6"]
+    assert parse_caps(["iddfs=31"]) == {"iddfs": 31}
+    
+    # Relatório idêntico: nada a sinalizar; IDA* 50% mais lento: regressão
+    rows = compare_reports(report, report)
+    assert rows and not any(row["regression"] for row in rows)
+    slower = json.loads(json.dumps(report))
+    slower["results"]["ida"]["summary"]["median"] *= 1.5
+    rows = compare_reports(report, slower, threshold=0.10)
+    assert [(row["algorithm"], row["depth"]) for row in rows if row["regression"]] == [("ida", "all")]
+    
+    # Corpus diferente (semente, teto...): as medianas não são comparáveis
+    for field, value in (("seed", 2), ("caps", {"ida": 4}), ("per_depth", 3)):
+        other = json.loads(json.dumps(report))
+        other["meta"][field] = value
+        try:
+            compare_reports(report, other)
+            assert False, f"{field} diferente deveria ser recusado"
+        except ValueError as e:
+            assert field in str(e)
+    directory = tempfile.mkdtemp()
+    base_path, new_path = os.path.join(directory, "base.json"), os.path.join(directory, "novo.json")
+    write_report(report, base_path)
+    write_report(other, new_path)
+    assert benchmark_main(["compare", base_path, new_path]) == 2
+    assert benchmark_main(["compare", base_path, base_path]) == 0
+    print()
+
+
+def test_profile_mode(tmp_path=None):
+    """Modo de perfil do test_all_algorithms: .prof legível e bytes por nó"""
+    print("=== Teste: perfil (cProfile + tracemalloc) ===")
+    import os
+    import pstats
+    import tempfile
+    
+    directory = str(tmp_path) if tmp_path is not None else tempfile.mkdtemp()
+    report = test_all_algorithms.TestAllAlgorithms().profile_algorithm("IDA*", 3, top=5, out_dir=directory)
+    assert report["prof_path"] == os.path.join(directory, "profile_ida_star_caso3.prof")
+    stats = pstats.Stats(report["prof_path"])
+    assert any(function == "ida_star_search" for _, _, function in stats.stats)
+    assert 0 < len(report["hot_functions"]) <= 5
+    assert report["expansions"] > 0 and report["peak_bytes"] > 0
+    assert 0 < report["setup_bytes"] < report["peak_bytes"]
+    assert report["bytes_per_node"] == (report["peak_bytes"] - report["setup_bytes"]) / report["expansions"]
+    assert report["allocation_sites"] and all(size > 0 for _, size in report["allocation_sites"])
+    
+    # Foto no pico: as estruturas do A* aparecem, embora liberadas ao fim
+    report = test_all_algorithms.TestAllAlgorithms().profile_algorithm("A*", 3, top=5, out_dir=directory)
+    assert sum(size for _, size in report["allocation_sites"]) > report["current_bytes"]
+    
+    assert test_all_algorithms.TestAllAlgorithms().profile_algorithm("inexistente", out_dir=directory) is None
+    print()
+
+
+def test_bounded_dfs():
+    """DFS limitada e iterativa: caminhos curtos, ótimos no IDDFS e memória O(profundidade)"""
+    print("=== Teste: DFS limitada e aprofundamento iterativo ===")
+    for matrix, depth in CASES[:-1]:
+        board = Board(matrix)
+        node, visited, stored = iterative_deepening_dfs(Node(board.packed))
+        moves = [n.action for n in node.path()[1:]]
+        assert len(moves) == depth
+        assert apply_moves(board, moves).is_goal_state()
+        assert stored == depth + 1  # só o caminho atual fica em memória
+        
+        node, visited, stored = depth_limited_dfs(Node(board.packed))
+        moves = [n.action for n in node.path()[1:]]
+        assert depth <= len(moves) <= DEFAULT_DEPTH_LIMIT and stored <= DEFAULT_DEPTH_LIMIT + 1
+        assert apply_moves(board, moves).is_goal_state()
+        print(f"Profundidade {depth}: IDDFS ótimo, DFS limitada com {len(moves)} movimentos")
+    
+    # Limite abaixo da solução ótima: sem solução
+    board = Board(CASES[3][0])
+    assert depth_limited_dfs(Node(board.packed), limit=CASES[3][1] - 1)[0] is None
+    node = depth_limited_dfs(Node(board.packed), limit=CASES[3][1])[0]
+    assert len(node.path()) - 1 == CASES[3][1]
+    assert iterative_deepening_dfs(Node(board.packed), max_depth=CASES[3][1] - 1)[0] is None
+    
+    # O padrão não chega ao diâmetro: o pior caso termina rápido e sem solução
+    assert DEFAULT_DEPTH_LIMIT < PUZZLE_DIAMETER == CASES[-1][1]
+    assert depth_limited_dfs(Node(Board(CASES[-1][0]).packed))[0] is None
+    
+    # Insolúvel: nenhuma busca
+    stats = SearchStats()
+    unsolvable = Board([[1, 2, 3], [4, 5, 6], [8, 7, 0]])
+    assert iterative_deepening_dfs(Node(unsolvable.packed), stats=stats)[0] is None
+    assert stats.expansions == 0 and stats.solution_depth == -1
+    
+    # 4x4
+    layout = get_layout(4)
+    state = layout.goal_state
+    for action in ["UP", "LEFT", "UP", "LEFT", "DOWN", "RIGHT", "UP"]:
+        state = layout.move_blank(state, layout.move_targets[state >> layout.blank_shift][action])
+    node, _, _ = iterative_deepening_dfs(Node(state), 4)
+    optimal, metrics = ida_star_search(Board(layout.to_matrix(state)))
+    assert node.state == layout.goal_state and len(node.path()) - 1 == metrics["solution_depth"]
+    print()
+
+
+def run_all_tests():
+    """Executa todos os testes"""
+    print("🧪 EXECUTANDO TESTES DOS ALGORITMOS 🧪\n")
+    
+    test_optimal_solvers_agree()
+    test_oracle_unsolvable()
+    test_database_roundtrip()
+    test_pattern_database_4x4()
+    test_solvers_15_puzzle()
+    test_bucket_queue()
+    test_a_star_open_set()
+    test_node_arena()
+    test_solve_many()
+    test_vector_bfs()
+    test_solver_service()
+    test_solution_cache()
+    test_search_progress()
+    test_search_stats()
+    test_benchmark()
+    test_profile_mode()
+    test_bounded_dfs()
+    
+    print("✅ TODOS OS TESTES CONCLUÍDOS!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,165 @@
+"""
+BFS nível a nível vetorizada (NumPy) sobre os ranks do 8-puzzle.
+
+Cada nível da fronteira é um array de ranks (ver state_rank). A tabela de
+movimentos (move_table) é vista como uma matriz (181440, 4) sem cópia, então
+todos os sucessores de um nível saem de um único gather `moves[fronteira]`.
+Os filhos válidos ainda não visitados são marcados em bloco no vetor de
+distâncias (1 byte por estado, 0xFF = não visitado), que também guarda a
+profundidade, e o código do movimento que alcançou cada estado fica em outro
+vetor de bytes. Como todo movimento é reversível, o pai de um estado é o seu
+vizinho pelo movimento inverso (código ^ 1), e o caminho é refeito a partir
+desses dois vetores.
+
+Uma varredura completa do espaço (sweep) ou uma busca até o objetivo
+(vector_bfs_search) rodam em ~32 passos vetorizados, com estatísticas por
+nível. NumPy é opcional no projeto: só este módulo o exige.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; as funções avisam ao serem chamadas
+    np = None
+
+from Node import Node
+from puzzle_game import Board
+from move_table import MoveTable, get_move_table
+from packed_state import ACTIONS, GOAL_STATE, is_solvable
+from search_stats import SearchStats
+from state_rank import REACHABLE_STATES, rank_state
+
+UNKNOWN = 0xFF
+
+
+class LevelBFS:
+    """BFS nível a nível sobre a tabela de movimentos, com vetores por rank"""
+
+    def __init__(self, table: Optional[MoveTable] = None):
+        if np is None:
+            raise ImportError("vector_bfs requer NumPy (pip install numpy)")
+        if table is None:
+            table = get_move_table()
+        # Visão (181440, 4) do buffer array('i') da tabela, sem cópia
+        self.moves = np.frombuffer(table.successors, dtype=np.int32).reshape(REACHABLE_STATES, 4)
+        self.distances = np.full(REACHABLE_STATES, UNKNOWN, dtype=np.uint8)
+        self.parent_moves = np.full(REACHABLE_STATES, UNKNOWN, dtype=np.uint8)
+        self.levels: List[Dict[str, int]] = []
+        self.start = -1
+
+    def run(self, start_rank: int, goal_rank: Optional[int] = None) -> Optional[int]:
+        """
+        Expande a partir de `start_rank` até alcançar `goal_rank` (ou até
+        esgotar o espaço, se None). Retorna a profundidade do objetivo.
+        """
+        moves = self.moves
+        distances = self.distances
+        parent_moves = self.parent_moves
+        codes = np.arange(4, dtype=np.uint8)
+
+        self.start = start_rank
+        distances[start_rank] = 0
+        frontier = np.array([start_rank], dtype=np.int32)
+        depth = 0
+        if goal_rank == start_rank:
+            return 0
+
+        while frontier.size:
+            depth += 1
+            children = moves[frontier]                   # (K, 4), -1 = inválido
+            valid = children >= 0
+            fresh = valid.copy()
+            fresh[valid] = distances[children[valid]] == UNKNOWN
+            new = children[fresh]
+            # Vários pais podem alcançar o mesmo filho no nível: qualquer um serve
+            distances[new] = depth
+            parent_moves[new] = np.broadcast_to(codes, children.shape)[fresh]
+            frontier = np.flatnonzero(distances == depth).astype(np.int32)
+
+            self.levels.append({
+                "depth": depth,
+                "expanded": int(children.shape[0]),
+                "generated": int(valid.sum()),
+                "new": int(frontier.size),
+            })
+            if goal_rank is not None and distances[goal_rank] == depth:
+                return depth
+        return None if goal_rank is not None else depth - 1
+
+    def path(self, rank: int) -> List[str]:
+        """Ações do início até `rank`, seguindo os movimentos inversos"""
+        moves = self.moves
+        actions = []
+        while rank != self.start:
+            code = int(self.parent_moves[rank])
+            actions.append(ACTIONS[code])
+            rank = int(moves[rank, code ^ 1])  # UP<->DOWN, LEFT<->RIGHT
+        actions.reverse()
+        return actions
+
+    def visited(self) -> int:
+        return int(np.count_nonzero(self.distances != UNKNOWN))
+
+
+def sweep(start_state: int = GOAL_STATE, table: Optional[MoveTable] = None) -> LevelBFS:
+    """Varredura completa da classe de paridade de `start_state` (distâncias e níveis)"""
+    engine = LevelBFS(table)
+    engine.run(rank_state(start_state))
+    return engine
+
+
+def vector_bfs_search(initial_board: Board, stats: Optional[SearchStats] = None) -> Tuple[Optional[Node], Dict[str, Any]]:
+    """
+    BFS vetorizada até o objetivo. Mesmo contrato de a_star_search:
+    (nó solução, métricas), com as estatísticas de cada nível em "levels".
+    `stats` (opcional) recebe os totais dos níveis; os ganchos por nó não
+    são chamados (a expansão é em bloco), só on_goal.
+    """
+    state = initial_board.packed
+    if initial_board.size != 3:
+        raise ValueError("A BFS vetorizada só cobre o tabuleiro 3x3")
+    if stats is not None:
+        stats.start()
+    if not is_solvable(state):
+        if stats is not None:
+            stats.finish(0, 0, 0, 0, 0, -1)
+        return None, {
+            "visited_nodes": 0,
+            "explored_states": 0,
+            "max_frontier": 0,
+            "solution_depth": -1,
+            "levels": []
+        }
+
+    engine = LevelBFS()
+    depth = engine.run(rank_state(state), rank_state(GOAL_STATE))
+    moves = engine.path(rank_state(GOAL_STATE))
+    solution = Node.from_moves(state, moves)
+    if stats is not None:
+        levels = engine.levels
+        generated = sum(level["generated"] for level in levels)
+        stats.finish(sum(level["expanded"] for level in levels), generated,
+                     generated - sum(level["new"] for level in levels),
+                     max((level["new"] for level in levels), default=1), engine.visited(), depth)
+        if stats.on_goal is not None:
+            stats.on_goal(GOAL_STATE, depth)
+    return solution, {
+        "visited_nodes": sum(level["expanded"] for level in engine.levels),
+        "explored_states": engine.visited(),
+        "max_frontier": max((level["new"] for level in engine.levels), default=1),
+        "solution_depth": depth,
+        "levels": engine.levels
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    start_time = time.perf_counter()
+    engine = sweep()
+    print(f"Varredura completa em {time.perf_counter() - start_time:.3f}s")
+    for level in engine.levels:
+        print(f"  nível {level['depth']:2d}: {level['new']:6d} novos, "
+              f"{level['expanded']:6d} expandidos, {level['generated']:6d} gerados")
+    print(f"Estados alcançados: {engine.visited()}")